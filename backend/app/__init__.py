@@ -13,6 +13,8 @@ from app.routes.ga_input_routes import ga_input_bp
 
 from app.routes.generation_routes import generation_bp
 from app.db import models
+from app.db.migrations import migrate
+from app.db.query_plans import check_query_plans_command
 
 def create_app():
     app = Flask(__name__)
@@ -30,8 +32,11 @@ def create_app():
     db.init_app(app)
     JWTManager(app)
 
+    # Versioned schema changes (tables, indexes) instead of a bare create_all
     with app.app_context():
-        db.create_all()
+        migrate()
+
+    app.cli.add_command(check_query_plans_command)
 
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -10,4 +10,36 @@ class Config:
 
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_pre_ping": True,
-        "pool_recycle": 300,}
\ No newline at end of file
+        "pool_recycle": 300,}
+
+    # Generated files (sharded per output) and the drawing cache inside it
+    OUTPUT_STORAGE_DIR = os.getenv("OUTPUT_STORAGE_DIR", "outputs")
+    GENERATION_CACHE_MAX_BYTES = int(os.getenv("GENERATION_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+    # Background generation jobs
+    GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", os.cpu_count() or 2))
+    GENERATION_MAX_PENDING = int(os.getenv("GENERATION_MAX_PENDING", 32))
+    BATCH_MAX_VARIANTS = int(os.getenv("BATCH_MAX_VARIANTS", 100))
+    # Upper bound on fixed-step sampling stations per curve
+    MAX_NUM_STATIONS = int(os.getenv("MAX_NUM_STATIONS", 2000))
+
+    # Seconds between checks that the cached rule set still matches rules_master
+    RULE_CACHE_CHECK_INTERVAL = float(os.getenv("RULE_CACHE_CHECK_INTERVAL", 5))
+
+    # Layout search: candidates per request, worker processes, seconds per request
+    LAYOUT_MAX_CANDIDATES = int(os.getenv("LAYOUT_MAX_CANDIDATES", 200000))
+    LAYOUT_WORKERS = int(os.getenv("LAYOUT_WORKERS", os.cpu_count() or 2))
+    LAYOUT_TIME_BUDGET = float(os.getenv("LAYOUT_TIME_BUDGET", 10))
+    LAYOUT_CACHE_ENTRIES = int(os.getenv("LAYOUT_CACHE_ENTRIES", 256))
+    # Smaller searches run in the request thread; pool overhead outweighs the gain
+    LAYOUT_PARALLEL_MIN_CANDIDATES = int(os.getenv("LAYOUT_PARALLEL_MIN_CANDIDATES", 20000))
+
+    # Projects per page of GET /api/projects (default and upper bound)
+    PROJECT_PAGE_SIZE = int(os.getenv("PROJECT_PAGE_SIZE", 50))
+    PROJECT_PAGE_MAX = int(os.getenv("PROJECT_PAGE_MAX", 500))
+
+    # Per-role permissions and module tree: roles kept, seconds before a reload
+    PERMISSION_CACHE_ENTRIES = int(os.getenv("PERMISSION_CACHE_ENTRIES", 256))
+    PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", 300))
+    # roles.role_name values (comma-separated) allowed on the admin-only endpoints
+    ADMIN_ROLE_NAMES = [name.strip() for name in os.getenv("ADMIN_ROLE_NAMES", "Admin").split(",") if name.strip()]
@@ -0,0 +1,133 @@
+# app/db/migrations.py
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+
+from app.db.database import db
+from app.db import models  # registers the models on db.metadata
+
+# Bookkeeping table, kept out of db.metadata so it is never part of a model migration
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Any constant shared by every app process; serializes concurrent startups
+_LOCK_KEY = 72_410_001
+
+
+# -----------------------------
+# Migrations
+# -----------------------------
+
+def _create_tables(connection):
+    db.metadata.create_all(bind=connection)
+
+
+def _create_indexes(*names):
+    """
+    Migration creating model indexes (declared in __table_args__) on tables
+    that already exist.
+
+    On PostgreSQL the indexes are built CONCURRENTLY, so writes to live
+    tables are not blocked while they build. That cannot run inside a
+    transaction; `migrate` passes an autocommit connection instead. A
+    build that failed half way leaves an INVALID index, which is dropped
+    and rebuilt on the next run.
+    """
+    def apply(connection):
+        wanted = set(names)
+        concurrently = connection.dialect.name == "postgresql"
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in wanted:
+                    continue
+                wanted.discard(index.name)
+                if not concurrently:
+                    index.create(bind=connection, checkfirst=True)
+                    continue
+
+                invalid = connection.execute(text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ), {"name": index.name}).first()
+                if invalid:
+                    connection.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"')
+
+                # The option is read at DDL compile time; set it for this build only
+                options = index.dialect_options["postgresql"]
+                previous = options["concurrently"]
+                options["concurrently"] = True
+                try:
+                    index.create(bind=connection, checkfirst=True)
+                finally:
+                    options["concurrently"] = previous
+        if wanted:
+            raise RuntimeError(f"Unknown indexes: {', '.join(sorted(wanted))}")
+
+    apply.outside_transaction = True
+    return apply
+
+
+# (version, description, apply(connection)); append only, never renumber
+MIGRATIONS = [
+    (1, "Create tables", _create_tables),
+    (2, "Indexes for the hot query paths", _create_indexes(
+        "ix_ga_input_project_active_version",
+        "ix_ga_input_project_current",
+        "ix_role_access_role_active",
+        "ix_ship_projects_live_created",
+        "ix_ai_ga_output_ga_input_type",
+    )),
+]
+
+
+def migrate():
+    """
+    Apply pending migrations in version order, each in its own transaction
+    together with its schema_migrations row. Migrations marked
+    `outside_transaction` (concurrent index builds) run in autocommit mode
+    on PostgreSQL and are recorded once they finish. On PostgreSQL a
+    session advisory lock, held throughout, keeps concurrent workers from
+    applying the same migration twice. Returns the versions applied.
+    """
+    applied = []
+    with db.engine.connect() as lock:
+        postgresql = lock.dialect.name == "postgresql"
+        if postgresql:
+            lock = lock.execution_options(isolation_level="AUTOCOMMIT")
+            lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+
+        try:
+            with db.engine.begin() as connection:
+                _metadata.create_all(bind=connection)
+                done = set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+            for version, description, apply in MIGRATIONS:
+                if version in done:
+                    continue
+
+                if postgresql and getattr(apply, "outside_transaction", False):
+                    apply(lock)
+                    with db.engine.begin() as connection:
+                        _record(connection, version, description)
+                else:
+                    with db.engine.begin() as connection:
+                        apply(connection)
+                        _record(connection, version, description)
+                applied.append(version)
+        finally:
+            if postgresql:
+                lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+
+    return applied
+
+
+def _record(connection, version, description):
+    connection.execute(insert(schema_migrations).values(
+        version=version, description=description, applied_at=datetime.utcnow()
+    ))
+
@@ -43,6 +43,11 @@ class RoleAccess(db.Model):
     approve_flag = db.Column(db.Boolean, default=False)
     status = db.Column(db.Boolean, default=True)
 
+    # Dashboard / module menu: active grants of a role
+    __table_args__ = (
+        db.Index("ix_role_access_role_active", role_id, module_id, postgresql_where=status),
+    )
+
 class Role(db.Model):
     __tablename__ = "roles"
 
@@ -150,6 +155,11 @@ class ShipProject(db.Model):
 
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)
 
+    # Project list: live projects in keyset order (created_at, project_id)
+    __table_args__ = (
+        db.Index("ix_ship_projects_live_created", created_at, project_id, postgresql_where=~is_deleted),
+    )
+
 
 class AIGAOutput(db.Model):
      __tablename__ = "ai_ga_output"
@@ -188,6 +198,11 @@ class AIGAOutput(db.Model):
 
      generated_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+     # Stored layouts of a GA input
+     __table_args__ = (
+        db.Index("ix_ai_ga_output_ga_input_type", ga_input_id, generation_type),
+     )
+
 
 class RuleMaster(db.Model):
     __tablename__ = "rules_master"
@@ -268,6 +283,14 @@ class GAInputMaster(db.Model):
 
     notes = db.Column(db.Text, nullable=True)
 
+    # Versions of a project (active ones, newest first) and its current version
+    __table_args__ = (
+        db.Index("ix_ga_input_project_active_version", project_id, version_number.desc(),
+                 postgresql_where=is_active),
+        db.Index("ix_ga_input_project_current", project_id, version_number.desc(),
+                 postgresql_where=is_current_version),
+    )
+
        # relationships
     project = db.relationship("ShipProject", backref="ga_inputs")
     vessel = db.relationship("Vessel", backref="ga_inputs")
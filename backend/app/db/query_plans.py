@@ -0,0 +1,83 @@
+# app/db/query_plans.py
+import json
+import uuid
+from datetime import datetime
+
+import click
+from sqlalchemy import text
+
+from app.core.config import Config
+from app.db.database import db
+from app.services.ga_input_queries import GAInputQueries
+from app.services.permission_cache import PermissionCache
+from app.services.project_queries import ProjectQueries
+
+
+def _hot_queries():
+    """
+    (name, statement) for the lookups behind the busiest endpoints, built
+    by the same query builders the endpoints use, with placeholder ids;
+    the plan does not depend on whether they exist.
+    """
+    some_id = uuid.uuid4()
+    cursor = ProjectQueries.encode_cursor(datetime.utcnow(), some_id)
+    page, _ = ProjectQueries.page_query(Config.PROJECT_PAGE_SIZE, cursor)
+    return [
+        ("projects: list page", page.statement),
+        ("gainputs: next version number", GAInputQueries.max_version_query(some_id).statement),
+        ("gainputs: latest of project", GAInputQueries.latest_query(some_id).limit(1).statement),
+        ("hull geometry of GA input", GAInputQueries.hull_query(some_id).limit(1).statement),
+        ("dashboard / modules: role access", PermissionCache.grants_query(some_id).statement),
+        ("generation: stored layout", GAInputQueries.stored_layout_query(some_id, "0" * 64).limit(1).statement),
+    ]
+
+
+def _seq_scans(plan):
+    """
+    Relation names of every Seq Scan node in an EXPLAIN (FORMAT JSON) plan.
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", ()):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def check_query_plans():
+    """
+    EXPLAIN every hot query with sequential scans discouraged, so the
+    planner picks an index whenever one is usable however small the tables
+    are. Returns [{"query", "seq_scans"}] for the queries that still fall
+    back to a Seq Scan. PostgreSQL only.
+    """
+    findings = []
+    with db.engine.connect() as connection:
+        if connection.dialect.name != "postgresql":
+            raise RuntimeError("Query plan checks need PostgreSQL")
+
+        with connection.begin():
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+            for name, statement in _hot_queries():
+                sql = str(statement.compile(dialect=connection.dialect,
+                                            compile_kwargs={"literal_binds": True}))
+                plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                scans = _seq_scans(plan[0]["Plan"])
+                if scans:
+                    findings.append({"query": name, "seq_scans": scans})
+
+    return findings
+
+
+@click.command("check-query-plans")
+def check_query_plans_command():
+    """Flag hot queries whose plan falls back to a sequential scan."""
+    findings = check_query_plans()
+    for finding in findings:
+        click.echo(f"SEQ SCAN  {finding['query']}: {', '.join(finding['seq_scans'])}")
+    if findings:
+        raise SystemExit(1)
+    click.echo("All hot queries use an index")
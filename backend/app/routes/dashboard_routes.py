@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
-from app.db.models import RoleAccess, Module
-from app.db.database import db
+from app.services.permission_cache import PermissionCache
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -12,26 +11,9 @@ def get_dashboard():
     claims = get_jwt()
     role_id = claims.get("role_id")
 
-    permissions = (
-        db.session.query(RoleAccess, Module)
-        .join(Module, RoleAccess.module_id == Module.module_id)
-        .filter(RoleAccess.role_id == role_id)
-        .filter(RoleAccess.status == True)
-        .all()
-    )
-
-    response = []
-
-    for access, module in permissions:
-        response.append({
-            "module": module.module_name,
-            "view": access.view_flag,
-            "add": access.add_flag,
-            "edit": access.edit_flag,
-            "delete": access.delete_flag,
-            "approve": access.approve_flag
-        })
+    # Cached per role; no database round trip on repeat requests
+    permissions = PermissionCache.for_role(role_id)
 
     return jsonify({
-        "dashboard_permissions": response
-    }), 200
\ No newline at end of file
+        "dashboard_permissions": permissions.flags
+    }), 200
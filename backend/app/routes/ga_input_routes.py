@@ -1,14 +1,65 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func
 from app.db.database import db
 from app.db.models import GAInputMaster
 from app.db.models import HullGeometry
+from app.services.dxf_generator import DXFGenerator
+from app.services.ga_input_queries import GAInputQueries
+from app.services.hull_geometry_builder import HullGeometryBuilder
+from app.services.hydrostatics import HydrostaticsCalculator
+from app.services.rule_engine import RuleEngine
+from decimal import Decimal
+import math
 import uuid
 from datetime import datetime
 
 ga_input_bp = Blueprint("gainputs", __name__)
 
+
+def _row_snapshot(row, exclude=("modified_at", "created_at")):
+    return {c.name: getattr(row, c.name) for c in row.__table__.columns if c.name not in exclude}
+
+
+def _changed_columns(before, row):
+    """
+    Columns of `row` whose value differs from the `before` snapshot
+    (numbers compared by value, so 5 and Decimal("5.00") are equal).
+    """
+    changed = []
+    for column, old in before.items():
+        new = getattr(row, column)
+        if isinstance(old, bool) or isinstance(new, bool) or old is None or new is None:
+            differs = old != new
+        else:
+            try:
+                differs = float(old) != float(new)
+            except (TypeError, ValueError):
+                differs = old != new
+        if differs:
+            changed.append(column)
+    return changed
+
+
+def _rule_violations(ga_input, changed_columns=None, hull=None):
+    """
+    Rule violations of a GA input and its hull, re-checking only the rules
+    that read one of `changed_columns` (all rules when None).
+    """
+    if hull is None:
+        hull = GAInputQueries.hull_query(ga_input.ga_input_id).first()
+
+    context = {}
+    for row in (ga_input, hull):
+        if row is None:
+            continue
+        for column, value in _row_snapshot(row).items():
+            if isinstance(value, Decimal):
+                value = float(value)
+            if value is None or isinstance(value, (bool, int, float, str)):
+                context[column] = value
+
+    return RuleEngine().revalidate(str(ga_input.ga_input_id), context, changed_columns)
+
 # ==============================================================================
 # 1. GA INPUT MASTER (PAGE 1)
 # ==============================================================================
@@ -34,10 +85,7 @@ def create_ga_input_master():
             return jsonify({"error": "crew_count must equal officer_count + rating_count"}), 400
 
         # Auto Version Increment
-        latest_version = db.session.query(func.max(GAInputMaster.version_number)).filter(
-            GAInputMaster.project_id == uuid.UUID(data["project_id"]),
-            GAInputMaster.is_active == True
-        ).scalar()
+        latest_version = GAInputQueries.max_version_query(uuid.UUID(data["project_id"])).scalar()
 
         new_version_number = (latest_version or 0) + 1
 
@@ -91,11 +139,7 @@ def create_ga_input_master():
 @ga_input_bp.route("/project/<uuid:project_id>/latest", methods=["GET"])
 @jwt_required()
 def get_latest_ga_input(project_id):
-    ga_input = GAInputMaster.query.filter_by(
-        project_id=project_id,
-        is_active=True,
-        is_current_version=True
-    ).order_by(GAInputMaster.version_number.desc()).first()
+    ga_input = GAInputQueries.latest_query(project_id).first()
 
     if not ga_input:
         return jsonify({"message": "No data found"}), 404
@@ -127,6 +171,8 @@ def update_ga_input(ga_input_id):
         if not ga_input:
             return jsonify({"error": "Record not found"}), 404
 
+        before = _row_snapshot(ga_input)
+
         if "regulatory_framework" in data: ga_input.regulatory_framework = data["regulatory_framework"]
         if "class_notation" in data: ga_input.class_notation = data["class_notation"]
         if "ums_notation" in data: ga_input.ums_notation = data["ums_notation"]
@@ -140,9 +186,19 @@ def update_ga_input(ga_input_id):
         if "voyage_duration_days" in data: ga_input.voyage_duration_days = data["voyage_duration_days"]
         
         ga_input.modified_at = datetime.utcnow()
+
+        # Re-check only the rules that read an edited field, before committing
+        # so a failure here does not report an error for a saved update
+        changed_columns = _changed_columns(before, ga_input)
+        violations = _rule_violations(ga_input, changed_columns)
         db.session.commit()
 
-        return jsonify({"message": "Updated successfully", "ga_input_id": str(ga_input.ga_input_id)}), 200
+        return jsonify({
+            "message": "Updated successfully",
+            "ga_input_id": str(ga_input.ga_input_id),
+            "changed_fields": changed_columns,
+            "violations": violations
+        }), 200
 
     except Exception as e:
         db.session.rollback()
@@ -164,7 +220,7 @@ def create_hull(ga_input_id):
         return jsonify({"error": "GA Input not found"}), 404
 
     # Prevent duplicate hull
-    existing = HullGeometry.query.filter_by(ga_input_id=ga_input_id).first()
+    existing = GAInputQueries.hull_query(ga_input_id).first()
     if existing:
         return jsonify({"error": "Hull already exists"}), 400
 
@@ -233,7 +289,7 @@ def create_hull(ga_input_id):
 @ga_input_bp.route("/<uuid:ga_input_id>/hull", methods=["GET"])
 @jwt_required()
 def get_hull_geometry(ga_input_id):
-    hull = HullGeometry.query.filter_by(ga_input_id=ga_input_id).first()
+    hull = GAInputQueries.hull_query(ga_input_id).first()
 
     if not hull:
         return jsonify({"message": "Hull not found"}), 404
@@ -287,11 +343,13 @@ def get_hull_geometry(ga_input_id):
 def update_hull_geometry(ga_input_id):
     try:
         data = request.get_json()
-        hull = HullGeometry.query.filter_by(ga_input_id=ga_input_id).first()
+        hull = GAInputQueries.hull_query(ga_input_id).first()
 
         if not hull:
             return jsonify({"error": "Hull record not found"}), 404
 
+        before = _row_snapshot(hull)
+
         # Update fields
         hull.length_overall = data["length_overall"]
         hull.length_between_perpendiculars = data["length_between_perpendiculars"]
@@ -329,10 +387,50 @@ def update_hull_geometry(ga_input_id):
         hull.notes = data.get("notes")
         
         hull.modified_at = datetime.utcnow()
+
+        # Tell the client which drawing layers the next generation rebuilds
+        changed_columns = _changed_columns(before, hull)
+        changed_fields = [
+            HullGeometryBuilder.COLUMN_FIELDS[c] for c in changed_columns
+            if c in HullGeometryBuilder.COLUMN_FIELDS
+        ]
+        violations = _rule_violations(GAInputMaster.query.get(ga_input_id), changed_columns, hull)
         db.session.commit()
 
-        return jsonify({"message": "Hull updated successfully"}), 200
+        return jsonify({
+            "message": "Hull updated successfully",
+            "changed_fields": changed_fields,
+            "affected_layers": DXFGenerator.affected_layers(changed_fields),
+            "violations": violations
+        }), 200
 
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@ga_input_bp.route("/<uuid:ga_input_id>/hull/hydrostatics", methods=["GET"])
+@jwt_required()
+def get_hull_hydrostatics(ga_input_id):
+    hull = GAInputQueries.hull_query(ga_input_id).first()
+
+    if not hull:
+        return jsonify({"message": "Hull not found"}), 404
+
+    try:
+        table = HydrostaticsCalculator.compute(
+            HullGeometryBuilder.build(hull),
+            min_draft=request.args.get("min_draft", type=float),
+            max_draft=request.args.get("max_draft", type=float),
+            steps=min(request.args.get("steps", 20, type=int), 500)
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "hull_geometry_id": str(hull.hull_geometry_id),
+        "design_draft": float(hull.design_draft),
+        "hydrostatics": {
+            name: [None if math.isnan(v) else round(v, 4) for v in values.tolist()]
+            for name, values in table.items()
+        }
+    }), 200
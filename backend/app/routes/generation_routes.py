@@ -1,16 +1,175 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context, url_for
 from app.services.layout_engine import LayoutEngine
 from app.services.rule_engine import RuleEngine
+from app.services.rule_set_cache import rule_set_cache
 from app.services.dxf_generator import DXFGenerator
+from app.services.hull_sampler import HullCurveSampler
+from app.services.preview_renderer import PreviewRenderer
+from app.services.generation_cache import generation_cache, DXF_FILENAME
+from app.services.geometry_artifact import GeometryArtifact
+from app.services.offset_table import OffsetTableEngine
+from app.services.output_storage import output_storage
+from app.services.generation_jobs import generation_jobs, JobQueueFull
+from app.services.batch_generation import ParametricSweep, SweepError
+from app.services.ga_input_queries import GAInputQueries
 
 from app.db.models import AIGAOutput
-from app.db.models import GAInputMaster, HullGeometry
+from app.db.models import GAInputMaster, HullGeometry, Vessel
 from app.db.models import RuleMaster
 from app.services.hull_geometry_builder import HullGeometryBuilder
 from app.db.database import db
+from app.core.config import Config
+import json
+import math
+import os
+import uuid
 
 generation_bp = Blueprint("generation", __name__)
 
+
+def _sampling_options(data):
+    """
+    (num_stations, tolerance) from a request body; tolerance enables adaptive sampling.
+
+    Raises ValueError for anything that is not a usable number.
+    """
+    try:
+        num_stations = int(data.get("num_stations", 50))
+        tolerance = data.get("tolerance")
+        tolerance = float(tolerance) if tolerance else None
+    except (TypeError, ValueError):
+        raise ValueError("num_stations and tolerance must be numbers")
+
+    if not 1 <= num_stations <= Config.MAX_NUM_STATIONS:
+        raise ValueError(f"num_stations must be between 1 and {Config.MAX_NUM_STATIONS}")
+    # NaN would disable curve refinement and never match its own cache key
+    if tolerance is not None and not math.isfinite(tolerance):
+        raise ValueError("tolerance must be a finite number")
+    if tolerance is not None and tolerance < 1e-4:
+        raise ValueError("tolerance must be at least 0.0001 m")
+    return num_stations, tolerance
+
+
+def _with_download_urls(result):
+    """
+    Add fetchable URLs for every file of a generation result.
+    """
+    if not result:
+        return result
+
+    output_id = result["output_id"]
+    return {
+        **result,
+        "download_url": url_for("generation.download_output", output_id=output_id,
+                                filename=os.path.basename(result["file_path"])),
+        "preview_urls": {
+            tier: url_for("generation.download_output", output_id=output_id, filename=os.path.basename(path))
+            for tier, path in result["previews"].items()
+        },
+    }
+
+
+def _layout_inputs(ga_input):
+    """
+    LayoutEngine inputs for a GA input: vessel dimensions and type switches,
+    complement, and the hull's frame grid when a hull exists.
+    """
+    vessel = Vessel.query.get(ga_input.vessel_id)
+    hull = GAInputQueries.hull_query(ga_input.ga_input_id).first()
+    vessel_type = vessel.vessel_type if vessel else None
+
+    data = {
+        "loa": vessel.loa if vessel else None,
+        "beam": vessel.beam if vessel else None,
+        "depth": vessel.depth if vessel else None,
+        "draft": vessel.draft if vessel else None,
+        "vessel_type": vessel_type.type_code if vessel_type else None,
+        "tank_module_enabled": vessel_type.tank_module_enabled if vessel_type else False,
+        "fire_zones_required": vessel_type.fire_zones_required if vessel_type else False,
+    }
+
+    for column in ("regulatory_framework", "class_notation", "gross_tonnage", "deadweight",
+                   "crew_count", "officer_count", "rating_count", "passenger_count", "endurance_days"):
+        data[column] = getattr(ga_input, column)
+
+    if hull:
+        data.update({
+            "loa": hull.length_overall,
+            "lbp": hull.length_between_perpendiculars,
+            "beam": hull.breadth_moulded,
+            "depth": hull.depth_moulded,
+            "draft": hull.design_draft,
+            "frame_spacing": hull.frame_spacing,
+            "frame_numbering_origin": hull.frame_numbering_origin,
+            "frame_numbering_direction": hull.frame_numbering_direction,
+        })
+
+    return data
+
+
+@generation_bp.route("/layout", methods=["POST"])
+def generate_layout():
+    """
+    Search for the best arrangement of the main spaces of a GA input.
+
+    Body: {"ga_input_id", "candidates" (optional), "seed" (optional),
+    "persist" (optional)}. With "persist", the result is stored in
+    ai_ga_output.layout_data_json and later requests for the same inputs
+    and rules are answered from it.
+    """
+    data = request.get_json() or {}
+    ga_input_id = data.get("ga_input_id")
+    if not ga_input_id:
+        return jsonify({"error": "ga_input_id is required"}), 400
+
+    ga_input = GAInputMaster.query.filter_by(
+        ga_input_id=ga_input_id, is_active=True
+    ).first()
+    if not ga_input:
+        return jsonify({"error": "GA Input not found"}), 404
+
+    try:
+        candidates = min(max(int(data.get("candidates", LayoutEngine.DEFAULT_CANDIDATES)), 1), Config.LAYOUT_MAX_CANDIDATES)
+        seed = data.get("seed")
+        seed = int(seed) if seed is not None else None
+        inputs = _layout_inputs(ga_input)
+        persist = bool(data.get("persist"))
+
+        stored = None
+        if persist:
+            key = LayoutEngine.cache_key(inputs, candidates, seed, rule_set_cache.get())
+            stored = GAInputQueries.stored_layout_query(ga_input.ga_input_id, key).first()
+
+        if stored is not None:
+            result = {**stored.layout_data_json, "cached": True}
+        else:
+            result = LayoutEngine().search(
+                inputs, candidates=candidates, seed=seed,
+                workers=Config.LAYOUT_WORKERS, time_budget=Config.LAYOUT_TIME_BUDGET
+            )
+    except (TypeError, ValueError) as e:
+        # Also covers non-positive loa / beam and layouts with no feasible candidate
+        return jsonify({"error": str(e)}), 400
+
+    if persist and stored is None and result["complete"]:
+        stored = AIGAOutput(
+            project_id=ga_input.project_id,
+            vessel_id=ga_input.vessel_id,
+            ga_input_id=ga_input.ga_input_id,
+            cad_file_path="",
+            layout_data_json={k: v for k, v in result.items() if k != "cached"},
+            ai_model_version=f"layout-engine-{LayoutEngine.VERSION}",
+            generation_type="LAYOUT"
+        )
+        db.session.add(stored)
+        db.session.commit()
+
+    response = {"status": "success", "ga_input_id": str(ga_input.ga_input_id), **result}
+    if stored is not None:
+        response["ga_output_id"] = str(stored.ga_output_id)
+    return jsonify(response), 200
+
+
 @generation_bp.route("/generate", methods=["POST"])
 def generate_ga():
     data = request.get_json()
@@ -24,15 +183,36 @@ def generate_ga():
     if not ga_input:
         return jsonify({"error": "GA Input not found"}), 404
 
-    hull = HullGeometry.query.filter_by(ga_input_id=ga_input_id).first()
+    hull = GAInputQueries.hull_query(ga_input_id).first()
     if not hull:
         return jsonify({"error": "Hull geometry not found"}), 404
 
     # Build internal model
     hull_model = HullGeometryBuilder.build(hull)
+    try:
+        num_stations, tolerance = _sampling_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Reuse the stored drawing when this exact geometry was generated before
+    cache_key = generation_cache.make_key(hull_model, num_stations, tolerance)
+    cached = generation_cache.get(cache_key) is not None
 
-    # Generate DXF
-    file_path=DXFGenerator.generate(hull_model, "outputs/my_hull.dxf", generate_image=True)
+    if not cached:
+        def build(out_dir):
+            curves = HullCurveSampler.sample(hull_model, num_stations, tolerance)
+            DXFGenerator.generate(
+                hull_model,
+                os.path.join(out_dir, DXF_FILENAME),
+                num_stations=num_stations,
+                curves=curves,
+                tolerance=tolerance
+            )
+            PreviewRenderer.render(curves, out_dir)
+            GeometryArtifact.write(out_dir, hull_model, curves, OffsetTableEngine.compute(hull_model),
+                                   sampling={"num_stations": num_stations, "tolerance": tolerance})
+
+        generation_cache.put(cache_key, build)
 
     return jsonify({
         "status": "success",
@@ -41,5 +221,151 @@ def generate_ga():
             column.name: getattr(hull, column.name)
             for column in hull.__table__.columns
         },
-        "file_path": file_path
-    }), 200
\ No newline at end of file
+        **_with_download_urls(generation_cache.describe(cache_key, cached))
+    }), 200
+
+
+@generation_bp.route("/jobs", methods=["POST"])
+def create_generation_job():
+    data = request.get_json()
+    ga_input_id = data.get("ga_input_id")
+    if not ga_input_id:
+        return jsonify({"error": "ga_input_id is required"}), 400
+
+    ga_input = GAInputMaster.query.filter_by(
+        ga_input_id=ga_input_id, is_active=True
+    ).first()
+    if not ga_input:
+        return jsonify({"error": "GA Input not found"}), 404
+
+    hull = GAInputQueries.hull_query(ga_input_id).first()
+    if not hull:
+        return jsonify({"error": "Hull geometry not found"}), 404
+
+    hull_model = HullGeometryBuilder.build(hull)
+
+    try:
+        num_stations, tolerance = _sampling_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        job_id = generation_jobs.submit(hull_model, num_stations, tolerance)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+
+    job = generation_jobs.get(job_id)
+    job["result"] = _with_download_urls(job["result"])
+    return jsonify(job), 202
+
+
+@generation_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_generation_job(job_id):
+    job = generation_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    job["result"] = _with_download_urls(job["result"])
+    return jsonify(job), 200
+
+
+@generation_bp.route("/batch", methods=["POST"])
+def generate_batch():
+    """
+    Generate many variants at once and stream results as NDJSON lines.
+
+    Body is either {"ga_input_ids": [...]} or
+    {"base_ga_input_id": ..., "sweep": {"bilge_radius": [..], "bulb_length": {"start", "stop", "steps"}}}.
+    """
+    data = request.get_json() or {}
+    try:
+        num_stations, tolerance = _sampling_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if data.get("ga_input_ids"):
+        try:
+            ga_input_ids = [str(uuid.UUID(str(i))) for i in data["ga_input_ids"]]
+        except ValueError:
+            return jsonify({"error": "ga_input_ids must be UUIDs"}), 400
+        if len(ga_input_ids) > Config.BATCH_MAX_VARIANTS:
+            return jsonify({"error": f"At most {Config.BATCH_MAX_VARIANTS} GA inputs per batch"}), 400
+
+        models = HullGeometryBuilder.build_many(ga_input_ids)
+        missing = [i for i in ga_input_ids if i not in models]
+        if missing:
+            return jsonify({"error": "Hull geometry not found", "ga_input_ids": missing}), 404
+
+        variants = [({"ga_input_id": i}, models[i]) for i in ga_input_ids]
+
+    elif data.get("base_ga_input_id"):
+        try:
+            base_ga_input_id = uuid.UUID(str(data["base_ga_input_id"]))
+        except ValueError:
+            return jsonify({"error": "base_ga_input_id must be a UUID"}), 400
+
+        hull = (
+            HullGeometry.query
+            .join(GAInputMaster, GAInputMaster.ga_input_id == HullGeometry.ga_input_id)
+            .filter(HullGeometry.ga_input_id == base_ga_input_id, GAInputMaster.is_active == True)
+            .first()
+        )
+        if not hull:
+            return jsonify({"error": "Hull geometry not found"}), 404
+
+        try:
+            variants = ParametricSweep.expand(HullGeometryBuilder.build(hull), data.get("sweep"))
+        except SweepError as e:
+            return jsonify({"error": str(e)}), 400
+
+    else:
+        return jsonify({"error": "ga_input_ids or base_ga_input_id is required"}), 400
+
+    def stream():
+        failed = 0
+        models = [model for _, model in variants]
+
+        for index, result, error in generation_jobs.run_many(models, num_stations, tolerance):
+            line = {"index": index, "parameters": variants[index][0]}
+            if error is not None:
+                failed += 1
+                line.update({"status": "failed", "error": str(error)})
+            else:
+                line.update({"status": "success", **_with_download_urls(result)})
+            yield json.dumps(line) + "\n"
+
+        yield json.dumps({"done": True, "total": len(variants), "failed": failed}) + "\n"
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+
+@generation_bp.route("/outputs/<output_id>/<filename>", methods=["GET"])
+def download_output(output_id, filename):
+    """
+    Stream a generated file in chunks.
+
+    Supports Range requests and ETag / If-None-Match revalidation; output
+    directories never change once published.
+    """
+    path = output_storage.resolve(output_id, filename)
+    if not path:
+        return jsonify({"error": "File not found"}), 404
+
+    return send_file(
+        path,
+        as_attachment=filename.endswith(".dxf"),
+        download_name=filename,
+        conditional=True,
+        etag=True,
+        max_age=3600
+    )
+
+
+@generation_bp.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    return jsonify(generation_cache.stats()), 200
+
+
+@generation_bp.route("/rules/cache/stats", methods=["GET"])
+def get_rule_cache_stats():
+    return jsonify(rule_set_cache.stats()), 200
@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
 from app.db.database import db
 from app.db.models import ShipProject
+from app.services.project_queries import ProjectQueries, PROJECT_FILTERS
+from app.core.config import Config
 
 project_bp = Blueprint("projects", __name__)
 
@@ -57,85 +59,76 @@ def create_project():
 @project_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_all_projects():
-
-    projects = ShipProject.query.filter_by(is_deleted=False).all()
-
-    result = []
-
-    for project in projects:
-        result.append({
-            "project_id": str(project.project_id),
-            "project_code": project.project_code,
-            "project_name": project.project_name,
-            "project_type": project.project_type,
-            "client_name": project.client_name,
-            "shipyard_name": project.shipyard_name,
-            "project_status": project.project_status,
-            "start_date": project.start_date.strftime("%Y-%m-%d"),
-            "target_delivery_date": project.target_delivery_date.strftime("%Y-%m-%d") if project.target_delivery_date else None,
-            "vessel_id": str(project.vessel_id),
-            "created_by": str(project.created_by),
-            "created_at": project.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
+    """
+    Query: limit, cursor (next_cursor of the previous page), fields
+    (comma-separated columns) and project_status / project_type /
+    client_name / shipyard_name filters (comma-separated values).
+    """
+
+    try:
+        limit = int(request.args.get("limit", Config.PROJECT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = min(max(limit, 1), Config.PROJECT_PAGE_MAX)
+
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+
+    try:
+        projects, next_cursor = ProjectQueries.page(
+            limit, cursor=request.args.get("cursor"), filters=_project_filters(), fields=fields
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({
-        "total_projects": len(result),
-        "projects": result
+        "count": len(projects),
+        "projects": projects,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
     }), 200
 
+# project counts per status, for the dashboard
+@project_bp.route("/stats", methods=["GET"])
+@jwt_required()
+def get_project_stats():
+    """
+    Query: the same filters as GET /. Returns {"total", "by_status"}.
+    """
+
+    return jsonify(ProjectQueries.status_counts(_project_filters())), 200
+
+
+def _project_filters():
+    # PROJECT_FILTERS keys present in the query string, as lists of values
+    return {
+        key: [v.strip() for v in request.args[key].split(",") if v.strip()]
+        for key in PROJECT_FILTERS
+        if request.args.get(key)
+    }
+
 # get single project details 
 @project_bp.route("/<uuid:project_id>", methods=["GET"])
 @jwt_required()
 def get_project_by_id(project_id):
 
-    project = ShipProject.query.filter_by(
-        project_id=project_id,
-        is_deleted=False
-    ).first()
+    # Project, vessel and vessel type in one joined query
+    result = ProjectQueries.detail(project_id)
 
-    if not project:
+    if not result:
         return jsonify({"error": "Project not found"}), 404
 
-    result = {
-        "project_id": str(project.project_id),
-        "project_code": project.project_code,
-        "project_name": project.project_name,
-        "project_type": project.project_type,
-        "client_name": project.client_name,
-        "shipyard_name": project.shipyard_name,
-        "project_status": project.project_status,
-        "start_date": project.start_date.strftime("%Y-%m-%d"),
-        "target_delivery_date": project.target_delivery_date.strftime("%Y-%m-%d") if project.target_delivery_date else None,
-
-        # ✅ Vessel Details
-        "vessel": {
-            "vessel_id": str(project.vessel.vessel_id),
-            "loa": float(project.vessel.loa),
-            "beam": float(project.vessel.beam),
-            "draft": float(project.vessel.draft),
-            "depth": float(project.vessel.depth) if project.vessel.depth else None,
-            "displacement": float(project.vessel.displacement) if project.vessel.displacement else None,
-            "design_speed": float(project.vessel.design_speed) if project.vessel.design_speed else None,
-            "navigation_area": project.vessel.navigation_area,
-            "class_society": project.vessel.class_society,
-            "version_number": project.vessel.version_number,
-
-            # ✅ Vessel Type Details (FROM MASTER TABLE)
-            "vessel_type": {
-                "vessel_type_id": str(project.vessel.vessel_type.vessel_type_id),
-                "type_code": project.vessel.vessel_type.type_code,
-                "type_name": project.vessel.vessel_type.type_name,
-                "description": project.vessel.vessel_type.description,
-                "ai_weightage": float(project.vessel.vessel_type.ai_weightage) if project.vessel.vessel_type.ai_weightage else None,
-                "machinery_mandatory": project.vessel.vessel_type.machinery_mandatory,
-                "tank_module_enabled": project.vessel.vessel_type.tank_module_enabled,
-                "fire_zones_required": project.vessel.vessel_type.fire_zones_required
-            }
-        },
-
-        "created_by": str(project.created_by),
-        "created_at": project.created_at.strftime("%Y-%m-%d %H:%M:%S")
-    }
+    return jsonify(result), 200
+
+
+# project detail with the latest GA input and hull summary
+@project_bp.route("/<uuid:project_id>/summary", methods=["GET"])
+@jwt_required()
+def get_project_summary(project_id):
+
+    result = ProjectQueries.summary(project_id)
+
+    if not result:
+        return jsonify({"error": "Project not found"}), 404
 
     return jsonify(result), 200
 
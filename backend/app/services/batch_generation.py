@@ -0,0 +1,91 @@
+# app/services/batch_generation.py
+import itertools
+
+import numpy as np
+
+from app.core.config import Config
+
+
+class SweepError(ValueError):
+    pass
+
+
+class ParametricSweep:
+    """
+    Expands a base hull plus parameter ranges into concrete variants.
+
+    A range is either an explicit list of values or
+    {"start": a, "stop": b, "steps": n} (inclusive, evenly spaced).
+    """
+
+    SWEEPABLE_FIELDS = (
+        "loa", "lbp", "breadth", "depth", "draft",
+        "parallel_midbody_length", "bow_rake_angle", "stern_rake_angle",
+        "bilge_radius", "bulb_length", "bulb_height",
+        "block_coefficient", "prismatic_coefficient",
+        "midship_coefficient", "waterplane_coefficient",
+    )
+
+    @staticmethod
+    def values(spec, max_values=None):
+        """
+        Values of one range; raises SweepError for malformed ranges or more
+        than `max_values` values (checked before anything is allocated).
+        """
+        max_values = max_values or Config.BATCH_MAX_VARIANTS
+
+        try:
+            if isinstance(spec, (list, tuple)):
+                if len(spec) > max_values:
+                    raise SweepError(f"A range has at most {max_values} values")
+                values = [float(v) for v in spec]
+            elif isinstance(spec, dict):
+                steps = int(spec.get("steps", 2))
+                if steps < 1 or steps > max_values:
+                    raise SweepError(f"steps must be between 1 and {max_values}")
+                values = np.linspace(float(spec["start"]), float(spec["stop"]), steps).tolist()
+            else:
+                raise SweepError("A range must be a list or {start, stop, steps}")
+        except SweepError:
+            raise
+        except KeyError as e:
+            raise SweepError(f"Range is missing {e}")
+        except (TypeError, ValueError) as e:
+            raise SweepError(f"Range values must be numbers: {e}")
+
+        if not values:
+            raise SweepError("A range must contain at least one value")
+        return values
+
+    @staticmethod
+    def expand(base_model, sweep, max_variants=None):
+        """
+        Cartesian product of all ranges. Returns [(parameters, hull_model)].
+        """
+        max_variants = max_variants or Config.BATCH_MAX_VARIANTS
+
+        if not isinstance(sweep, dict) or not sweep:
+            raise SweepError("sweep must map field names to ranges")
+
+        unknown = set(sweep) - set(ParametricSweep.SWEEPABLE_FIELDS)
+        if unknown:
+            raise SweepError(f"Cannot sweep: {', '.join(sorted(unknown))}")
+
+        fields = sorted(sweep)
+        axes = [ParametricSweep.values(sweep[field], max_variants) for field in fields]
+
+        total = 1
+        for axis in axes:
+            total *= len(axis)
+        if total > max_variants:
+            raise SweepError(f"Sweep has {total} variants, the limit is {max_variants}")
+
+        variants = []
+        for combo in itertools.product(*axes):
+            parameters = dict(zip(fields, combo))
+            try:
+                model = base_model.replace(**parameters)
+            except (TypeError, ValueError) as e:
+                raise SweepError(f"Invalid variant {parameters}: {e}")
+            variants.append((parameters, model))
+        return variants
@@ -0,0 +1,263 @@
+# app/services/compartment_index.py
+import math
+import random
+
+INF = math.inf
+
+
+class Compartment:
+    """
+    Axis-aligned box: x along the hull from the FP, y athwartships from the
+    centreline, z up from the keel.
+    """
+
+    __slots__ = ("name", "x0", "x1", "y0", "y1", "z0", "z1")
+
+    def __init__(self, name, x0, x1, y0=-INF, y1=INF, z0=-INF, z1=INF):
+        self.name = name
+        self.x0, self.x1 = float(x0), float(x1)
+        self.y0, self.y1 = float(y0), float(y1)
+        self.z0, self.z1 = float(z0), float(z1)
+
+    def overlaps(self, other, tolerance=1e-6):
+        """
+        True when the boxes share a volume (touching faces do not count).
+        """
+        return (
+            self.x0 < other.x1 - tolerance and other.x0 < self.x1 - tolerance
+            and self.y0 < other.y1 - tolerance and other.y0 < self.y1 - tolerance
+            and self.z0 < other.z1 - tolerance and other.z0 < self.z1 - tolerance
+        )
+
+    def contains(self, other, tolerance=1e-6):
+        return (
+            self.x0 <= other.x0 + tolerance and other.x1 <= self.x1 + tolerance
+            and self.y0 <= other.y0 + tolerance and other.y1 <= self.y1 + tolerance
+            and self.z0 <= other.z0 + tolerance and other.z1 <= self.z1 + tolerance
+        )
+
+    def touches(self, other, tolerance=1e-6):
+        """
+        True when the boxes share a face (or part of one) without overlapping.
+        """
+        intersects = (
+            self.x0 <= other.x1 + tolerance and other.x0 <= self.x1 + tolerance
+            and self.y0 <= other.y1 + tolerance and other.y0 <= self.y1 + tolerance
+            and self.z0 <= other.z1 + tolerance and other.z0 <= self.z1 + tolerance
+        )
+        if not intersects or self.overlaps(other, tolerance):
+            return False
+
+        # A face contact overlaps with positive extent on the other two axes
+        spans = [
+            min(self.x1, other.x1) - max(self.x0, other.x0),
+            min(self.y1, other.y1) - max(self.y0, other.y0),
+            min(self.z1, other.z1) - max(self.z0, other.z0),
+        ]
+        return sum(span > tolerance for span in spans) == 2
+
+    def __repr__(self):
+        return f"Compartment({self.name!r}, x={self.x0}..{self.x1}, z={self.z0}..{self.z1})"
+
+
+class _Node:
+    __slots__ = ("key", "item", "priority", "left", "right", "max_end")
+
+    def __init__(self, item, priority):
+        self.key = (item.x0, item.name)
+        self.item = item
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = item.x1
+
+
+class CompartmentIndex:
+    """
+    Interval tree over the x extent of compartments, filtered on y / z.
+
+    A treap ordered by (x0, name) where every node also stores the largest
+    x1 in its subtree, so subtrees that end before a query range are
+    skipped. Inserts and removals are O(log n) expected and overlap,
+    containment and neighbour queries O(log n + k), which keeps the checks
+    incremental while a layout search moves bulkheads around.
+    """
+
+    def __init__(self, compartments=(), seed=0):
+        self._root = None
+        self._items = {}
+        self._random = random.Random(seed)  # deterministic tree shape
+        for compartment in compartments:
+            self.insert(compartment)
+
+    @staticmethod
+    def from_zones(zones, beam=None):
+        """
+        Index LayoutEngine zones ({name: {"start", "end", "bottom", "top"}}),
+        each spanning the full beam when `beam` is given.
+        """
+        y0, y1 = (-beam / 2, beam / 2) if beam else (-INF, INF)
+        return CompartmentIndex(
+            Compartment(name, zone["start"], zone["end"], y0, y1,
+                        zone.get("bottom", -INF), zone.get("top", INF))
+            for name, zone in zones.items()
+        )
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def get(self, name):
+        return self._items.get(name)
+
+    # -----------------------------
+    # Updates
+    # -----------------------------
+
+    def insert(self, compartment):
+        """
+        Add a compartment, replacing any existing one with the same name.
+        """
+        if compartment.name in self._items:
+            self.remove(compartment.name)
+
+        node = _Node(compartment, self._random.random())
+        left, right = self._split(self._root, node.key)
+        self._root = self._merge(self._merge(left, node), right)
+        self._items[compartment.name] = compartment
+
+    def remove(self, name):
+        compartment = self._items.pop(name, None)
+        if compartment is None:
+            return None
+
+        key = (compartment.x0, compartment.name)
+        left, rest = self._split(self._root, key)
+        _, right = self._split(rest, key, inclusive=True)
+        self._root = self._merge(left, right)
+        return compartment
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+
+    def in_range(self, x0, x1):
+        """
+        Compartments whose x extent intersects [x0, x1] (touching included).
+        """
+        found = []
+        self._collect(self._root, x0, x1, found)
+        return found
+
+    def overlapping(self, box, tolerance=1e-6):
+        """
+        Compartments sharing a volume with `box` (a Compartment).
+        """
+        return [
+            c for c in self.in_range(box.x0, box.x1)
+            if c.name != box.name and c.overlaps(box, tolerance)
+        ]
+
+    def containing(self, box, tolerance=1e-6):
+        """
+        Compartments that fully enclose `box`.
+        """
+        return [
+            c for c in self.in_range(box.x0, box.x1)
+            if c.name != box.name and c.contains(box, tolerance)
+        ]
+
+    def neighbours(self, name, tolerance=1e-6):
+        """
+        Compartments sharing a face with the named one (bulkhead or deck).
+        """
+        box = self._items[name]
+        return [
+            c for c in self.in_range(box.x0 - tolerance, box.x1 + tolerance)
+            if c.name != name and c.touches(box, tolerance)
+        ]
+
+    def adjacency(self, tolerance=1e-6):
+        """
+        {name: sorted neighbour names} for every compartment.
+        """
+        return {
+            name: sorted(c.name for c in self.neighbours(name, tolerance))
+            for name in self._items
+        }
+
+    def crossing(self, x, tolerance=1e-6):
+        """
+        Compartments a transverse plane at `x` cuts through.
+        """
+        return [
+            c for c in self.in_range(x, x)
+            if c.x0 < x - tolerance and x + tolerance < c.x1
+        ]
+
+    # -----------------------------
+    # Treap internals
+    # -----------------------------
+
+    @staticmethod
+    def _update(node):
+        node.max_end = node.item.x1
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    @staticmethod
+    def _split(node, key, inclusive=False):
+        """
+        (keys < key, keys >= key), or (keys <= key, keys > key) with `inclusive`.
+        """
+        if node is None:
+            return None, None
+
+        goes_left = node.key <= key if inclusive else node.key < key
+        if goes_left:
+            left, right = CompartmentIndex._split(node.right, key, inclusive)
+            node.right = left
+            CompartmentIndex._update(node)
+            return node, right
+
+        left, right = CompartmentIndex._split(node.left, key, inclusive)
+        node.left = right
+        CompartmentIndex._update(node)
+        return left, node
+
+    @staticmethod
+    def _merge(left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = CompartmentIndex._merge(left.right, right)
+            CompartmentIndex._update(left)
+            return left
+
+        right.left = CompartmentIndex._merge(left, right.left)
+        CompartmentIndex._update(right)
+        return right
+
+    @staticmethod
+    def _collect(node, x0, x1, found):
+        while node is not None:
+            # Nothing in this subtree reaches x0
+            if node.max_end < x0:
+                return
+            CompartmentIndex._collect(node.left, x0, x1, found)
+            # Everything from here on starts after x1
+            if node.item.x0 > x1:
+                return
+            if node.item.x1 >= x0:
+                found.append(node.item)
+            node = node.right
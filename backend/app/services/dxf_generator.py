@@ -1,11 +1,51 @@
 # app/services/dxf_generator.py
+import hashlib
+
 import ezdxf
-import math
-import matplotlib.pyplot as plt
+import numpy as np
+
+from app.services.frame_grid import FrameGrid
+from app.services.hull_sampler import HullCurveSampler
+from app.services.memo_cache import MemoCache
+from app.services.preview_renderer import PreviewRenderer
 
 class DXFGenerator:
+    # Bump whenever the drawing output changes, so cached drawings are rebuilt
+    VERSION = "5"
+
+    # DXF layer -> HullGeometryModel fields its entities are built from.
+    # Curve layers also depend on the sampling (num_stations / tolerance).
+    LAYER_FIELDS = {
+        "SIDE_PROFILE": HullCurveSampler.CURVE_FIELDS["side_profile"],
+        "REFERENCE": ("lbp", "keel_z", "deck_z", "midship_x"),
+        "HALF_BREADTH": HullCurveSampler.CURVE_FIELDS["half_breadth"],
+        "BULB": HullCurveSampler.CURVE_FIELDS["bulb"],
+        "BILGE": HullCurveSampler.CURVE_FIELDS["bilge"],
+        "LABELS": ("keel_z", "deck_z", "midship_x", "draft", "bulbous_bow",
+                   "bulb_length", "bulb_height", "bilge_radius"),
+        "FRAMES": ("lbp", "keel_z", "midship_x", "frame_spacing",
+                   "frame_numbering_origin", "frame_numbering_direction"),
+    }
+    # Layers written in batches straight into the document, never cached
+    STREAMED_LAYERS = ("FRAMES",)
+
+    FRAME_TICK = 0.5  # m below the keel
+
+    CURVE_LAYERS = {
+        "SIDE_PROFILE": "side_profile",
+        "HALF_BREADTH": "half_breadth",
+        "BULB": "bulb",
+        "BILGE": "bilge",
+    }
+
+    # Derived model fields -> the input field they come from
+    _DERIVED_FROM = {"midship_x": "lbp", "deck_z": "depth"}
+
+    _layer_cache = MemoCache(max_entries=512)
+
     @staticmethod
-    def generate(hull_model, filename="hull_output.dxf", num_stations=50, generate_image=False):
+    def generate(hull_model, filename="hull_output.dxf", num_stations=50, generate_image=False,
+                 image_filename="hull_labeled.png", curves=None, tolerance=None):
         """
         Realistic 2D hull DXF generator with labeled parts and improved bilge curve.
 
@@ -15,130 +55,173 @@ class DXFGenerator:
         - Half-breadth flare
         - Elliptical bulbous bow
         - Smooth bilge using cubic blend (more realistic)
-        - DXF labels and color coding
+        - DXF labels and color coding, one DXF layer per part
         - Optional labeled image output
+
+        Pass `curves` from HullCurveSampler.sample to reuse existing samples,
+        or a chordal `tolerance` (m) to sample curves adaptively instead of
+        at `num_stations` fixed steps.
+
+        Each layer's entities are cached on the fields in LAYER_FIELDS, so
+        after a one-field edit only the layers reading that field are rebuilt.
         """
         doc = ezdxf.new(dxfversion="R2010")
         msp = doc.modelspace()
 
-        # Extract parameters
-        loa = hull_model.loa
-        lbp = hull_model.lbp
-        keel_z = hull_model.keel_z
-        deck_z = hull_model.deck_z
-        midship_x = hull_model.midship_x
-        breadth = hull_model.breadth
-        draft = hull_model.draft
-        parallel_length = hull_model.parallel_midbody_length
-        bulbous = hull_model.bulbous_bow
-        bulb_length = hull_model.bulb_length
-        bulb_height = hull_model.bulb_height
-        bilge_radius = hull_model.bilge_radius
+        for layer, entities in DXFGenerator.build_layers(hull_model, num_stations, tolerance, curves).items():
+            if not entities:
+                continue
+            doc.layers.add(layer)
+            DXFGenerator._write(msp, layer, entities)
+
+        frame_grid = FrameGrid.for_hull(hull_model)
+        if len(frame_grid):
+            doc.layers.add("FRAMES")
+            DXFGenerator._write_frames(msp, hull_model, frame_grid)
 
         # -----------------------------
-        # 1️⃣ Side profile (X vs Z)
+        # Save DXF
         # -----------------------------
-        side_points = []
-        bow_length = hull_model.bow_rake_angle * lbp / 100  # approximate bow length
-        stern_length = hull_model.stern_rake_angle * lbp / 100  # approximate stern length
-
-        for i in range(num_stations + 1):
-            x = (lbp / num_stations) * i
-            if x < bow_length:
-                t = x / bow_length
-                z = keel_z + draft * (3*t**2 - 2*t**3)  # cubic interpolation
-            elif x > lbp - stern_length:
-                t = (lbp - x) / stern_length
-                z = keel_z + draft * (3*t**2 - 2*t**3)
-            else:
-                z = keel_z + draft
-            side_points.append((x, z))
+        doc.saveas(filename)
 
-        msp.add_spline(side_points, dxfattribs={'color': 1})  # red
+        # -----------------------------
+        # Optional: generate labeled image
+        # -----------------------------
+        if generate_image:
+            if curves is None:
+                curves = HullCurveSampler.sample(hull_model, num_stations, tolerance)
+            PreviewRenderer.render_tier(curves, image_filename, "print")
 
-        # Deck, keel, midship
-        msp.add_line((0, deck_z), (lbp, deck_z), dxfattribs={'color': 2})  # green
-        msp.add_line((0, keel_z), (lbp, keel_z), dxfattribs={'color': 3})   # blue
-        msp.add_line((midship_x, keel_z), (midship_x, deck_z), dxfattribs={'color': 4}) # yellow
+        return filename
 
-        # Labels
-        msp.add_text("Deck", dxfattribs={'insert': (midship_x, deck_z + 0.5), 'height': 0.5})
-        msp.add_text("Keel", dxfattribs={'insert': (midship_x, keel_z - 0.5), 'height': 0.5})
-        msp.add_text("Midship", dxfattribs={'insert': (midship_x + 1, draft/2), 'height': 0.5})
+    @staticmethod
+    def affected_layers(changed_fields):
+        """
+        Layers that must be rebuilt after the given model fields change.
+        """
+        changed = set(changed_fields)
+        return [
+            layer for layer, fields in DXFGenerator.LAYER_FIELDS.items()
+            if any(DXFGenerator._DERIVED_FROM.get(f, f) in changed for f in fields)
+        ]
 
-        # -----------------------------
-        # 2️⃣ Bulbous bow (smoothed ellipse)
-        # -----------------------------
-        bulb_points = []
-        if bulbous and bulb_length > 0 and bulb_height > 0:
-            for angle in range(0, 181, 5):
-                rad = math.radians(angle)
-                bx = -bulb_length * math.cos(rad)
-                bz = keel_z - bulb_height * math.sin(rad) * 0.6
-                bulb_points.append((bx, bz))
-            msp.add_spline(bulb_points, dxfattribs={'color': 5})  # cyan
-            msp.add_text("Bulbous Bow", dxfattribs={'insert': (-bulb_length/2, keel_z - bulb_height/2), 'height': 0.5})
+    # -----------------------------
+    # Layers
+    # -----------------------------
 
-        # -----------------------------
-        # 3️⃣ Half-breadth (X vs Y)
-        # -----------------------------
-        half_breadth_points = []
-        for i in range(num_stations + 1):
-            x = (lbp / num_stations) * i
-            if x < bow_length:
-                y = (breadth / 2) * (x / bow_length) ** 0.5
-            elif x > lbp - stern_length:
-                y = (breadth / 2) * ((lbp - x) / stern_length) ** 0.5
+    @staticmethod
+    def build_layers(hull_model, num_stations=50, tolerance=None, curves=None):
+        """
+        {layer: [entity spec]} with unchanged layers taken from the cache.
+
+        Entity specs are ("spline", points, attribs), ("line", start, end,
+        attribs) or ("text", text, attribs); writing them into a document is
+        cheap compared to sampling.
+
+        Curve layers built from caller-supplied `curves` are keyed on the
+        points themselves, so they never pick up entities sampled another way.
+        """
+        sampling = ("tol", float(tolerance)) if tolerance else ("n", num_stations)
+        layers = {}
+
+        for layer, fields in DXFGenerator.LAYER_FIELDS.items():
+            if layer in DXFGenerator.STREAMED_LAYERS:
+                continue
+            key = (DXFGenerator.VERSION, layer, tuple(getattr(hull_model, f) for f in fields))
+            if layer in DXFGenerator.CURVE_LAYERS:
+                if curves is not None:
+                    key += (DXFGenerator._points_key(getattr(curves, DXFGenerator.CURVE_LAYERS[layer])),)
+                else:
+                    key += (sampling,)
+
+            layers[layer] = DXFGenerator._layer_cache.get_or_compute(
+                key, lambda layer=layer: DXFGenerator._build_layer(layer, hull_model, num_stations, tolerance, curves)
+            )
+
+        return layers
+
+    @staticmethod
+    def _points_key(points):
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        return ("points", len(points), hashlib.blake2b(points.tobytes(), digest_size=16).hexdigest())
+
+    @staticmethod
+    def _build_layer(layer, hull_model, num_stations, tolerance, curves):
+        keel_z = hull_model.keel_z
+        deck_z = hull_model.deck_z
+        midship_x = hull_model.midship_x
+
+        if layer in DXFGenerator.CURVE_LAYERS:
+            name = DXFGenerator.CURVE_LAYERS[layer]
+            if curves is not None:
+                points = getattr(curves, name)
             else:
-                y = breadth / 2
-            half_breadth_points.append((x, y))
-        msp.add_spline(half_breadth_points, dxfattribs={'color': 6})  # magenta
+                points = HullCurveSampler.sample_curve(hull_model, name, num_stations, tolerance)
+            if not len(points):
+                return []
+
+            colors = {
+                "SIDE_PROFILE": 1,  # red
+                "BULB": 5,          # cyan
+                "HALF_BREADTH": 6,  # magenta
+                "BILGE": 7,         # white
+            }
+            return [("spline", points, {'color': colors[layer]})]
+
+        if layer == "REFERENCE":
+            lbp = hull_model.lbp
+            return [
+                ("line", (0, deck_z), (lbp, deck_z), {'color': 2}),  # green, deck
+                ("line", (0, keel_z), (lbp, keel_z), {'color': 3}),  # blue, keel
+                ("line", (midship_x, keel_z), (midship_x, deck_z), {'color': 4}),  # yellow, midship
+            ]
+
+        # LABELS
+        labels = [
+            ("text", "Deck", {'insert': (midship_x, deck_z + 0.5), 'height': 0.5}),
+            ("text", "Keel", {'insert': (midship_x, keel_z - 0.5), 'height': 0.5}),
+            ("text", "Midship", {'insert': (midship_x + 1, hull_model.draft/2), 'height': 0.5}),
+        ]
+        if HullCurveSampler.has_bulb(hull_model):
+            bulb_length, bulb_height = hull_model.bulb_length, hull_model.bulb_height
+            labels.append(("text", "Bulbous Bow",
+                           {'insert': (-bulb_length/2, keel_z - bulb_height/2), 'height': 0.5}))
+        if hull_model.bilge_radius > 0:
+            bilge_radius = hull_model.bilge_radius
+            labels.append(("text", "Bilge",
+                           {'insert': (bilge_radius/2, keel_z + bilge_radius/2), 'height': 0.5}))
+        return labels
 
-        # -----------------------------
-        # 4️⃣ Improved Bilge (cubic blend for smoother curvature)
-        # -----------------------------
-        if bilge_radius > 0:
-            bilge_points = []
-            steps = 30
-            for i in range(steps + 1):
-                t = i / steps
-                # Cubic blend from keel to side
-                x = (1 - t)**3 * 0 \
-                    + 3 * (1 - t)**2 * t * (bilge_radius * 0.4) \
-                    + 3 * (1 - t) * t**2 * (bilge_radius * 0.8) \
-                    + t**3 * bilge_radius
-
-                z = (1 - t)**3 * keel_z \
-                    + 3 * (1 - t)**2 * t * (keel_z + bilge_radius * 0.25) \
-                    + 3 * (1 - t) * t**2 * (keel_z + bilge_radius * 0.6) \
-                    + t**3 * (keel_z + bilge_radius)
-
-                bilge_points.append((x, z))
-            msp.add_spline(bilge_points, dxfattribs={'color': 7})  # white
-            msp.add_text("Bilge", dxfattribs={'insert': (bilge_radius/2, keel_z + bilge_radius/2), 'height': 0.5})
+    @staticmethod
+    def _write_frames(msp, hull_model, frame_grid):
+        """
+        Frame ticks and labels along the keel, added one batch at a time.
 
-        # -----------------------------
-        # Save DXF
-        # -----------------------------
-        doc.saveas(filename)
+        Long hulls with tight spacing have thousands of frames; entities go
+        into the document batch by batch instead of through a spec list.
+        """
+        keel_z = hull_model.keel_z
+        tick_bottom = keel_z - DXFGenerator.FRAME_TICK
+        label_z = tick_bottom - 0.2
+        label_height = min(0.5, frame_grid.spacing * 0.6)
 
-        # -----------------------------
-        # Optional: generate labeled image
-        # -----------------------------
-        if generate_image:
-            plt.figure(figsize=(10, 5))
-            plt.plot([x for x,z in side_points], [z for x,z in side_points], 'r', label='Side Profile')
-            plt.plot([x for x,y in half_breadth_points], [y for x,y in half_breadth_points], 'm', label='Half-Breadth')
-            if bulb_points:
-                plt.plot([x for x,z in bulb_points], [z for x,z in bulb_points], 'c', label='Bulbous Bow')
-            if bilge_radius > 0:
-                plt.plot([x for x,z in bilge_points], [z for x,z in bilge_points], 'k', label='Bilge')
-            plt.xlabel('X (m)')
-            plt.ylabel('Z / Y (m)')
-            plt.title('Hull Profile with Labeled Parts')
-            plt.legend()
-            plt.grid(True)
-            plt.savefig('hull_labeled.png', dpi=300)
-            plt.show()
-
-        return filename
\ No newline at end of file
+        line_attribs = {'color': 8, 'layer': "FRAMES"}
+        text_attribs = {'height': label_height, 'rotation': 90, 'layer': "FRAMES"}
+
+        msp.add_line((0, tick_bottom), (hull_model.lbp, tick_bottom), dxfattribs=line_attribs)
+
+        for positions, _, labels in frame_grid.iter_batches():
+            for x, label in zip(positions.tolist(), labels.tolist()):
+                msp.add_line((x, keel_z), (x, tick_bottom), dxfattribs=line_attribs)
+                msp.add_text(label, dxfattribs={**text_attribs, 'insert': (x + label_height / 2, label_z)})
+
+    @staticmethod
+    def _write(msp, layer, entities):
+        for kind, *args in entities:
+            attribs = dict(args[-1], layer=layer)
+            if kind == "spline":
+                msp.add_spline(args[0], dxfattribs=attribs)
+            elif kind == "line":
+                msp.add_line(args[0], args[1], dxfattribs=attribs)
+            elif kind == "text":
+                msp.add_text(args[0], dxfattribs=attribs)
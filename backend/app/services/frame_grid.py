@@ -0,0 +1,126 @@
+# app/services/frame_grid.py
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+
+
+class FrameGrid:
+    """
+    Structural frame positions along the hull, derived from frame_spacing.
+
+    Drawing coordinates put the FP at x = 0 and the AP at x = LBP. Frame 0
+    sits at the numbering origin (AP, FP or MIDSHIP). Numbers increase
+    forward for AFT_TO_FWD and aft for FWD_TO_AFT, and are negative on the
+    far side of a midship origin.
+
+    Positions are kept sorted by x as a NumPy array, so `frame_at` is a
+    bisect over it.
+    """
+
+    BATCH_SIZE = 512
+
+    _memo = MemoCache(max_entries=64)
+
+    def __init__(self, hull_model):
+        self.spacing = hull_model.frame_spacing
+        self.lbp = hull_model.lbp
+
+        origin = (hull_model.frame_numbering_origin or "AP").upper()
+        self.origin_x = {"AP": hull_model.lbp, "FP": 0.0, "MIDSHIP": hull_model.midship_x}.get(origin, hull_model.lbp)
+
+        # x change per frame number
+        direction = (hull_model.frame_numbering_direction or "AFT_TO_FWD").upper()
+        self.step = -self.spacing if direction == "AFT_TO_FWD" else self.spacing
+
+        if self.spacing <= 0:
+            self.numbers = np.empty(0, dtype=np.int64)
+        else:
+            # Frame numbers whose position falls within [0, LBP]
+            eps = 1e-9
+            bounds = ((0.0 - self.origin_x) / self.step, (self.lbp - self.origin_x) / self.step)
+            first = math.ceil(min(bounds) - eps)
+            last = math.floor(max(bounds) + eps)
+            numbers = np.arange(first, last + 1, dtype=np.int64)
+            # Ascending x order
+            self.numbers = numbers if self.step > 0 else numbers[::-1].copy()
+
+        self.positions = self.origin_x + self.numbers * self.step
+        self.positions.flags.writeable = False
+        self.numbers.flags.writeable = False
+
+    @staticmethod
+    def for_hull(hull_model):
+        """
+        Shared grid for a hull, memoized on its frame fields.
+        """
+        key = (hull_model.lbp, hull_model.midship_x, hull_model.frame_spacing,
+               hull_model.frame_numbering_origin, hull_model.frame_numbering_direction)
+        return FrameGrid._memo.get_or_compute(key, lambda: FrameGrid(hull_model))
+
+    def __len__(self):
+        return len(self.positions)
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+
+    def position(self, number):
+        """
+        x of frame `number`.
+        """
+        return self.origin_x + number * self.step
+
+    def frame_at(self, x):
+        """
+        Number of the last frame at or before `x` (position <= x), or None
+        if `x` lies before the first frame.
+        """
+        index = bisect_right(self.positions, x) - 1
+        if index < 0:
+            return None
+        return int(self.numbers[index])
+
+    def nearest_frame(self, x):
+        if not len(self.positions):
+            return None
+        index = bisect_right(self.positions, x)
+        candidates = [i for i in (index - 1, index) if 0 <= i < len(self.positions)]
+        best = min(candidates, key=lambda i: abs(self.positions[i] - x))
+        return int(self.numbers[best])
+
+    def snap(self, x):
+        """
+        Position of the frame nearest to `x`.
+        """
+        number = self.nearest_frame(x)
+        return x if number is None else float(self.position(number))
+
+    def snap_array(self, xs):
+        """
+        Vectorized `snap`: each x moved to its nearest frame position.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        if not len(self.positions):
+            return xs.copy()
+
+        index = np.clip(np.searchsorted(self.positions, xs), 1, len(self.positions) - 1)
+        before = self.positions[index - 1]
+        after = self.positions[index]
+        return np.where(np.abs(xs - before) <= np.abs(after - xs), before, after)
+
+    # -----------------------------
+    # Streaming
+    # -----------------------------
+
+    def iter_batches(self, batch_size=BATCH_SIZE):
+        """
+        Yield (positions, numbers, labels) array chunks in ascending x.
+        """
+        for start in range(0, len(self.positions), batch_size):
+            positions = self.positions[start:start + batch_size]
+            numbers = self.numbers[start:start + batch_size]
+            labels = np.char.add("Fr ", numbers.astype(str))
+            yield positions, numbers, labels
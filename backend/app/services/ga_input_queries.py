@@ -0,0 +1,48 @@
+# app/services/ga_input_queries.py
+from sqlalchemy import func
+
+from app.db.database import db
+from app.db.models import AIGAOutput, GAInputMaster, HullGeometry
+
+
+class GAInputQueries:
+    """
+    Query builders for the GA input lookups on the hot paths. The routes
+    run them and `flask check-query-plans` explains the same statements.
+    """
+
+    @staticmethod
+    def latest_query(project_id):
+        """
+        The current active GA input of a project (highest version first).
+        """
+        return GAInputMaster.query.filter_by(
+            project_id=project_id,
+            is_active=True,
+            is_current_version=True
+        ).order_by(GAInputMaster.version_number.desc())
+
+    @staticmethod
+    def max_version_query(project_id):
+        """
+        Highest version number among the project's active GA inputs.
+        """
+        return db.session.query(func.max(GAInputMaster.version_number)).filter(
+            GAInputMaster.project_id == project_id,
+            GAInputMaster.is_active == True
+        )
+
+    @staticmethod
+    def hull_query(ga_input_id):
+        return HullGeometry.query.filter_by(ga_input_id=ga_input_id)
+
+    @staticmethod
+    def stored_layout_query(ga_input_id, cache_key):
+        """
+        Persisted layouts of a GA input for one LayoutEngine cache key, newest first.
+        """
+        return AIGAOutput.query.filter(
+            AIGAOutput.ga_input_id == ga_input_id,
+            AIGAOutput.generation_type == "LAYOUT",
+            AIGAOutput.layout_data_json["cache_key"].astext == cache_key
+        ).order_by(AIGAOutput.generated_at.desc())
@@ -0,0 +1,207 @@
+# app/services/generation_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from app.core.config import Config
+from app.services.dxf_generator import DXFGenerator
+from app.services.geometry_artifact import GeometryArtifact
+from app.services.output_storage import output_storage
+from app.services.preview_renderer import PreviewRenderer
+
+# File names inside each cache entry
+DXF_FILENAME = "hull.dxf"
+IMAGE_FILENAME = PreviewRenderer.filename("print")
+
+
+class GenerationCache:
+    """
+    Content-addressed on-disk cache of generated hull drawings.
+
+    Entries are OutputStorage directories whose output id is the cache key,
+    evicted least recently used first once the total size exceeds
+    `max_bytes`. Entries are built in a private per-request directory and
+    moved into place, so readers never see a half-written drawing.
+    """
+
+    def __init__(self, storage, max_bytes):
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self._load_index()
+
+    # -----------------------------
+    # Keys
+    # -----------------------------
+
+    @staticmethod
+    def make_key(hull_model, num_stations, tolerance=None, version=DXFGenerator.VERSION):
+        sampling = f"tol={float(tolerance)!r}" if tolerance else f"n={num_stations}"
+        payload = f"{hull_model.fingerprint()}|{sampling}|{version}|geometry={GeometryArtifact.FORMAT_VERSION}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def entry_dir(self, key):
+        return self.storage.path_for(key)
+
+    def describe(self, key, cached):
+        """
+        Output id and file paths of a published entry.
+        """
+        entry_dir = self.entry_dir(key)
+        return {
+            "output_id": key,
+            "file_path": os.path.join(entry_dir, DXF_FILENAME),
+            "image_path": os.path.join(entry_dir, IMAGE_FILENAME),
+            "geometry_path": os.path.join(entry_dir, GeometryArtifact.DIRNAME),
+            "previews": {
+                tier: os.path.join(entry_dir, PreviewRenderer.filename(tier))
+                for tier in PreviewRenderer.TIERS
+            },
+            "cache_key": key,
+            "cached": cached,
+        }
+
+    # -----------------------------
+    # Lookup / store
+    # -----------------------------
+
+    def get(self, key):
+        """
+        Return the cached entry directory for `key`, or None on a miss.
+        """
+        path = self.entry_dir(key)
+
+        with self._lock:
+            if not os.path.isdir(path):
+                if key in self._entries:
+                    self._forget(key)
+                self.misses += 1
+                return None
+
+            # Touched under the lock so _evict cannot remove it in between; another
+            # process sharing the directory still can, which counts as a miss
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                if key in self._entries:
+                    self._forget(key)
+                self.misses += 1
+                return None
+
+            if key not in self._entries:
+                # Written by another process sharing the cache directory
+                self._remember(key, self._dir_size(path))
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return path
+
+    def put(self, key, build):
+        """
+        Run `build(tmp_dir)` to produce the entry files, then publish them.
+
+        Returns the final entry directory.
+        """
+        tmp_dir = self.reserve()
+
+        try:
+            build(tmp_dir)
+        except Exception:
+            self.discard(tmp_dir)
+            raise
+
+        return self.publish(key, tmp_dir)
+
+    def reserve(self):
+        """
+        Private directory to build an entry in before `publish`.
+        """
+        _, tmp_dir = self.storage.allocate()
+        return tmp_dir
+
+    def discard(self, tmp_dir):
+        self.storage.remove(os.path.basename(tmp_dir))
+
+    def publish(self, key, tmp_dir):
+        """
+        Move a built entry into place and account for it.
+        """
+        path = self.entry_dir(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.rename(tmp_dir, path)
+            self.storage.prune(os.path.basename(tmp_dir))
+        except OSError:
+            # A concurrent request published the same entry first
+            self.discard(tmp_dir)
+        size = self._dir_size(path)
+
+        with self._lock:
+            if key not in self._entries:
+                self._remember(key, size)
+            self._entries.move_to_end(key)
+            self._evict()
+
+        return path
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    # -----------------------------
+    # Internals (call with lock held)
+    # -----------------------------
+
+    def _remember(self, key, size):
+        self._entries[key] = size
+        self._total_bytes += size
+
+    def _forget(self, key):
+        self._total_bytes -= self._entries.pop(key)
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, _ = next(iter(self._entries.items()))
+            self._forget(key)
+            self.storage.remove(key)
+            self.evictions += 1
+
+    def _load_index(self):
+        """
+        Rebuild the LRU order from entry mtimes left by a previous run.
+        """
+        found = []
+        for output_id, path in self.storage.iter_outputs():
+            # Cache keys are SHA-256 hex; shorter ids are per-request builds
+            if len(output_id) == 64:
+                found.append((os.stat(path).st_mtime, output_id, self._dir_size(path)))
+
+        for _, key, size in sorted(found):
+            self._remember(key, size)
+
+    @staticmethod
+    def _dir_size(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path)
+            for name in files
+        )
+
+
+generation_cache = GenerationCache(output_storage, Config.GENERATION_CACHE_MAX_BYTES)
@@ -0,0 +1,294 @@
+# app/services/generation_jobs.py
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from app.core.config import Config
+from app.services.dxf_generator import DXFGenerator
+from app.services.generation_cache import generation_cache, DXF_FILENAME
+from app.services.geometry_artifact import GeometryArtifact
+from app.services.hull_sampler import HullCurveSampler
+from app.services.offset_table import OffsetTableEngine
+from app.services.preview_renderer import PreviewRenderer
+
+
+# -----------------------------
+# Pipeline stages (run inside pool workers)
+# -----------------------------
+
+def _write_geometry(hull_model, out_dir, curves, num_stations, tolerance):
+    GeometryArtifact.write(out_dir, hull_model, curves, OffsetTableEngine.compute(hull_model),
+                           sampling={"num_stations": num_stations, "tolerance": tolerance})
+
+
+def _run_dxf_stage(hull_model, out_dir, num_stations, tolerance):
+    curves = HullCurveSampler.sample(hull_model, num_stations, tolerance)
+    _write_geometry(hull_model, out_dir, curves, num_stations, tolerance)
+    return DXFGenerator.generate(hull_model, os.path.join(out_dir, DXF_FILENAME),
+                                 num_stations=num_stations, curves=curves, tolerance=tolerance)
+
+
+def _run_preview_stage(hull_model, out_dir, num_stations, tolerance):
+    curves = HullCurveSampler.sample(hull_model, num_stations, tolerance)
+    return PreviewRenderer.render(curves, out_dir)
+
+
+def _run_pipeline(hull_model, out_dir, num_stations, tolerance):
+    curves = HullCurveSampler.sample(hull_model, num_stations, tolerance)
+    DXFGenerator.generate(hull_model, os.path.join(out_dir, DXF_FILENAME), num_stations=num_stations,
+                          curves=curves, tolerance=tolerance)
+    _write_geometry(hull_model, out_dir, curves, num_stations, tolerance)
+    return PreviewRenderer.render(curves, out_dir)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class GenerationJobManager:
+    """
+    Runs hull generation off the request thread on a bounded process pool.
+
+    The request thread only loads the hull row and submits the job; the DXF
+    and preview stages run in parallel in worker processes. Job state lives
+    in memory and is reported through `get`.
+    """
+
+    STAGES = ("load", "dxf", "preview")
+    MAX_FINISHED_JOBS = 1000
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._jobs = OrderedDict()
+        self._pending = 0
+
+    def _get_executor(self):
+        # Created lazily and with "spawn" so workers never inherit the
+        # server's threads, DB connections or matplotlib state.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+
+    def submit(self, hull_model, num_stations=50, tolerance=None):
+        """
+        Queue a generation for `hull_model` and return the job id.
+
+        Raises JobQueueFull when `max_pending` jobs are already running.
+        """
+        job_id = uuid.uuid4().hex
+        cache_key = generation_cache.make_key(hull_model, num_stations, tolerance)
+
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "stages": {stage: "pending" for stage in self.STAGES},
+            "result": None,
+            "error": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "_futures": {},
+        }
+        job["stages"]["load"] = "done"
+
+        # Cache hit: nothing to run
+        if generation_cache.get(cache_key) is not None:
+            job["stages"]["dxf"] = job["stages"]["preview"] = "done"
+            self._finish(job, generation_cache.describe(cache_key, cached=True))
+            self._store(job)
+            return job_id
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFull("Too many generation jobs in progress")
+            self._pending += 1
+
+        self._store(job)
+
+        out_dir = generation_cache.reserve()
+        executor = self._get_executor()
+        for stage, fn in (("dxf", _run_dxf_stage), ("preview", _run_preview_stage)):
+            future = executor.submit(fn, hull_model, out_dir, num_stations, tolerance)
+            with self._lock:
+                job["_futures"][stage] = future
+            future.add_done_callback(
+                lambda f, stage=stage: self._on_stage_done(job, stage, f, cache_key, out_dir)
+            )
+
+        return job_id
+
+    def run_many(self, hull_models, num_stations=50, tolerance=None):
+        """
+        Generate many hulls across the pool, yielding as each one finishes.
+
+        Yields (index, result, error); cache hits are yielded first. Every
+        variant in flight holds one of the `max_pending` slots shared with
+        `submit`, so a batch waits for free slots instead of flooding the pool.
+        """
+        futures = {}
+        executor = self._get_executor()
+
+        try:
+            for index, hull_model in enumerate(hull_models):
+                cache_key = generation_cache.make_key(hull_model, num_stations, tolerance)
+                if generation_cache.get(cache_key) is not None:
+                    yield index, generation_cache.describe(cache_key, cached=True), None
+                    continue
+
+                # Wait for a slot, reporting this batch's finished variants meanwhile
+                while not self._take_slot():
+                    if futures:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self._collect(future, futures.pop(future))
+                    else:
+                        with self._slot_freed:
+                            self._slot_freed.wait(timeout=1.0)
+
+                out_dir = generation_cache.reserve()
+                future = executor.submit(_run_pipeline, hull_model, out_dir, num_stations, tolerance)
+                future.add_done_callback(lambda f: self._release_slot())
+                futures[future] = (index, cache_key, out_dir)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._collect(future, futures.pop(future))
+        finally:
+            # Client went away: drop work that has not started yet
+            for future, (_, _, out_dir) in futures.items():
+                if future.cancel():
+                    generation_cache.discard(out_dir)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            stages = dict(job["stages"])
+            for stage, future in job["_futures"].items():
+                if stages[stage] == "pending" and future.running():
+                    stages[stage] = "running"
+
+            status = job["status"]
+            if status == "queued" and "running" in stages.values():
+                status = "running"
+
+            done = sum(1 for state in stages.values() if state == "done")
+            return {
+                "job_id": job["job_id"],
+                "status": status,
+                "stages": stages,
+                "progress": round(done / len(self.STAGES), 2),
+                "result": job["result"],
+                "error": job["error"],
+                "created_at": job["created_at"],
+                "finished_at": job["finished_at"],
+            }
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    def _take_slot(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _release_slot(self):
+        with self._lock:
+            self._pending -= 1
+            self._slot_freed.notify_all()
+
+    def _collect(self, future, meta):
+        """
+        (index, result, error) of a finished run_many variant; a failed
+        publish is reported for that variant only.
+        """
+        index, cache_key, out_dir = meta
+        error = future.exception()
+        if error is None:
+            try:
+                generation_cache.publish(cache_key, out_dir)
+                return index, generation_cache.describe(cache_key, cached=False), None
+            except Exception as e:
+                error = e
+
+        generation_cache.discard(out_dir)
+        return index, None, error
+
+    def _store(self, job):
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+            while len(self._jobs) > self.MAX_FINISHED_JOBS:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if oldest["finished_at"] is None:
+                    break
+                del self._jobs[oldest_id]
+
+    def _on_stage_done(self, job, stage, future, cache_key, out_dir):
+        error = None if future.cancelled() else future.exception()
+
+        with self._lock:
+            if job["finished_at"] is not None:
+                return
+
+            job["stages"][stage] = "failed" if error is not None else "done"
+            if error is None and "pending" in job["stages"].values():
+                return
+
+            self._pending -= 1
+            self._slot_freed.notify_all()
+            if error is not None:
+                self._fail(job, error)
+            # submit may still be adding futures; cancel a snapshot
+            others = list(job["_futures"].values())
+
+        if error is not None:
+            for other in others:
+                other.cancel()
+            generation_cache.discard(out_dir)
+            return
+
+        try:
+            generation_cache.publish(cache_key, out_dir)
+        except Exception as e:
+            with self._lock:
+                self._fail(job, e)
+            return
+
+        with self._lock:
+            self._finish(job, generation_cache.describe(cache_key, cached=False))
+
+    def _fail(self, job, error):
+        job["error"] = str(error)
+        job["status"] = "failed"
+        job["finished_at"] = datetime.utcnow().isoformat()
+
+    def _finish(self, job, result):
+        job["result"] = result
+        job["status"] = "succeeded"
+        job["finished_at"] = datetime.utcnow().isoformat()
+
+
+
+generation_jobs = GenerationJobManager(Config.GENERATION_WORKERS, Config.GENERATION_MAX_PENDING)
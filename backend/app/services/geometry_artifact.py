@@ -0,0 +1,129 @@
+# app/services/geometry_artifact.py
+import json
+import os
+
+import numpy as np
+
+from app.services.hull_sampler import HullCurves
+from app.services.offset_table import OffsetTable
+
+
+class GeometryArtifact:
+    """
+    Sampled hull geometry stored next to a generated DXF.
+
+    The artifact is a directory of plain .npy files plus a manifest.json:
+
+        geometry/
+            manifest.json
+            curve_points.npy          (N, 2) all curves, packed as in HullCurves
+            offset_x.npy              stations
+            offset_z.npy              waterlines
+            offset_half_breadths.npy  (stations, waterlines)
+
+    Arrays are opened lazily with np.load(mmap_mode="r"), so readers map
+    the files instead of re-running the sampler or parsing the DXF.
+    """
+
+    # Bump whenever the layout or the meaning of an array changes
+    FORMAT_VERSION = 1
+
+    DIRNAME = "geometry"
+    MANIFEST = "manifest.json"
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        self._arrays = {}
+
+    # -----------------------------
+    # Write
+    # -----------------------------
+
+    @staticmethod
+    def write(out_dir, hull_model, curves, offset_table, sampling=None):
+        """
+        Write the artifact into `out_dir` and return its directory.
+        """
+        path = os.path.join(out_dir, GeometryArtifact.DIRNAME)
+        os.makedirs(path, exist_ok=True)
+
+        arrays = {
+            "curve_points": curves.points,
+            "offset_x": offset_table.x,
+            "offset_z": offset_table.z,
+            "offset_half_breadths": offset_table.half_breadths,
+        }
+        for name, arr in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(arr, dtype=np.float64))
+
+        manifest = {
+            "format_version": GeometryArtifact.FORMAT_VERSION,
+            "hull_fingerprint": hull_model.fingerprint(),
+            "sampling": sampling,
+            "curve_offsets": {name: list(curves.offsets[name]) for name in HullCurves.CURVES},
+            "draft": offset_table.draft,
+            "arrays": {
+                name: {"file": f"{name}.npy", "shape": list(arr.shape), "dtype": "float64"}
+                for name, arr in arrays.items()
+            },
+        }
+        with open(os.path.join(path, GeometryArtifact.MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        return path
+
+    # -----------------------------
+    # Read
+    # -----------------------------
+
+    @staticmethod
+    def open(path):
+        """
+        Open an artifact directory (or the output directory containing one).
+
+        Only the manifest is read here; arrays are mapped on first use.
+        Raises FileNotFoundError if there is no artifact and ValueError if
+        it was written in another format version.
+        """
+        if os.path.basename(os.path.normpath(path)) != GeometryArtifact.DIRNAME:
+            path = os.path.join(path, GeometryArtifact.DIRNAME)
+
+        with open(os.path.join(path, GeometryArtifact.MANIFEST)) as f:
+            manifest = json.load(f)
+
+        version = manifest.get("format_version")
+        if version != GeometryArtifact.FORMAT_VERSION:
+            raise ValueError(
+                f"Geometry artifact version {version} is not supported "
+                f"(expected {GeometryArtifact.FORMAT_VERSION})"
+            )
+        return GeometryArtifact(path, manifest)
+
+    def array(self, name):
+        """
+        Read-only memory map of one stored array.
+        """
+        if name not in self._arrays:
+            spec = self.manifest["arrays"].get(name)
+            if spec is None:
+                raise KeyError(name)
+            self._arrays[name] = np.load(os.path.join(self.path, spec["file"]), mmap_mode="r")
+        return self._arrays[name]
+
+    @property
+    def fingerprint(self):
+        return self.manifest["hull_fingerprint"]
+
+    @property
+    def curves(self):
+        return HullCurves.from_buffer(self.array("curve_points"), self.manifest["curve_offsets"])
+
+    @property
+    def offset_table(self):
+        return OffsetTable(
+            self.array("offset_x"),
+            self.array("offset_z"),
+            self.array("offset_half_breadths"),
+            self.manifest["draft"]
+        )
@@ -1,6 +1,32 @@
 # app/services/hull_geometry_builder.py
+import hashlib
+import json
+
+
+def _optional_float(value):
+    return float(value) if value is not None else None
+
 
 class HullGeometryModel:
+    """
+    Immutable hull geometry with all derived quantities computed once.
+
+    Instances use __slots__ and compare / hash by their fingerprint, so a
+    model can be used directly as a cache key. Use `replace` to get a
+    changed copy.
+    """
+
+    __slots__ = (
+        "loa", "lbp", "breadth", "depth", "draft",
+        "midship_x", "deck_z", "keel_z",
+        "parallel_midbody_length", "bow_rake_angle", "stern_rake_angle", "bilge_radius",
+        "bow_length", "stern_length",
+        "bulbous_bow", "bulb_length", "bulb_height", "has_bulb",
+        "block_coefficient", "prismatic_coefficient", "midship_coefficient", "waterplane_coefficient",
+        "frame_spacing", "frame_numbering_origin", "frame_numbering_direction",
+        "_fingerprint", "_hash",
+    )
+
     def __init__(
         self,
         loa, lbp, breadth, depth, draft,
@@ -10,30 +36,80 @@ class HullGeometryModel:
         bilge_radius=0.0,
         bulbous_bow=False,
         bulb_length=0.0,
-        bulb_height=0.0
+        bulb_height=0.0,
+        block_coefficient=None,
+        prismatic_coefficient=None,
+        midship_coefficient=None,
+        waterplane_coefficient=None,
+        frame_spacing=0.0,
+        frame_numbering_origin="AP",
+        frame_numbering_direction="AFT_TO_FWD"
     ):
+        init = object.__setattr__
+
         # Principal dimensions
-        self.loa = float(loa)
-        self.lbp = float(lbp)
-        self.breadth = float(breadth)
-        self.depth = float(depth)
-        self.draft = float(draft)
+        init(self, "loa", float(loa))
+        init(self, "lbp", float(lbp))
+        init(self, "breadth", float(breadth))
+        init(self, "depth", float(depth))
+        init(self, "draft", float(draft))
 
         # Derived points
-        self.midship_x = self.lbp / 2
-        self.deck_z = self.depth
-        self.keel_z = 0.0
+        init(self, "midship_x", self.lbp / 2)
+        init(self, "deck_z", self.depth)
+        init(self, "keel_z", 0.0)
 
         # Longitudinal / transverse features
-        self.parallel_midbody_length = float(midbody_length or 0)
-        self.bow_rake_angle = float(bow_rake_angle or 0)
-        self.stern_rake_angle = float(stern_rake_angle or 0)
-        self.bilge_radius = float(bilge_radius or 0)
+        init(self, "parallel_midbody_length", float(midbody_length or 0))
+        init(self, "bow_rake_angle", float(bow_rake_angle or 0))
+        init(self, "stern_rake_angle", float(stern_rake_angle or 0))
+        init(self, "bilge_radius", float(bilge_radius or 0))
+
+        # Bow / stern run lengths (approximated from the rake angles)
+        init(self, "bow_length", self.bow_rake_angle * self.lbp / 100)
+        init(self, "stern_length", self.stern_rake_angle * self.lbp / 100)
 
         # Bow features
-        self.bulbous_bow = bulbous_bow
-        self.bulb_length = float(bulb_length or 0)
-        self.bulb_height = float(bulb_height or 0)
+        init(self, "bulbous_bow", bool(bulbous_bow))
+        init(self, "bulb_length", float(bulb_length or 0))
+        init(self, "bulb_height", float(bulb_height or 0))
+        init(self, "has_bulb", self.bulbous_bow and self.bulb_length > 0 and self.bulb_height > 0)
+
+        # Hydrostatic coefficients (None when not given)
+        init(self, "block_coefficient", _optional_float(block_coefficient))
+        init(self, "prismatic_coefficient", _optional_float(prismatic_coefficient))
+        init(self, "midship_coefficient", _optional_float(midship_coefficient))
+        init(self, "waterplane_coefficient", _optional_float(waterplane_coefficient))
+
+        # Structural grid
+        init(self, "frame_spacing", float(frame_spacing or 0))
+        init(self, "frame_numbering_origin", frame_numbering_origin or "AP")
+        init(self, "frame_numbering_direction", frame_numbering_direction or "AFT_TO_FWD")
+
+        payload = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        init(self, "_fingerprint", hashlib.sha256(payload.encode("utf-8")).hexdigest())
+        init(self, "_hash", hash(self._fingerprint))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"HullGeometryModel is immutable; use replace({name}=...)")
+
+    def __delattr__(self, name):
+        raise AttributeError("HullGeometryModel is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, HullGeometryModel):
+            return NotImplemented
+        return self._fingerprint == other._fingerprint
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        # Rebuild from the inputs; slot-wise unpickling would hit __setattr__
+        return (_model_from_inputs, (self.inputs(),))
+
+    def __repr__(self):
+        return f"HullGeometryModel(lbp={self.lbp}, breadth={self.breadth}, depth={self.depth}, draft={self.draft})"
 
     def to_dict(self):
         return {
@@ -51,27 +127,130 @@ class HullGeometryModel:
             "bilge_radius": self.bilge_radius,
             "bulbous_bow": self.bulbous_bow,
             "bulb_length": self.bulb_length,
-            "bulb_height": self.bulb_height
+            "bulb_height": self.bulb_height,
+            "block_coefficient": self.block_coefficient,
+            "prismatic_coefficient": self.prismatic_coefficient,
+            "midship_coefficient": self.midship_coefficient,
+            "waterplane_coefficient": self.waterplane_coefficient,
+            "frame_spacing": self.frame_spacing,
+            "frame_numbering_origin": self.frame_numbering_origin,
+            "frame_numbering_direction": self.frame_numbering_direction
         }
 
+    # Attribute name -> constructor argument, for the inputs (not derived points)
+    INPUT_FIELDS = {
+        "loa": "loa",
+        "lbp": "lbp",
+        "breadth": "breadth",
+        "depth": "depth",
+        "draft": "draft",
+        "parallel_midbody_length": "midbody_length",
+        "bow_rake_angle": "bow_rake_angle",
+        "stern_rake_angle": "stern_rake_angle",
+        "bilge_radius": "bilge_radius",
+        "bulbous_bow": "bulbous_bow",
+        "bulb_length": "bulb_length",
+        "bulb_height": "bulb_height",
+        "block_coefficient": "block_coefficient",
+        "prismatic_coefficient": "prismatic_coefficient",
+        "midship_coefficient": "midship_coefficient",
+        "waterplane_coefficient": "waterplane_coefficient",
+        "frame_spacing": "frame_spacing",
+        "frame_numbering_origin": "frame_numbering_origin",
+        "frame_numbering_direction": "frame_numbering_direction",
+    }
+
+    def inputs(self):
+        """
+        Constructor arguments that rebuild this model.
+        """
+        return {arg: getattr(self, attr) for attr, arg in self.INPUT_FIELDS.items()}
+
+    def replace(self, **changes):
+        """
+        Copy of this model with some input fields changed (derived points are recomputed).
+        """
+        unknown = set(changes) - set(self.INPUT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown hull fields: {', '.join(sorted(unknown))}")
+
+        kwargs = self.inputs()
+        for attr, value in changes.items():
+            kwargs[self.INPUT_FIELDS[attr]] = value
+        return HullGeometryModel(**kwargs)
+
+    def fingerprint(self):
+        """
+        Stable SHA-256 of the geometry, identical for identical inputs.
+        """
+        return self._fingerprint
+
+
+def _model_from_inputs(inputs):
+    return HullGeometryModel(**inputs)
+
 
 class HullGeometryBuilder:
+    # HullGeometry column -> HullGeometryModel field
+    COLUMN_FIELDS = {
+        "length_overall": "loa",
+        "length_between_perpendiculars": "lbp",
+        "breadth_moulded": "breadth",
+        "depth_moulded": "depth",
+        "design_draft": "draft",
+        "parallel_midbody_length": "parallel_midbody_length",
+        "bow_rake_angle": "bow_rake_angle",
+        "stern_rake_angle": "stern_rake_angle",
+        "bilge_radius": "bilge_radius",
+        "bulbous_bow": "bulbous_bow",
+        "bulb_length": "bulb_length",
+        "bulb_height": "bulb_height",
+        "block_coefficient": "block_coefficient",
+        "prismatic_coefficient": "prismatic_coefficient",
+        "midship_coefficient": "midship_coefficient",
+        "waterplane_coefficient": "waterplane_coefficient",
+        "frame_spacing": "frame_spacing",
+        "frame_numbering_origin": "frame_numbering_origin",
+        "frame_numbering_direction": "frame_numbering_direction",
+    }
+
     @staticmethod
     def build(hull_db_object):
         """
         Build HullGeometryModel from HullGeometry database object
         """
-        return HullGeometryModel(
-            loa=hull_db_object.length_overall,
-            lbp=hull_db_object.length_between_perpendiculars,
-            breadth=hull_db_object.breadth_moulded,
-            depth=hull_db_object.depth_moulded,
-            draft=hull_db_object.design_draft,
-            midbody_length=hull_db_object.parallel_midbody_length,
-            bow_rake_angle=hull_db_object.bow_rake_angle,
-            stern_rake_angle=hull_db_object.stern_rake_angle,
-            bilge_radius=hull_db_object.bilge_radius,
-            bulbous_bow=hull_db_object.bulbous_bow,
-            bulb_length=hull_db_object.bulb_length,
-            bulb_height=hull_db_object.bulb_height
-        )
\ No newline at end of file
+        return HullGeometryModel(**{
+            HullGeometryModel.INPUT_FIELDS[field]: getattr(hull_db_object, column)
+            for column, field in HullGeometryBuilder.COLUMN_FIELDS.items()
+        })
+
+    @staticmethod
+    def build_many(ga_input_ids, active_only=True):
+        """
+        {ga_input_id: HullGeometryModel} for many GA inputs in one query.
+
+        Only the model columns are selected, so no ORM objects are created.
+        GA inputs without a hull (or inactive ones, with `active_only`) are
+        left out.
+        """
+        from app.db.models import GAInputMaster, HullGeometry
+
+        if not ga_input_ids:
+            return {}
+
+        columns = list(HullGeometryBuilder.COLUMN_FIELDS)
+        query = HullGeometry.query.with_entities(
+            HullGeometry.ga_input_id, *(getattr(HullGeometry, c) for c in columns)
+        ).filter(HullGeometry.ga_input_id.in_(ga_input_ids))
+
+        if active_only:
+            query = (
+                query.join(GAInputMaster, GAInputMaster.ga_input_id == HullGeometry.ga_input_id)
+                .filter(GAInputMaster.is_active == True)
+            )
+
+        args = [HullGeometryModel.INPUT_FIELDS[HullGeometryBuilder.COLUMN_FIELDS[c]] for c in columns]
+        return {
+            str(ga_input_id): HullGeometryModel(**dict(zip(args, values)))
+            for ga_input_id, *values in query.all()
+        }
@@ -0,0 +1,275 @@
+# app/services/hull_sampler.py
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+
+
+_EMPTY = np.empty((0, 2))
+
+
+class HullCurves:
+    """
+    Sampled hull curves packed into one contiguous (N, 2) float array.
+
+    Each curve is exposed as a view into `points`, so the DXF writer and
+    the preview plot read the same buffer without copying.
+    """
+
+    CURVES = ("side_profile", "half_breadth", "bulb", "bilge")
+
+    def __init__(self, parts):
+        arrays = [np.asarray(parts.get(name, _EMPTY), dtype=np.float64).reshape(-1, 2)
+                  for name in self.CURVES]
+
+        self.points = np.ascontiguousarray(np.concatenate(arrays))
+        self.offsets = {}
+
+        start = 0
+        for name, arr in zip(self.CURVES, arrays):
+            self.offsets[name] = (start, start + len(arr))
+            start += len(arr)
+
+    @classmethod
+    def from_buffer(cls, points, offsets):
+        """
+        Wrap an existing (N, 2) array, e.g. a memory-mapped one, without copying.
+        """
+        curves = cls.__new__(cls)
+        curves.points = points
+        curves.offsets = {name: tuple(offsets[name]) for name in cls.CURVES}
+        return curves
+
+    def __getattr__(self, name):
+        offsets = self.__dict__.get("offsets")
+        if offsets is None or name not in offsets:
+            raise AttributeError(name)
+        start, end = offsets[name]
+        return self.points[start:end]
+
+    def items(self):
+        for name in self.CURVES:
+            yield name, getattr(self, name)
+
+
+class HullCurveSampler:
+    BULB_STEP_DEG = 5
+    BILGE_STEPS = 30
+
+    # -----------------------------
+    # Curve definitions (vectorized)
+    # -----------------------------
+
+    @staticmethod
+    def _end_taper(hull_model, x):
+        """
+        0..1 position within the bow / stern run (1 along the midbody).
+        """
+        lbp = hull_model.lbp
+        bow_length = hull_model.bow_length
+        stern_length = hull_model.stern_length
+
+        t = np.ones_like(x)
+        bow = x < bow_length
+        stern = (x > lbp - stern_length) & ~bow
+        if bow_length > 0:
+            t[bow] = x[bow] / bow_length
+        if stern_length > 0:
+            t[stern] = (lbp - x[stern]) / stern_length
+        return t
+
+    @staticmethod
+    def side_profile(hull_model, x):
+        """
+        Side profile Z at longitudinal positions `x` (cubic ends, flat midbody).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        t = HullCurveSampler._end_taper(hull_model, x)
+        z = hull_model.keel_z + hull_model.draft * (3 * t**2 - 2 * t**3)
+        return np.column_stack((x, z))
+
+    @staticmethod
+    def half_breadth(hull_model, x):
+        """
+        Half-breadth Y at longitudinal positions `x` (square-root flare at the ends).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        t = HullCurveSampler._end_taper(hull_model, x)
+        y = (hull_model.breadth / 2) * np.sqrt(t)
+        return np.column_stack((x, y))
+
+    @staticmethod
+    def bulb(hull_model, angle):
+        """
+        Bulbous bow half-ellipse at angles `angle` (radians, 0..pi).
+        """
+        angle = np.asarray(angle, dtype=np.float64)
+        bx = -hull_model.bulb_length * np.cos(angle)
+        bz = hull_model.keel_z - hull_model.bulb_height * np.sin(angle) * 0.6
+        return np.column_stack((bx, bz))
+
+    @staticmethod
+    def bilge(hull_model, t):
+        """
+        Bilge as a cubic Bezier blend from keel to side, at parameters `t` (0..1).
+        """
+        t = np.asarray(t, dtype=np.float64)
+        r = hull_model.bilge_radius
+        keel_z = hull_model.keel_z
+
+        control = np.array([
+            [0.0, keel_z],
+            [r * 0.4, keel_z + r * 0.25],
+            [r * 0.8, keel_z + r * 0.6],
+            [r, keel_z + r],
+        ])
+        s = 1 - t
+        basis = np.column_stack((s**3, 3 * s**2 * t, 3 * s * t**2, t**3))
+        return basis @ control
+
+    @staticmethod
+    def has_bulb(hull_model):
+        return hull_model.has_bulb
+
+    # -----------------------------
+    # Sampling
+    # -----------------------------
+
+    # HullGeometryModel fields each curve depends on
+    CURVE_FIELDS = {
+        "side_profile": ("lbp", "keel_z", "draft", "bow_rake_angle", "stern_rake_angle"),
+        "half_breadth": ("lbp", "breadth", "bow_rake_angle", "stern_rake_angle"),
+        "bulb": ("keel_z", "bulbous_bow", "bulb_length", "bulb_height"),
+        "bilge": ("keel_z", "bilge_radius"),
+    }
+
+    MAX_REFINE_PASSES = 16
+    MAX_POINTS_PER_CURVE = 4096
+
+    _memo = MemoCache(max_entries=512)
+
+    @staticmethod
+    def sample(hull_model, num_stations=50, tolerance=None):
+        """
+        Sample every hull curve in one vectorized pass.
+
+        With a chordal `tolerance` (m) the curves are sampled adaptively
+        instead of at fixed steps; see `_sample_adaptive`.
+        """
+        return HullCurves({
+            name: HullCurveSampler.sample_curve(hull_model, name, num_stations, tolerance)
+            for name in HullCurves.CURVES
+        })
+
+    @staticmethod
+    def sample_curve(hull_model, name, num_stations=50, tolerance=None):
+        """
+        One sampled curve as a read-only (N, 2) array.
+
+        Memoized on the fields the curve depends on, so editing one hull
+        field only resamples the curves that read it.
+        """
+        fields = HullCurveSampler.CURVE_FIELDS[name]
+        sampling = ("tol", float(tolerance)) if tolerance else ("n", num_stations)
+        key = (name, sampling, tuple(getattr(hull_model, f) for f in fields))
+
+        def compute():
+            if tolerance:
+                points = HullCurveSampler._sample_adaptive(hull_model, name, tolerance)
+            else:
+                points = HullCurveSampler._sample_fixed(hull_model, name, num_stations)
+            points.flags.writeable = False
+            return points
+
+        return HullCurveSampler._memo.get_or_compute(key, compute)
+
+    @staticmethod
+    def _sample_fixed(hull_model, name, num_stations):
+        if name in ("side_profile", "half_breadth"):
+            x = np.arange(num_stations + 1) * (hull_model.lbp / num_stations)
+            return getattr(HullCurveSampler, name)(hull_model, x)
+
+        if name == "bulb":
+            if not HullCurveSampler.has_bulb(hull_model):
+                return _EMPTY
+            angles = np.radians(np.arange(0, 181, HullCurveSampler.BULB_STEP_DEG))
+            return HullCurveSampler.bulb(hull_model, angles)
+
+        if hull_model.bilge_radius <= 0:
+            return _EMPTY
+        steps = HullCurveSampler.BILGE_STEPS
+        return HullCurveSampler.bilge(hull_model, np.arange(steps + 1) / steps)
+
+    @staticmethod
+    def _sample_adaptive(hull_model, name, tolerance):
+        """
+        Sample a curve so no chord strays more than `tolerance` from it.
+
+        Segments are split where they deviate most, so points gather where
+        the curve bends (bow, stern, bulb) and the straight midbody keeps
+        only its end points.
+        """
+        if name in ("side_profile", "half_breadth"):
+            lbp = hull_model.lbp
+            bow_length = hull_model.bow_length
+            stern_length = hull_model.stern_length
+
+            # Start from the knuckles between the ends and the midbody
+            breaks = [0.0, lbp]
+            for x in (bow_length, lbp - stern_length):
+                if 0 < x < lbp:
+                    breaks.append(x)
+
+            curve = getattr(HullCurveSampler, name)
+            return HullCurveSampler._refine(lambda x: curve(hull_model, x), np.unique(breaks), tolerance)
+
+        if name == "bulb":
+            if not HullCurveSampler.has_bulb(hull_model):
+                return _EMPTY
+            return HullCurveSampler._refine(
+                lambda a: HullCurveSampler.bulb(hull_model, a), np.linspace(0, np.pi, 3), tolerance)
+
+        if hull_model.bilge_radius <= 0:
+            return _EMPTY
+        return HullCurveSampler._refine(
+            lambda t: HullCurveSampler.bilge(hull_model, t), np.linspace(0, 1, 3), tolerance)
+
+    @staticmethod
+    def _refine(curve, params, tolerance):
+        """
+        Split segments at their midpoint until every chord is within `tolerance`.
+
+        Each pass tests all segments at once: the curve is evaluated at the
+        quarter points of every segment (the midpoint alone misses
+        S-shaped segments) and their distance to the chord is compared to
+        the tolerance.
+        """
+        params = np.asarray(params, dtype=np.float64)
+        points = curve(params)
+        probes = np.array([0.25, 0.5, 0.75])
+
+        for _ in range(HullCurveSampler.MAX_REFINE_PASSES):
+            start, end = params[:-1], params[1:]
+            probe_params = start[:, None] + (end - start)[:, None] * probes
+            probe_points = curve(probe_params.ravel()).reshape(len(start), len(probes), 2)
+
+            a, b = points[:-1, None, :], points[1:, None, :]
+            chord = b - a
+            offset = probe_points - a
+            length = np.hypot(chord[..., 0], chord[..., 1])
+            cross = np.abs(chord[..., 0] * offset[..., 1] - chord[..., 1] * offset[..., 0])
+            deviation = np.where(
+                length > 0,
+                cross / np.where(length > 0, length, 1.0),
+                np.hypot(offset[..., 0], offset[..., 1])
+            ).max(axis=1)
+
+            split = deviation > tolerance
+            if not split.any() or len(params) + split.sum() > HullCurveSampler.MAX_POINTS_PER_CURVE:
+                break
+
+            # Insert the midpoints (probe 0.5) after their segment start
+            insert_at = np.nonzero(split)[0] + 1
+            params = np.insert(params, insert_at, probe_params[split, 1])
+            points = np.insert(points, insert_at, probe_points[split, 1], axis=0)
+
+        return points
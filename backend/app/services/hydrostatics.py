@@ -0,0 +1,109 @@
+# app/services/hydrostatics.py
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+from app.services.offset_table import OffsetTableEngine
+
+SEAWATER_DENSITY = 1.025  # t/m3
+
+
+def _cumulative_trapezoid(values, z):
+    """
+    Running trapezoid integral along the last axis, starting at 0.
+    """
+    steps = 0.5 * (values[..., 1:] + values[..., :-1]) * np.diff(z)
+    out = np.zeros_like(values)
+    np.cumsum(steps, axis=-1, out=out[..., 1:])
+    return out
+
+
+def _safe_divide(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.full_like(numerator, np.nan), where=denominator > 0)
+
+
+class HydrostaticsCalculator:
+    """
+    Hydrostatic curves over a range of drafts from the hull offset table.
+
+    All waterlines are integrated in one vectorized pass: sectional areas
+    and moments are cumulative integrals over z, then integrated over x.
+    The per-waterline curves are memoized per hull version; requested
+    drafts are interpolated from them.
+    """
+
+    NUM_STATIONS = 80
+    NUM_WATERLINES = 100
+    QUANTITIES = ("displacement", "volume", "lcb", "kb", "bm", "km", "waterplane_area", "tpc")
+
+    _memo = MemoCache(max_entries=64)
+
+    @staticmethod
+    def compute(hull_model, min_draft=None, max_draft=None, steps=20):
+        """
+        Hydrostatic table for `steps` drafts between `min_draft` and `max_draft`.
+
+        Drafts default to 10% of the design draft up to 120% of it (capped at
+        the depth). Lengths in m, areas in m2, volume in m3, displacement in
+        t and TPC in t/cm.
+        """
+        design_draft = hull_model.draft
+        depth = max(hull_model.depth, design_draft)
+
+        min_draft = 0.1 * design_draft if min_draft is None else float(min_draft)
+        max_draft = min(1.2 * design_draft, depth) if max_draft is None else float(max_draft)
+        if not 0 < min_draft <= max_draft <= depth:
+            raise ValueError(f"Drafts must satisfy 0 < min_draft <= max_draft <= depth ({depth})")
+
+        curves = HydrostaticsCalculator.curves(hull_model)
+        drafts = np.linspace(min_draft, max_draft, max(int(steps), 1))
+
+        table = {"drafts": drafts}
+        for name in HydrostaticsCalculator.QUANTITIES:
+            table[name] = np.interp(drafts, curves["drafts"], curves[name])
+        return table
+
+    @staticmethod
+    def curves(hull_model):
+        """
+        Hydrostatic quantities at every waterline of the offset grid.
+        """
+        key = hull_model.fingerprint()
+        return HydrostaticsCalculator._memo.get_or_compute(
+            key, lambda: HydrostaticsCalculator._integrate(hull_model)
+        )
+
+    @staticmethod
+    def _integrate(hull_model):
+        table = OffsetTableEngine.compute(
+            hull_model, HydrostaticsCalculator.NUM_STATIONS, HydrostaticsCalculator.NUM_WATERLINES
+        )
+        x, z, y = table.x, table.z, table.half_breadths
+        drafts = z - hull_model.keel_z
+
+        # Per station, cumulative from the keel up to each waterline
+        section_area = 2 * _cumulative_trapezoid(y, z)
+        section_moment_z = 2 * _cumulative_trapezoid(y * drafts, z)
+
+        # Per waterline, integrated along the hull
+        volume = np.trapezoid(section_area, x, axis=0)
+        lcb = _safe_divide(np.trapezoid(section_area * x[:, None], x, axis=0), volume)
+        kb = _safe_divide(np.trapezoid(section_moment_z, x, axis=0), volume)
+
+        waterplane_area = 2 * np.trapezoid(y, x, axis=0)
+        transverse_inertia = (2.0 / 3.0) * np.trapezoid(y ** 3, x, axis=0)
+        bm = _safe_divide(transverse_inertia, volume)
+
+        curves = {
+            "drafts": drafts,
+            "volume": volume,
+            "displacement": volume * SEAWATER_DENSITY,
+            "lcb": lcb,
+            "kb": kb,
+            "bm": bm,
+            "km": kb + bm,
+            "waterplane_area": waterplane_area,
+            "tpc": waterplane_area * SEAWATER_DENSITY / 100,
+        }
+        for arr in curves.values():
+            arr.flags.writeable = False
+        return curves
@@ -1,22 +1,669 @@
+# app/services/layout_engine.py
+import copy
+import hashlib
+import json
+import multiprocessing
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from multiprocessing import shared_memory
+from decimal import Decimal
+
+import numpy as np
+
+from app.services.compartment_index import Compartment, CompartmentIndex
+from app.services.frame_grid import FrameGrid
+from app.core.config import Config
+from app.services.hull_geometry_builder import HullGeometryModel
+from app.services.memo_cache import MemoCache
+from app.services.rule_engine import RuleEngine
+from app.services.rule_set_cache import RuleSet, rule_set_cache
+
+
+class LayoutSpec:
+    """
+    Normalized layout inputs: principal dimensions, complement, vessel
+    type switches and the frame grid bulkheads snap to.
+    """
+
+    __slots__ = (
+        "loa", "lbp", "beam", "depth", "tanks", "fire_zones",
+        "officers", "ratings", "passengers", "frame_grid", "input_data",
+    )
+
+    def __init__(self, data):
+        self.loa = float(data.get("loa") or 0)
+        self.lbp = float(data.get("lbp") or self.loa)
+        self.beam = float(data.get("beam") or 0)
+        self.depth = float(data.get("depth") or 0)
+        if self.lbp <= 0 or self.beam <= 0:
+            raise ValueError("loa (or lbp) and beam must be positive")
+
+        self.tanks = bool(data.get("tank_module_enabled"))
+        self.fire_zones = bool(data.get("fire_zones_required"))
+
+        # Crew not split into officers / ratings counts as ratings
+        crew = int(data.get("crew_count") or 0)
+        self.officers = int(data.get("officer_count") or 0)
+        self.ratings = max(int(data.get("rating_count") or 0), crew - self.officers)
+        self.passengers = int(data.get("passenger_count") or 0)
+
+        hull = HullGeometryModel(
+            loa=self.loa, lbp=self.lbp, breadth=self.beam, depth=self.depth,
+            draft=data.get("draft") or 0,
+            frame_spacing=data.get("frame_spacing") or 0,
+            frame_numbering_origin=data.get("frame_numbering_origin"),
+            frame_numbering_direction=data.get("frame_numbering_direction")
+        )
+        self.frame_grid = FrameGrid.for_hull(hull)
+
+        # Plain values only, so rules can read them next to the layout metrics
+        self.input_data = {}
+        for key, value in data.items():
+            if isinstance(value, Decimal):
+                value = float(value)
+            if value is None or isinstance(value, (bool, int, float, str)):
+                self.input_data[key] = value
+
+
+# -----------------------------
+# Pool workers: each search publishes its inputs and rules once, in a
+# shared memory block; tasks carry only the block's name
+# -----------------------------
+
+# Shared memory name -> (LayoutSpec, RuleSet), for the searches a worker has seen lately
+_worker_payloads = OrderedDict()
+_WORKER_PAYLOADS = 8
+
+
+def _publish_payload(data, rule_rows):
+    """
+    Shared memory block holding the pickled search inputs; the caller
+    closes and unlinks it when the search ends.
+    """
+    payload = pickle.dumps((data, rule_rows), protocol=pickle.HIGHEST_PROTOCOL)
+    block = shared_memory.SharedMemory(create=True, size=len(payload))
+    block.buf[:len(payload)] = payload
+    return block, len(payload)
+
+
+def _worker_payload(name, size):
+    payload = _worker_payloads.get(name)
+    if payload is None:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            data, rule_rows = pickle.loads(bytes(block.buf[:size]))
+        finally:
+            block.close()
+        payload = (LayoutSpec(data), RuleSet.from_rows(rule_rows))
+        _worker_payloads[name] = payload
+        while len(_worker_payloads) > _WORKER_PAYLOADS:
+            _worker_payloads.popitem(last=False)
+    _worker_payloads.move_to_end(name)
+    return payload
+
+
+def _search_task(name, size, seed_sequence, count, deadline):
+    """
+    One batch on a pool worker, or None when `deadline` (wall clock, as
+    monotonic clocks are per process) passed while the batch was queued or
+    the search has already ended and unlinked its payload.
+    """
+    if deadline is not None and time.time() >= deadline:
+        return None
+    try:
+        spec, rules = _worker_payload(name, size)
+    except FileNotFoundError:
+        return None
+    return LayoutEngine._search_batch(spec, np.random.default_rng(seed_sequence), count, rules)
+
+
+def _pool_context():
+    # Workers are forked from a forkserver that preloads this module, so they
+    # start without importing numpy again and without inheriting the app's
+    # threads or DB connections; spawn where forkserver is missing.
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
 class LayoutEngine:
+    """
+    Places the main spaces along the hull and searches for the layout that
+    best satisfies the active rules.
+
+    From the FP (x = 0) aft: fore peak, cargo holds, tanks (when the vessel
+    type has the tank module), engine room, aft peak. Accommodation sits on
+    deck over the machinery, sized from the complement. Every bulkhead is
+    snapped to a frame when frame_spacing is known.
+
+    Candidates are sampled as NumPy arrays, their metrics computed in bulk
+    and all of them checked with RuleEngine.validate_batch in one pass.
+    The best score wins: cargo length fraction, less a penalty per rule
+    violation (HARD ones dominate) and for uneven holds. The adjacency
+    rules are then checked by RuleEngine.validate_adjacency through a
+    CompartmentIndex on the best candidates of each batch, in score
+    order, until no unchecked one can win or ADJACENCY_CHECKS have been
+    checked. Fire zones are checked on the winner's index the same way.
+
+    The search is split into batches, each with its own child of one
+    SeedSequence, so the result for a seed does not depend on how many
+    worker processes ran the batches.
+    """
+
+    # Compartment length ranges as fractions of LBP
+    FORE_PEAK = (0.05, 0.08)  # collision bulkhead 5-8% LBP abaft the FP
+    AFT_PEAK = (0.03, 0.06)
+    ENGINE_ROOM = (0.10, 0.20)
+    TANKS = (0.04, 0.10)
+    HOLD_COUNT = (2, 6)
+    HOLD_JITTER = 0.25
+
+    # Accommodation: gross deck area per person (m2)
+    AREA_PER_OFFICER = 14.0
+    AREA_PER_RATING = 9.0
+    AREA_PER_PASSENGER = 5.0
+    USABLE_BREADTH = 0.8
+    TIER_HEIGHT = 2.8  # m
+    MAX_TIERS = 5
+
+    MIN_COMPARTMENT_LENGTH = 1.0  # m, or one frame spacing if larger
+
+    HARD_PENALTY = 1.0
+    SOFT_PENALTY = 0.05
+    UNEVEN_HOLD_PENALTY = 0.1
+
+    # Per batch; bounds the work when a penalty applies to nearly every candidate
+    ADJACENCY_CHECKS = 32
+
+    # Bump whenever the placement or scoring changes, so cached layouts are recomputed
+    VERSION = "3"
+
+    # Main vertical zones (m); the minimum rules out slivers between close bulkheads
+    MAX_FIRE_ZONE_LENGTH = 40.0
+    MIN_FIRE_ZONE_LENGTH = 10.0
+    OFF_BULKHEAD_PENALTY = 100.0
+
+    DEFAULT_CANDIDATES = 2000
+    BATCH_SIZE = 2000
+
+    _memo = MemoCache(max_entries=Config.LAYOUT_CACHE_ENTRIES)
+
+    # One pool per process, shared by all searches
+    _executor = None
+    _executor_lock = threading.Lock()
 
     def generate_layout(self, data):
+        """
+        Zones of the best layout for `data`.
+
+        Since the rule-scored search replaced the fixed split, zones are laid
+        out along the LBP (falling back to LOA when lbp is missing) rather
+        than the LOA, and missing or non-positive loa / beam raise
+        ValueError instead of producing an empty layout.
+        """
+        return self.search(data)["zones"]
+
+    def search(self, data, candidates=DEFAULT_CANDIDATES, seed=None, rule_set=None,
+               workers=1, time_budget=None, use_cache=True):
+        """
+        Best of `candidates` random layouts for `data`.
+
+        With `workers` > 1 and at least LAYOUT_PARALLEL_MIN_CANDIDATES
+        candidates, up to `workers` batches at a time run on the shared
+        process pool. With a `time_budget` (seconds) the best layout found so
+        far is returned when it runs out; batches already running finish in
+        the background, later ones are dropped.
+
+        Complete results are memoized on `cache_key`, so repeating a search
+        for unchanged inputs and rules is a dictionary lookup.
+
+        Returns {"zones", "metrics", "violations", "score", "adjacency",
+        "candidates_evaluated", "complete", "seed", "cache_key", "cached"}
+        plus "fire_zones" when the vessel type requires them. Raises
+        ValueError when the inputs are invalid or no candidate fits.
+        """
+        spec = LayoutSpec(data)
+        if rule_set is None:
+            rule_set = rule_set_cache.get()
+
+        key = LayoutEngine.cache_key(spec, candidates, seed, rule_set)
+        if use_cache:
+            cached = LayoutEngine._memo.get(key)
+            if cached is not None:
+                return {**copy.deepcopy(cached), "cached": True}
+
+        seed_sequence = np.random.SeedSequence(seed)
+        candidates = max(int(candidates), 1)
+        sizes = [min(LayoutEngine.BATCH_SIZE, candidates - start)
+                 for start in range(0, candidates, LayoutEngine.BATCH_SIZE)]
+        batches = list(zip(seed_sequence.spawn(len(sizes)), sizes))
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+        if workers > 1 and len(batches) > 1 and candidates >= Config.LAYOUT_PARALLEL_MIN_CANDIDATES:
+            results = LayoutEngine._run_parallel(data, rule_set, batches, workers, deadline)
+        else:
+            results = LayoutEngine._run_serial(spec, rule_set, batches, deadline)
+
+        best, best_index, evaluated, finished = None, None, 0, 0
+        for index, candidate, count in results:
+            finished += 1
+            evaluated += count
+            if candidate is None:
+                continue
+            # Ties go to the lowest batch, so the outcome is order-independent
+            if best is None or (candidate["score"], -index) > (best["score"], -best_index):
+                best, best_index = candidate, index
+
+        if best is None:
+            if finished < len(batches):
+                raise ValueError("No feasible layout found within the time budget")
+            raise ValueError("No feasible layout for these dimensions")
 
-        loa = float(data.get("loa", 0))
-        beam = float(data.get("beam", 0))
+        result = LayoutEngine._result(spec, best, evaluated, seed_sequence.entropy)
+        result["complete"] = finished == len(batches)
+        result["cache_key"] = key
 
-        engine_room_length = 0.15 * loa
-        cargo_length = loa - engine_room_length
+        # Partial (time-budgeted) results depend on timing; only complete ones are reusable
+        if use_cache and result["complete"]:
+            LayoutEngine._memo.put(key, copy.deepcopy(result))
+        result["cached"] = False
+        return result
 
-        layout = {
-            "engine_room": {
-                "start": cargo_length,
-                "end": loa
+    @staticmethod
+    def cache_key(spec, candidates, seed, rule_set):
+        """
+        SHA-256 of the normalized inputs (vessel type included), search size,
+        seed, rule set and engine version.
+        """
+        if not isinstance(spec, LayoutSpec):
+            spec = LayoutSpec(spec)
+        payload = json.dumps({
+            "inputs": spec.input_data,
+            "candidates": max(int(candidates), 1),
+            "seed": seed,
+            "rules": rule_set.signature if rule_set.signature is not None else rule_set.version,
+            "version": LayoutEngine.VERSION,
+        }, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _run_serial(spec, rule_set, batches, deadline):
+        for index, (seed_sequence, count) in enumerate(batches):
+            if deadline is not None and index > 0 and time.monotonic() >= deadline:
+                return
+            candidate, evaluated = LayoutEngine._search_batch(
+                spec, np.random.default_rng(seed_sequence), count, rule_set
+            )
+            yield index, candidate, evaluated
+
+    @staticmethod
+    def _get_executor():
+        with LayoutEngine._executor_lock:
+            if LayoutEngine._executor is None:
+                LayoutEngine._executor = ProcessPoolExecutor(
+                    max_workers=Config.LAYOUT_WORKERS,
+                    mp_context=_pool_context()
+                )
+            return LayoutEngine._executor
+
+    @staticmethod
+    def _run_parallel(data, rule_set, batches, workers, deadline):
+        """
+        Yield (batch index, best candidate, evaluated) as workers finish.
+
+        The inputs and rules are pickled once into shared memory; each task
+        sends only the block's name, and a worker unpickles it on its first
+        batch of the search. At most `workers` batches are in flight, so at
+        the deadline only those are left to finish; queued ones are
+        cancelled, and workers skip any they pick up late.
+        """
+        executor = LayoutEngine._get_executor()
+        block, size = _publish_payload(data, rule_set.rows())
+        wall_deadline = time.time() + (deadline - time.monotonic()) if deadline is not None else None
+        pending = iter(enumerate(batches))
+        futures = {}
+
+        def submit():
+            batch = next(pending, None)
+            if batch is not None:
+                index, (seed_sequence, count) = batch
+                future = executor.submit(_search_task, block.name, size, seed_sequence, count, wall_deadline)
+                futures[future] = index
+
+        try:
+            for _ in range(workers):
+                submit()
+            while futures:
+                timeout = max(deadline - time.monotonic(), 0) if deadline is not None else None
+                future = next(as_completed(futures, timeout=timeout))
+                index = futures.pop(future)
+                result = future.result()
+                if result is None:
+                    return
+                yield (index,) + result
+                if deadline is None or time.monotonic() < deadline:
+                    submit()
+        except TimeoutError:
+            return
+        finally:
+            for future in futures:
+                future.cancel()
+            # Batches still running already hold their copy
+            block.close()
+            block.unlink()
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+
+    @staticmethod
+    def _search_batch(spec, rng, count, rule_set=None):
+        """
+        (best candidate, number of feasible candidates scored) for one batch.
+        The candidate is plain data, so it can be sent back from a worker.
+        """
+        arrays = LayoutEngine._sample(spec, rng, int(count))
+        feasible = np.flatnonzero(arrays.pop("feasible"))
+        if not len(feasible):
+            return None, 0
+
+        metrics = {name: values[feasible] for name, values in arrays["metrics"].items()}
+        names = list(metrics)
+        rows = np.column_stack([metrics[name] for name in names]).tolist()
+        contexts = [dict(zip(names, row)) for row in rows]
+
+        matrix = RuleEngine().validate_batch(contexts, spec.input_data, rule_set=rule_set)
+        critical = matrix.critical
+        hard = matrix.violated[:, critical].sum(axis=1)
+        soft = matrix.violated[:, ~critical].sum(axis=1)
+
+        score = (
+            metrics["cargo_ratio"]
+            - LayoutEngine.UNEVEN_HOLD_PENALTY * (metrics["max_hold_length"] - metrics["min_hold_length"]) / spec.lbp
+            - LayoutEngine.HARD_PENALTY * hard
+            - LayoutEngine.SOFT_PENALTY * soft
+        )
+        # Adjacency penalties only lower a score, so once the best adjusted
+        # score reaches the next raw one no unchecked candidate can beat it
+        index = CompartmentIndex()
+        best, best_score, best_candidate, best_adjacency = None, -np.inf, None, None
+        for position in np.argsort(-score, kind="stable")[:LayoutEngine.ADJACENCY_CHECKS]:
+            if best_score >= score[position]:
+                break
+            candidate = LayoutEngine._candidate(arrays, feasible[position])
+            LayoutEngine._sync_index(index, LayoutEngine._boxes(spec, candidate), spec.beam)
+            adjacency = RuleEngine.validate_adjacency(index)
+
+            adjusted = score[position] - sum(
+                LayoutEngine.HARD_PENALTY if v["severity"] == "CRITICAL" else LayoutEngine.SOFT_PENALTY
+                for v in adjacency
+            )
+            if adjusted > best_score:
+                best, best_score, best_adjacency = int(position), adjusted, adjacency
+                best_candidate = candidate
+
+        best_candidate["score"] = float(best_score)
+        best_candidate["metrics"] = dict(zip(names, rows[best]))
+        best_candidate["violations"] = matrix.violations(best) + best_adjacency
+        return best_candidate, len(feasible)
+
+    @staticmethod
+    def _candidate(arrays, i):
+        """
+        Bulkheads and accommodation of sampled candidate `i`, as plain data.
+        """
+        holds = int(arrays["hold_count"][i])
+        return {
+            "bulkheads": {
+                "collision": float(arrays["collision"][i]),
+                "holds": arrays["hold_bulkheads"][i, 1:holds].tolist(),
+                "tanks": float(arrays["tank_fwd"][i]),
+                "engine_room": float(arrays["engine_fwd"][i]),
+                "aft_peak": float(arrays["aft_bulkhead"][i]),
+            },
+            "accommodation": {
+                "start": float(arrays["accommodation_start"][i]),
+                "tiers": int(arrays["accommodation_tiers"][i]),
             },
-            "cargo_zone": {
-                "start": 0,
-                "end": cargo_length
-            }
         }
 
-        return layout
\ No newline at end of file
+    @staticmethod
+    def _sync_index(index, boxes, beam):
+        """
+        Make `index` hold exactly `boxes`, touching only what changed.
+        """
+        for name in [c.name for c in index if c.name not in boxes]:
+            index.remove(name)
+        for name, (x0, x1, z0, z1) in boxes.items():
+            current = index.get(name)
+            if current is None or (current.x0, current.x1, current.z0, current.z1) != (x0, x1, z0, z1):
+                index.insert(Compartment(name, x0, x1, -beam / 2, beam / 2, z0, z1))
+
+    @staticmethod
+    def _sample(spec, rng, n):
+        """
+        Bulkhead positions and layout metrics for `n` random candidates.
+        """
+        lbp = spec.lbp
+        snap = spec.frame_grid.snap_array
+        max_holds = LayoutEngine.HOLD_COUNT[1]
+
+        # Bulkheads, working in from both ends
+        collision = snap(rng.uniform(*LayoutEngine.FORE_PEAK, n) * lbp)
+        aft_bulkhead = snap(lbp - rng.uniform(*LayoutEngine.AFT_PEAK, n) * lbp)
+        engine_fwd = snap(aft_bulkhead - rng.uniform(*LayoutEngine.ENGINE_ROOM, n) * lbp)
+        if spec.tanks:
+            tank_fwd = snap(engine_fwd - rng.uniform(*LayoutEngine.TANKS, n) * lbp)
+        else:
+            tank_fwd = engine_fwd.copy()
+
+        # Hold bulkheads: jittered split of the cargo length; unused holds have zero length
+        hold_count = rng.integers(LayoutEngine.HOLD_COUNT[0], max_holds + 1, n)
+        used = np.arange(max_holds)[None, :] < hold_count[:, None]
+        weights = rng.uniform(1 - LayoutEngine.HOLD_JITTER, 1 + LayoutEngine.HOLD_JITTER, (n, max_holds)) * used
+        fractions = np.cumsum(weights, axis=1) / weights.sum(axis=1, keepdims=True)
+
+        cargo_length = tank_fwd - collision
+        hold_bulkheads = np.empty((n, max_holds + 1))
+        hold_bulkheads[:, 0] = collision
+        inner = snap(collision[:, None] + fractions * cargo_length[:, None])
+        hold_bulkheads[:, 1:] = np.where(used, inner, tank_fwd[:, None])
+        hold_bulkheads[np.arange(n), hold_count] = tank_fwd
+
+        hold_lengths = np.diff(hold_bulkheads, axis=1)
+        max_hold = np.where(used, hold_lengths, -np.inf).max(axis=1)
+        min_hold = np.where(used, hold_lengths, np.inf).min(axis=1)
+
+        # Accommodation over the machinery, stacked up to MAX_TIERS
+        area = (spec.officers * LayoutEngine.AREA_PER_OFFICER
+                + spec.ratings * LayoutEngine.AREA_PER_RATING
+                + spec.passengers * LayoutEngine.AREA_PER_PASSENGER)
+        usable_breadth = spec.beam * LayoutEngine.USABLE_BREADTH
+        if area > 0:
+            aft_space = lbp - engine_fwd
+            tiers = np.clip(np.ceil(area / (aft_space * usable_breadth)), 1, LayoutEngine.MAX_TIERS)
+            accommodation_start = snap(lbp - area / (tiers * usable_breadth))
+        else:
+            tiers = np.zeros(n)
+            accommodation_start = np.full(n, lbp)
+        accommodation_length = lbp - accommodation_start
+
+        fore_peak = collision
+        engine_room = aft_bulkhead - engine_fwd
+        tank_length = engine_fwd - tank_fwd
+        aft_peak = lbp - aft_bulkhead
+
+        min_length = max(LayoutEngine.MIN_COMPARTMENT_LENGTH, spec.frame_grid.spacing)
+        feasible = (
+            (fore_peak >= min_length) & (min_hold >= min_length)
+            & (engine_room >= min_length) & (aft_peak >= min_length)
+        )
+        if spec.tanks:
+            feasible &= tank_length >= min_length
+        # Clipped at MAX_TIERS, the deckhouse can outgrow the space over the machinery
+        if area > 0:
+            feasible &= (accommodation_start >= engine_fwd) & (accommodation_length >= min_length)
+
+        return {
+            "feasible": feasible,
+            "collision": collision,
+            "hold_count": hold_count,
+            "hold_bulkheads": hold_bulkheads,
+            "tank_fwd": tank_fwd,
+            "engine_fwd": engine_fwd,
+            "aft_bulkhead": aft_bulkhead,
+            "accommodation_start": accommodation_start,
+            "accommodation_tiers": tiers,
+            "metrics": {
+                "fore_peak_length": fore_peak,
+                "collision_bulkhead_ratio": collision / lbp,
+                "cargo_length": cargo_length,
+                "cargo_ratio": cargo_length / lbp,
+                "cargo_hold_count": hold_count.astype(np.float64),
+                "max_hold_length": max_hold,
+                "min_hold_length": min_hold,
+                "tank_length": tank_length,
+                "engine_room_length": engine_room,
+                "engine_room_ratio": engine_room / lbp,
+                "aft_peak_length": aft_peak,
+                "accommodation_length": accommodation_length,
+                "accommodation_tiers": tiers,
+                "accommodation_area": accommodation_length * tiers * usable_breadth,
+            },
+        }
+
+    # -----------------------------
+    # Result
+    # -----------------------------
+
+    @staticmethod
+    def _result(spec, candidate, evaluated, seed):
+        zones = LayoutEngine._zones(spec, candidate)
+        index = CompartmentIndex.from_zones(
+            {name: zone for name, zone in zones.items() if name != "cargo_zone"}, spec.beam
+        )
+
+        result = {
+            "zones": zones,
+            "metrics": {k: round(v, 4) for k, v in candidate["metrics"].items()},
+            "violations": candidate["violations"],
+            "score": round(candidate["score"], 6),
+            "adjacency": index.adjacency(),
+            "candidates_evaluated": evaluated,
+            "seed": seed,
+        }
+        if spec.fire_zones:
+            result["fire_zones"] = LayoutEngine._fire_zones(spec, index)
+            result["violations"] = result["violations"] + RuleEngine.validate_fire_zones(
+                index, result["fire_zones"]["boundaries"]
+            )
+        return result
+
+    @staticmethod
+    def _fire_zones(spec, index):
+        """
+        Main vertical zone boundaries, with the spaces each one cuts.
+
+        Every zone is MIN_FIRE_ZONE_LENGTH to MAX_FIRE_ZONE_LENGTH long.
+        Among the splits that satisfy this, the one with the fewest
+        boundaries off a hull bulkhead wins, then the fewest zones, then
+        the most even lengths. Off-bulkhead boundaries go on frames (or a
+        0.5 m grid without frame spacing).
+        """
+        lbp = spec.lbp
+        shortest, longest = LayoutEngine.MIN_FIRE_ZONE_LENGTH, LayoutEngine.MAX_FIRE_ZONE_LENGTH
+        if lbp <= longest:
+            return {"boundaries": [], "crossing": {}}
+
+        # Zone boundaries run from the keel, so deckhouse ends do not count
+        bulkheads = {round(x, 3) for c in index if c.z1 <= spec.depth + 1e-6 for x in (c.x0, c.x1)}
+        grid = spec.frame_grid
+        if len(grid):
+            stations = {round(float(x), 3) for x in grid.positions}
+        else:
+            stations = {round(x, 3) for x in np.arange(0.5, lbp, 0.5)}
+        positions = [0.0] + sorted(x for x in bulkheads | stations if shortest <= x <= lbp - shortest) + [lbp]
+
+        # Cheapest split of [0, positions[j]], found left to right
+        cost = [0.0] + [np.inf] * (len(positions) - 1)
+        previous = [None] * len(positions)
+        for j in range(1, len(positions)):
+            x = positions[j]
+            step = 0.0 if j == len(positions) - 1 else (
+                1.0 + (0.0 if x in bulkheads else LayoutEngine.OFF_BULKHEAD_PENALTY)
+            )
+            for i in range(j - 1, -1, -1):
+                length = x - positions[i]
+                if length > longest:
+                    break
+                if length >= shortest and cost[i] + step + (length / longest) ** 2 < cost[j]:
+                    cost[j] = cost[i] + step + (length / longest) ** 2
+                    previous[j] = i
+
+        boundaries = []
+        j = previous[-1]
+        while j:
+            boundaries.append(positions[j])
+            j = previous[j]
+        if previous[-1] is None:
+            # Coarse frames and no fitting bulkhead: fall back to an even split
+            count = int(np.ceil(lbp / longest))
+            boundaries = [round(lbp * k / count, 3) for k in range(1, count)]
+        boundaries.sort()
+
+        return {
+            "boundaries": boundaries,
+            "crossing": {str(x): sorted(c.name for c in index.crossing(x)) for x in boundaries},
+        }
+
+    @staticmethod
+    def _zones(spec, candidate):
+        """
+        {zone: {"start", "end", "bottom", "top"}} with x from the FP and z
+        from the keel; "frames" gives the bounding frame numbers.
+        """
+        grid = spec.frame_grid
+
+        def zone(start, end, bottom=0.0, top=spec.depth):
+            z = {"start": round(start, 3), "end": round(end, 3), "bottom": round(bottom, 3), "top": round(top, 3)}
+            if len(grid):
+                z["frames"] = [grid.nearest_frame(start), grid.nearest_frame(end)]
+            return z
+
+        zones = {name: zone(*box) for name, box in LayoutEngine._boxes(spec, candidate).items()}
+
+        # Envelope of the holds, as returned before the search existed
+        bulkheads = candidate["bulkheads"]
+        zones["cargo_zone"] = zone(bulkheads["collision"], bulkheads["tanks"])
+        return zones
+
+    @staticmethod
+    def _boxes(spec, candidate):
+        """
+        {space: (start, end, bottom, top)}, unrounded; shared by the
+        adjacency checks and the zones returned.
+        """
+        bulkheads = candidate["bulkheads"]
+        boxes = {"fore_peak": (0.0, bulkheads["collision"], 0.0, spec.depth)}
+
+        hold_ends = [bulkheads["collision"]] + bulkheads["holds"] + [bulkheads["tanks"]]
+        for number, (start, end) in enumerate(zip(hold_ends, hold_ends[1:]), start=1):
+            boxes[f"cargo_hold_{number}"] = (start, end, 0.0, spec.depth)
+
+        if spec.tanks:
+            boxes["tanks"] = (bulkheads["tanks"], bulkheads["engine_room"], 0.0, spec.depth)
+        boxes["engine_room"] = (bulkheads["engine_room"], bulkheads["aft_peak"], 0.0, spec.depth)
+        boxes["aft_peak"] = (bulkheads["aft_peak"], spec.lbp, 0.0, spec.depth)
+
+        accommodation = candidate["accommodation"]
+        if accommodation["tiers"]:
+            boxes["accommodation"] = (
+                accommodation["start"], spec.lbp,
+                spec.depth, spec.depth + accommodation["tiers"] * LayoutEngine.TIER_HEIGHT
+            )
+        return boxes
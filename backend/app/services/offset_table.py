@@ -0,0 +1,128 @@
+# app/services/offset_table.py
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+
+# Used when a coefficient is missing on the hull
+DEFAULT_MIDSHIP_COEFFICIENT = 0.98
+DEFAULT_WATERPLANE_COEFFICIENT = 0.85
+DEFAULT_BLOCK_COEFFICIENT = 0.75
+
+
+class OffsetTable:
+    """
+    Half-breadths on a stations x waterlines grid.
+
+    `half_breadths[i, j]` is the half-breadth at station `x[i]` and
+    waterline `z[j]`. Arrays are read-only because tables are shared
+    between callers through the memo cache.
+    """
+
+    __slots__ = ("x", "z", "half_breadths", "draft")
+
+    def __init__(self, x, z, half_breadths, draft):
+        for arr in (x, z, half_breadths):
+            arr.flags.writeable = False
+        self.x = x
+        self.z = z
+        self.half_breadths = half_breadths
+        self.draft = draft
+
+    @property
+    def shape(self):
+        return self.half_breadths.shape
+
+    def to_dict(self):
+        return {
+            "stations": self.x.tolist(),
+            "waterlines": self.z.tolist(),
+            "half_breadths": self.half_breadths.tolist(),
+        }
+
+
+class OffsetTableEngine:
+    """
+    Parametric offset table derived from the hull's principal dimensions
+    and form coefficients.
+
+    Sections follow y = B/2 * g(z) * f(x, z):
+    - g is the sectional shape, 1 - (1 - z/T)^q, whose mean equals Cm.
+    - f is the waterline shape, 1 - xi^p(z) outside the parallel midbody.
+      Its fullness equals Cwp at the design waterline and falls off linearly
+      towards the keel so the mean over the draft equals Cp (= Cb / Cm).
+    Above the design waterline the hull is wall-sided.
+    """
+
+    DEFAULT_STATIONS = 40
+    DEFAULT_WATERLINES = 20
+
+    _memo = MemoCache(max_entries=64)
+
+    @staticmethod
+    def compute(hull_model, num_stations=DEFAULT_STATIONS, num_waterlines=DEFAULT_WATERLINES):
+        """
+        Offset table for `hull_model`, memoized per hull version and grid size.
+        """
+        key = (hull_model.fingerprint(), num_stations, num_waterlines)
+        return OffsetTableEngine._memo.get_or_compute(
+            key, lambda: OffsetTableEngine._build(hull_model, num_stations, num_waterlines)
+        )
+
+    @staticmethod
+    def coefficients(hull_model):
+        """
+        (Cb, Cp, Cm, Cwp) with missing values filled in consistently.
+        """
+        cm = hull_model.midship_coefficient or DEFAULT_MIDSHIP_COEFFICIENT
+        cb = hull_model.block_coefficient
+        cp = hull_model.prismatic_coefficient
+
+        if cb is None and cp is not None:
+            cb = cp * cm
+        cb = cb or DEFAULT_BLOCK_COEFFICIENT
+        cp = cp or cb / cm
+        cwp = hull_model.waterplane_coefficient or max(DEFAULT_WATERPLANE_COEFFICIENT, cp)
+        return cb, cp, cm, cwp
+
+    @staticmethod
+    def _build(hull_model, num_stations, num_waterlines):
+        lbp = hull_model.lbp
+        draft = hull_model.draft
+        depth = max(hull_model.depth, draft)
+        _, cp, cm, cwp = OffsetTableEngine.coefficients(hull_model)
+
+        x = np.linspace(0.0, lbp, num_stations + 1)
+        z = np.linspace(hull_model.keel_z, hull_model.keel_z + depth, num_waterlines + 1)
+
+        # Normalized distance from the parallel midbody: 0 inside it, 1 at the ends
+        half_length = lbp / 2
+        midbody = min(hull_model.parallel_midbody_length, lbp) / 2
+        run = max(half_length - midbody, 1e-9)
+        xi = np.clip((np.abs(x - hull_model.midship_x) - midbody) / run, 0.0, 1.0)
+
+        # Height as a fraction of the draft, wall-sided above the waterline
+        zeta = np.clip((z - hull_model.keel_z) / draft, 0.0, 1.0) if draft > 0 else np.ones_like(z)
+
+        # Sectional shape: mean over the draft equals Cm
+        q = _exponent_for_mean(cm)
+        g = 1.0 - (1.0 - zeta) ** q
+
+        # Waterline fullness per height, Cwp at the waterline and averaging Cp
+        midbody_fraction = midbody / half_length if half_length > 0 else 0.0
+        keel_fullness = 2 * cp - cwp
+        fullness = keel_fullness + (cwp - keel_fullness) * zeta
+        run_fullness = (fullness - midbody_fraction) / max(1.0 - midbody_fraction, 1e-9)
+        p = _exponent_for_mean(run_fullness)
+
+        f = 1.0 - xi[:, None] ** p[None, :]
+        half_breadths = (hull_model.breadth / 2) * g[None, :] * f
+
+        return OffsetTable(x, z, half_breadths, draft)
+
+
+def _exponent_for_mean(mean):
+    """
+    Exponent n for which 1 - t^n has the given mean over t in [0, 1].
+    """
+    mean = np.clip(mean, 0.05, 0.98)
+    return mean / (1.0 - mean)
@@ -0,0 +1,89 @@
+# app/services/output_storage.py
+import os
+import re
+import shutil
+import uuid
+
+from app.core.config import Config
+
+_OUTPUT_ID = re.compile(r"^[0-9a-f]{32,64}$")
+
+
+class OutputStorage:
+    """
+    Generated files, one directory per output id, sharded two levels deep:
+
+        <root>/<id[0:2]>/<id[2:4]>/<id>/<filename>
+
+    Random ids (uuid4 hex) are used for per-request build directories and
+    content hashes for published drawings, so concurrent requests never
+    write into the same directory.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    @staticmethod
+    def is_valid_id(output_id):
+        return bool(output_id) and _OUTPUT_ID.match(output_id) is not None
+
+    def path_for(self, output_id):
+        if not self.is_valid_id(output_id):
+            raise ValueError(f"Invalid output id: {output_id}")
+        return os.path.join(self.root, output_id[:2], output_id[2:4], output_id)
+
+    def allocate(self):
+        """
+        Create a fresh, unique output directory. Returns (output_id, path).
+        """
+        output_id = uuid.uuid4().hex
+        path = self.path_for(output_id)
+        os.makedirs(path)
+        return output_id, path
+
+    def remove(self, output_id):
+        shutil.rmtree(self.path_for(output_id), ignore_errors=True)
+        self.prune(output_id)
+
+    def prune(self, output_id):
+        """
+        Drop the shard directories of a removed or moved output if empty.
+        """
+        shard = os.path.dirname(self.path_for(output_id))
+        for path in (shard, os.path.dirname(shard)):
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+
+    def resolve(self, output_id, filename):
+        """
+        Absolute path of a stored file, or None if it does not exist.
+        """
+        if not self.is_valid_id(output_id):
+            return None
+        if not filename or os.path.basename(filename) != filename or filename.startswith("."):
+            return None
+
+        path = os.path.join(self.path_for(output_id), filename)
+        return path if os.path.isfile(path) else None
+
+    def iter_outputs(self):
+        """
+        Yield (output_id, path) for every stored output directory.
+        """
+        if not os.path.isdir(self.root):
+            return
+
+        for shard in os.scandir(self.root):
+            if not shard.is_dir() or len(shard.name) != 2:
+                continue
+            for sub in os.scandir(shard.path):
+                if not sub.is_dir() or len(sub.name) != 2:
+                    continue
+                for entry in os.scandir(sub.path):
+                    if entry.is_dir() and self.is_valid_id(entry.name):
+                        yield entry.name, entry.path
+
+
+output_storage = OutputStorage(Config.OUTPUT_STORAGE_DIR)
@@ -0,0 +1,140 @@
+# app/services/permission_cache.py
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import Config
+from app.db.database import db
+from app.db.models import Module, RoleAccess
+from app.services.memo_cache import MemoCache
+
+
+class RolePermissions:
+    """
+    What a role may see and do, prebuilt for the dashboard and the menu.
+
+    `flags` is the dashboard list (one entry per active grant) and `tree`
+    the visible module tree (roots ordered by module_order, each with its
+    "children"). Both are shared between requests; treat them as read-only.
+    """
+
+    __slots__ = ("role_id", "flags", "tree")
+
+    def __init__(self, role_id, flags, tree):
+        self.role_id = role_id
+        self.flags = flags
+        self.tree = tree
+
+
+class PermissionCache:
+    """
+    RolePermissions per role_id, loaded with one RoleAccess/Module query.
+
+    A commit in this process that inserted, updated or deleted RoleAccess
+    or Module rows drops every entry. Invalidating at commit rather than at
+    flush means concurrent requests cannot reload the old rows in between.
+    The TTL bounds staleness for changes made elsewhere (other workers,
+    SQL consoles, bulk updates).
+    """
+
+    _memo = MemoCache(max_entries=Config.PERMISSION_CACHE_ENTRIES, ttl=Config.PERMISSION_CACHE_TTL)
+
+    @staticmethod
+    def for_role(role_id):
+        key = str(role_id)
+        return PermissionCache._memo.get_or_compute(key, lambda: PermissionCache._load(role_id))
+
+    @staticmethod
+    def invalidate(role_id=None):
+        if role_id is None:
+            PermissionCache._memo.invalidate()
+        else:
+            PermissionCache._memo.invalidate(str(role_id))
+
+    @staticmethod
+    def stats():
+        return PermissionCache._memo.stats()
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    @staticmethod
+    def grants_query(role_id):
+        """
+        Active grants of a role joined to their modules, in menu order.
+        """
+        return (
+            db.session.query(
+                Module.module_id, Module.module_name, Module.module_type, Module.module_order,
+                Module.parent_module_id, Module.status,
+                RoleAccess.view_flag, RoleAccess.add_flag, RoleAccess.edit_flag,
+                RoleAccess.delete_flag, RoleAccess.approve_flag,
+            )
+            .join(Module, RoleAccess.module_id == Module.module_id)
+            .filter(RoleAccess.role_id == role_id)
+            .filter(RoleAccess.status == True)
+            .order_by(Module.module_order)
+        )
+
+    @staticmethod
+    def _load(role_id):
+        rows = PermissionCache.grants_query(role_id).all()
+
+        flags = [
+            {
+                "module": row.module_name,
+                "view": row.view_flag,
+                "add": row.add_flag,
+                "edit": row.edit_flag,
+                "delete": row.delete_flag,
+                "approve": row.approve_flag
+            }
+            for row in rows
+        ]
+
+        modules = [
+            {
+                "module_id": str(row.module_id),
+                "module_name": row.module_name,
+                "module_type": row.module_type,
+                "module_order": row.module_order,
+                "parent_module_id": str(row.parent_module_id) if row.parent_module_id else None,
+            }
+            for row in rows
+            if row.view_flag and row.status
+        ]
+
+        return RolePermissions(str(role_id), flags, PermissionCache._build_tree(modules))
+
+    @staticmethod
+    def _build_tree(modules):
+        module_dict = {m["module_id"]: m for m in modules}
+        tree = []
+
+        for module in modules:
+            if module["parent_module_id"]:
+                parent = module_dict.get(module["parent_module_id"])
+                if parent:
+                    parent.setdefault("children", []).append(module)
+            else:
+                module.setdefault("children", [])
+                tree.append(module)
+
+        return tree
+
+
+@event.listens_for(Session, "after_flush")
+def _note_permission_changes(session, flush_context):
+    # new / dirty / deleted still hold what was just flushed
+    if any(isinstance(obj, (RoleAccess, Module)) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _permissions_committed(session):
+    # A module change affects every role, and a grant may have moved between
+    # roles. The flag survives a rollback; that only costs a spare invalidation.
+    if session.info.pop("permissions_changed", False):
+        PermissionCache.invalidate()
@@ -0,0 +1,70 @@
+# app/services/preview_renderer.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class PreviewRenderer:
+    """
+    Headless PNG previews of sampled hull curves.
+
+    Every call builds its own Figure on an Agg canvas, so nothing touches
+    pyplot's global state and renders can run concurrently.
+    """
+
+    TIERS = {
+        "thumbnail": {"figsize": (4, 2), "dpi": 80},
+        "screen": {"figsize": (10, 5), "dpi": 120},
+        "print": {"figsize": (10, 5), "dpi": 300},
+    }
+
+    @staticmethod
+    def filename(tier):
+        return f"hull_{tier}.png"
+
+    @staticmethod
+    def render(curves, output_dir, tiers=("thumbnail", "screen", "print")):
+        """
+        Render `tiers` in parallel into `output_dir`.
+
+        Returns {tier: path}.
+        """
+        for tier in tiers:
+            if tier not in PreviewRenderer.TIERS:
+                raise ValueError(f"Unknown preview tier: {tier}")
+
+        paths = {tier: os.path.join(output_dir, PreviewRenderer.filename(tier)) for tier in tiers}
+
+        with ThreadPoolExecutor(max_workers=len(tiers) or 1) as pool:
+            futures = [pool.submit(PreviewRenderer.render_tier, curves, paths[tier], tier) for tier in tiers]
+            for future in futures:
+                future.result()
+
+        return paths
+
+    @staticmethod
+    def render_tier(curves, path, tier="print"):
+        spec = PreviewRenderer.TIERS[tier]
+
+        fig = Figure(figsize=spec["figsize"])
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+
+        ax.plot(curves.side_profile[:, 0], curves.side_profile[:, 1], 'r', label='Side Profile')
+        ax.plot(curves.half_breadth[:, 0], curves.half_breadth[:, 1], 'm', label='Half-Breadth')
+        if len(curves.bulb):
+            ax.plot(curves.bulb[:, 0], curves.bulb[:, 1], 'c', label='Bulbous Bow')
+        if len(curves.bilge):
+            ax.plot(curves.bilge[:, 0], curves.bilge[:, 1], 'k', label='Bilge')
+
+        if tier != "thumbnail":
+            ax.set_xlabel('X (m)')
+            ax.set_ylabel('Z / Y (m)')
+            ax.set_title('Hull Profile with Labeled Parts')
+            ax.legend()
+        ax.grid(True)
+
+        fig.savefig(path, dpi=spec["dpi"])
+        return path
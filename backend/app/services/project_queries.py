@@ -0,0 +1,306 @@
+# app/services/project_queries.py
+import base64
+import binascii
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from app.db.database import db
+from app.db.models import GAInputMaster, HullGeometry, ShipProject, Vessel, VesselTypeMaster
+
+# Response key -> column, per section of the project detail
+PROJECT_COLUMNS = {
+    "project_id": ShipProject.project_id,
+    "project_code": ShipProject.project_code,
+    "project_name": ShipProject.project_name,
+    "project_type": ShipProject.project_type,
+    "client_name": ShipProject.client_name,
+    "shipyard_name": ShipProject.shipyard_name,
+    "project_status": ShipProject.project_status,
+    "start_date": ShipProject.start_date,
+    "target_delivery_date": ShipProject.target_delivery_date,
+    "vessel_id": ShipProject.vessel_id,
+    "created_by": ShipProject.created_by,
+    "created_at": ShipProject.created_at,
+}
+
+VESSEL_COLUMNS = {
+    "vessel_id": Vessel.vessel_id,
+    "loa": Vessel.loa,
+    "beam": Vessel.beam,
+    "draft": Vessel.draft,
+    "depth": Vessel.depth,
+    "displacement": Vessel.displacement,
+    "design_speed": Vessel.design_speed,
+    "navigation_area": Vessel.navigation_area,
+    "class_society": Vessel.class_society,
+    "version_number": Vessel.version_number,
+}
+
+VESSEL_TYPE_COLUMNS = {
+    "vessel_type_id": VesselTypeMaster.vessel_type_id,
+    "type_code": VesselTypeMaster.type_code,
+    "type_name": VesselTypeMaster.type_name,
+    "description": VesselTypeMaster.description,
+    "ai_weightage": VesselTypeMaster.ai_weightage,
+    "machinery_mandatory": VesselTypeMaster.machinery_mandatory,
+    "tank_module_enabled": VesselTypeMaster.tank_module_enabled,
+    "fire_zones_required": VesselTypeMaster.fire_zones_required,
+}
+
+GA_INPUT_COLUMNS = {
+    "ga_input_id": GAInputMaster.ga_input_id,
+    "version_number": GAInputMaster.version_number,
+    "version_status": GAInputMaster.version_status,
+    "is_current_version": GAInputMaster.is_current_version,
+    "regulatory_framework": GAInputMaster.regulatory_framework,
+    "crew_count": GAInputMaster.crew_count,
+    "officer_count": GAInputMaster.officer_count,
+    "rating_count": GAInputMaster.rating_count,
+    "passenger_count": GAInputMaster.passenger_count,
+    "created_at": GAInputMaster.created_at,
+    "modified_at": GAInputMaster.modified_at,
+}
+
+HULL_COLUMNS = {
+    "hull_geometry_id": HullGeometry.hull_geometry_id,
+    "length_overall": HullGeometry.length_overall,
+    "length_between_perpendiculars": HullGeometry.length_between_perpendiculars,
+    "breadth_moulded": HullGeometry.breadth_moulded,
+    "depth_moulded": HullGeometry.depth_moulded,
+    "design_draft": HullGeometry.design_draft,
+    "block_coefficient": HullGeometry.block_coefficient,
+    "frame_spacing": HullGeometry.frame_spacing,
+    "hull_form_type": HullGeometry.hull_form_type,
+    "modified_at": HullGeometry.modified_at,
+}
+
+
+# Request filter -> column; each accepts a comma-separated list of exact values
+PROJECT_FILTERS = {
+    "project_status": ShipProject.project_status,
+    "project_type": ShipProject.project_type,
+    "client_name": ShipProject.client_name,
+    "shipyard_name": ShipProject.shipyard_name,
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def serialize_value(value):
+    """
+    JSON-friendly form of a column value, formatted as the project routes
+    always have (dates as YYYY-MM-DD, timestamps to the second).
+    """
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+class ProjectQueries:
+    """
+    Read paths for projects that fetch exactly the columns a response needs,
+    joined in a single statement instead of walking lazy relationships.
+    """
+
+    @staticmethod
+    def detail(project_id):
+        """
+        Project with its vessel and vessel type, or None.
+        """
+        row = ProjectQueries._detail_query(project_id).first()
+        if row is None:
+            return None
+        return ProjectQueries._detail(row._mapping)
+
+    @staticmethod
+    def summary(project_id):
+        """
+        `detail` plus the number of active GA inputs, the latest one (the
+        current version first, then the highest version number) and its hull
+        summary, all in the same round trip. "latest_ga_input" and "hull" are
+        None when missing.
+        """
+        # Correlated pick of the latest active GA input of the outer project
+        candidate = aliased(GAInputMaster)
+        latest_id = (
+            select(candidate.ga_input_id)
+            .where(candidate.project_id == ShipProject.project_id, candidate.is_active == True)
+            .order_by(candidate.is_current_version.desc(), candidate.version_number.desc(),
+                      candidate.created_at.desc())
+            .limit(1)
+            .correlate(ShipProject)
+            .scalar_subquery()
+        )
+        ga_input_count = (
+            select(func.count(GAInputMaster.ga_input_id))
+            .where(GAInputMaster.project_id == ShipProject.project_id, GAInputMaster.is_active == True)
+            .correlate(ShipProject)
+            .scalar_subquery()
+        )
+
+        row = (
+            ProjectQueries._detail_query(
+                project_id,
+                ProjectQueries._labelled("ga", GA_INPUT_COLUMNS),
+                ProjectQueries._labelled("hull", HULL_COLUMNS),
+                [ga_input_count.label("ga_input_count")],
+            )
+            .outerjoin(GAInputMaster, GAInputMaster.ga_input_id == latest_id)
+            .outerjoin(HullGeometry, HullGeometry.ga_input_id == GAInputMaster.ga_input_id)
+            .first()
+        )
+        if row is None:
+            return None
+
+        mapping = row._mapping
+        result = ProjectQueries._detail(mapping)
+        result["ga_input_count"] = mapping["ga_input_count"]
+        result["latest_ga_input"] = ProjectQueries._section(mapping, "ga", GA_INPUT_COLUMNS, "ga_input_id")
+        result["hull"] = ProjectQueries._section(mapping, "hull", HULL_COLUMNS, "hull_geometry_id")
+        return result
+
+    @staticmethod
+    def page(limit, cursor=None, filters=None, fields=None):
+        """
+        One page of non-deleted projects, newest first.
+
+        Keyset pagination on (created_at, project_id): `cursor` is the
+        "next_cursor" of the previous page, so every page costs the same
+        index range scan however deep it is. `filters` maps PROJECT_FILTERS
+        keys to lists of accepted values; `fields` limits the selected
+        columns to a subset of PROJECT_COLUMNS (project_id is always
+        included). Returns (rows, next_cursor); next_cursor is None on the
+        last page. Raises InvalidCursor or ValueError for bad arguments.
+        """
+        query, fields = ProjectQueries.page_query(limit, cursor, filters, fields)
+        rows = query.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]._mapping
+            next_cursor = ProjectQueries.encode_cursor(last["created_at"], last["project_id"])
+
+        return [{f: serialize_value(row._mapping[f]) for f in fields} for row in rows], next_cursor
+
+    @staticmethod
+    def page_query(limit, cursor=None, filters=None, fields=None):
+        """
+        (query, fields) behind `page`: limit + 1 rows, the extra one telling
+        whether another page follows.
+        """
+        fields = list(PROJECT_COLUMNS) if not fields else list(dict.fromkeys(["project_id", *fields]))
+        unknown = [f for f in fields if f not in PROJECT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        # created_at is always fetched to build the cursor
+        columns = [PROJECT_COLUMNS[f].label(f) for f in fields]
+        if "created_at" not in fields:
+            columns.append(ShipProject.created_at.label("created_at"))
+
+        query = ProjectQueries._filtered(db.session.query(*columns), filters)
+
+        if cursor:
+            created_at, project_id = ProjectQueries.decode_cursor(cursor)
+            query = query.filter(
+                tuple_(ShipProject.created_at, ShipProject.project_id) < tuple_(created_at, project_id)
+            )
+
+        query = query.order_by(ShipProject.created_at.desc(), ShipProject.project_id.desc()).limit(limit + 1)
+        return query, fields
+
+    @staticmethod
+    def status_counts(filters=None):
+        """
+        {"total": n, "by_status": {project_status: n}} over the non-deleted
+        projects matching `filters`, counted with one GROUP BY so the
+        dashboard does not have to page through every project.
+        """
+        query = ProjectQueries._filtered(
+            db.session.query(ShipProject.project_status, func.count(ShipProject.project_id)),
+            filters
+        )
+        by_status = dict(query.group_by(ShipProject.project_status).all())
+        return {"total": sum(by_status.values()), "by_status": by_status}
+
+    @staticmethod
+    def encode_cursor(created_at, project_id):
+        raw = f"{created_at.isoformat()}|{project_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+            created_at, project_id = raw.split("|")
+            return datetime.fromisoformat(created_at), uuid.UUID(project_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursor("Invalid cursor")
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    @staticmethod
+    def _filtered(query, filters):
+        """
+        `query` restricted to non-deleted projects matching `filters`.
+        """
+        query = query.filter(ShipProject.is_deleted == False)
+        for key, values in (filters or {}).items():
+            if key not in PROJECT_FILTERS:
+                raise ValueError(f"Unknown filter: {key}")
+            query = query.filter(PROJECT_FILTERS[key].in_(values))
+        return query
+
+    @staticmethod
+    def _labelled(prefix, columns):
+        return [column.label(f"{prefix}__{key}") for key, column in columns.items()]
+
+    @staticmethod
+    def _section(mapping, prefix, columns, required=None):
+        """
+        One prefixed section of a row as a dict; None when an outer join
+        found nothing (`required` column is NULL).
+        """
+        if required is not None and mapping[f"{prefix}__{required}"] is None:
+            return None
+        return {key: serialize_value(mapping[f"{prefix}__{key}"]) for key in columns}
+
+    @staticmethod
+    def _detail_query(project_id, *extra_columns):
+        columns = (
+            ProjectQueries._labelled("project", PROJECT_COLUMNS)
+            + ProjectQueries._labelled("vessel", VESSEL_COLUMNS)
+            + ProjectQueries._labelled("vessel_type", VESSEL_TYPE_COLUMNS)
+        )
+        for extra in extra_columns:
+            columns += extra
+
+        return (
+            db.session.query(*columns)
+            .select_from(ShipProject)
+            .join(Vessel, Vessel.vessel_id == ShipProject.vessel_id)
+            .join(VesselTypeMaster, VesselTypeMaster.vessel_type_id == Vessel.vessel_type_id)
+            .filter(ShipProject.project_id == project_id, ShipProject.is_deleted == False)
+        )
+
+    @staticmethod
+    def _detail(mapping):
+        result = ProjectQueries._section(mapping, "project", PROJECT_COLUMNS)
+        result["vessel"] = ProjectQueries._section(mapping, "vessel", VESSEL_COLUMNS)
+        result["vessel"]["vessel_type"] = ProjectQueries._section(mapping, "vessel_type", VESSEL_TYPE_COLUMNS)
+        return result
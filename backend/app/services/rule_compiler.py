@@ -0,0 +1,292 @@
+# app/services/rule_compiler.py
+import ast
+import operator
+from functools import reduce
+
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+
+# Functions a rule expression may call
+SAFE_FUNCTIONS = {
+    "max": max,
+    "min": min,
+    "abs": abs,
+    "float": float,
+    "int": int,
+    "round": round,
+}
+
+
+
+def _elementwise(combine):
+    # A single argument is a literal tuple / list of values (see _is_vectorizable)
+    def extreme(*args):
+        if len(args) == 1:
+            args = args[0]
+        return reduce(combine, args)
+    return extreme
+
+
+# The same functions applied element-wise over NumPy arrays (batch validation)
+VECTOR_FUNCTIONS = {
+    "max": _elementwise(np.maximum),
+    "min": _elementwise(np.minimum),
+    "abs": np.abs,
+    "float": lambda value: np.asarray(value, dtype=np.float64),
+    "int": np.trunc,
+    "round": lambda value, digits=0: np.round(value, digits),
+}
+
+# Nodes whose Python semantics differ on arrays (truth tests, strings)
+_SCALAR_ONLY_NODES = (ast.BoolOp, ast.IfExp, ast.Compare)
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+}
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# RuleMaster.operator -> check that passes when the rule is satisfied
+RULE_OPERATORS = {
+    ">=": lambda actual, expected: float(actual) >= float(expected),
+    "<=": lambda actual, expected: float(actual) <= float(expected),
+    "==": lambda actual, expected: str(actual) == str(expected),
+    "!=": lambda actual, expected: str(actual) != str(expected),
+    ">": lambda actual, expected: float(actual) > float(expected),
+    "<": lambda actual, expected: float(actual) < float(expected),
+}
+
+# Keeps "10 ** 10 ** 10" style expressions from hanging a request
+MAX_EXPONENT = 64
+
+
+class RuleCompileError(ValueError):
+    pass
+
+
+class RuleEvaluationError(ValueError):
+    pass
+
+
+class CompiledExpression:
+    """
+    A rule expression parsed once into a tree of closures.
+
+    Call it with the validation context; `names` lists the context keys
+    the expression reads. Purely arithmetic expressions also get a
+    `vectorized` form that takes {name: NumPy array} and evaluates all
+    candidates at once; it is None for anything else.
+    """
+
+    __slots__ = ("source", "names", "_fn", "vectorized")
+
+    def __init__(self, source, names, fn, vectorized=None):
+        self.source = source
+        self.names = names
+        self._fn = fn
+        self.vectorized = vectorized
+
+    def __call__(self, context):
+        return self._fn(context)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+
+class RuleCompiler:
+    """
+    Compiles RuleMaster expressions against a whitelist of AST nodes.
+
+    Only literals, context names, arithmetic, comparisons, boolean logic,
+    conditional expressions and calls to SAFE_FUNCTIONS are accepted;
+    anything else (attribute access, subscripts, lambdas, ...) is rejected
+    at compile time. Nothing is ever passed to eval.
+    """
+
+    _memo = MemoCache(max_entries=1024)
+
+    @staticmethod
+    def for_rule(rule_id, expression):
+        """
+        Compiled expression for a rule, cached by (rule_id, expression).
+
+        Raises RuleCompileError for expressions outside the whitelist; the
+        failure is cached too, so a bad rule is parsed only once.
+        """
+        key = (str(rule_id), expression)
+        result = RuleCompiler._memo.get_or_compute(key, lambda: RuleCompiler._try_compile(expression))
+        if isinstance(result, RuleCompileError):
+            raise result
+        return result
+
+    @staticmethod
+    def compile(expression):
+        if not isinstance(expression, str) or not expression.strip():
+            raise RuleCompileError("Rule expression is empty")
+
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise RuleCompileError(f"Invalid rule expression {expression!r}: {e.msg}")
+
+        names = set()
+        fn = RuleCompiler._compile_node(tree.body, names, SAFE_FUNCTIONS)
+
+        vectorized = None
+        if RuleCompiler._is_vectorizable(tree):
+            vectorized = RuleCompiler._compile_node(tree.body, set(), VECTOR_FUNCTIONS)
+
+        return CompiledExpression(expression, frozenset(names), fn, vectorized)
+
+    @staticmethod
+    def _is_vectorizable(tree):
+        for node in ast.walk(tree):
+            if isinstance(node, _SCALAR_ONLY_NODES):
+                return False
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                return False
+            # max(b) over a column would reduce across candidates, not within one
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                    and node.func.id in ("max", "min") and len(node.args) < 2
+                    and not (node.args and isinstance(node.args[0], (ast.Tuple, ast.List)))):
+                return False
+        return True
+
+    @staticmethod
+    def _try_compile(expression):
+        try:
+            return RuleCompiler.compile(expression)
+        except RuleCompileError as e:
+            return e
+
+    # -----------------------------
+    # AST -> closures
+    # -----------------------------
+
+    @staticmethod
+    def _compile_node(node, names, functions):
+        def compile_node(child, names):
+            return RuleCompiler._compile_node(child, names, functions)
+
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str, bool, type(None))):
+                raise RuleCompileError(f"Unsupported constant {node.value!r}")
+            value = node.value
+            return lambda ctx: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in SAFE_FUNCTIONS:
+                raise RuleCompileError(f"{name} can only be called")
+            names.add(name)
+
+            def lookup(ctx):
+                try:
+                    return ctx[name]
+                except KeyError:
+                    raise RuleEvaluationError(f"{name} is not defined")
+            return lookup
+
+        if isinstance(node, ast.BinOp):
+            op = _BINARY_OPS.get(type(node.op))
+            if op is None:
+                raise RuleCompileError(f"Operator {type(node.op).__name__} is not allowed")
+            left = compile_node(node.left, names)
+            right = compile_node(node.right, names)
+
+            if op is operator.pow:
+                def power(ctx):
+                    exponent = right(ctx)
+                    if np.any(np.abs(exponent) > MAX_EXPONENT):
+                        raise RuleEvaluationError("Exponent is too large")
+                    return left(ctx) ** exponent
+                return power
+            return lambda ctx: op(left(ctx), right(ctx))
+
+        if isinstance(node, ast.UnaryOp):
+            op = _UNARY_OPS.get(type(node.op))
+            if op is None:
+                raise RuleCompileError(f"Operator {type(node.op).__name__} is not allowed")
+            operand = compile_node(node.operand, names)
+            return lambda ctx: op(operand(ctx))
+
+        if isinstance(node, ast.BoolOp):
+            values = [compile_node(v, names) for v in node.values]
+            if isinstance(node.op, ast.And):
+                def all_of(ctx):
+                    result = True
+                    for value in values:
+                        result = value(ctx)
+                        if not result:
+                            return result
+                    return result
+                return all_of
+
+            def any_of(ctx):
+                result = False
+                for value in values:
+                    result = value(ctx)
+                    if result:
+                        return result
+                return result
+            return any_of
+
+        if isinstance(node, ast.Compare):
+            ops = []
+            for op_node in node.ops:
+                op = _COMPARE_OPS.get(type(op_node))
+                if op is None:
+                    raise RuleCompileError(f"Comparison {type(op_node).__name__} is not allowed")
+                ops.append(op)
+            operands = [compile_node(node.left, names)] + [compile_node(c, names) for c in node.comparators]
+
+            def compare(ctx):
+                left = operands[0](ctx)
+                for op, operand in zip(ops, operands[1:]):
+                    right = operand(ctx)
+                    if not op(left, right):
+                        return False
+                    left = right
+                return True
+            return compare
+
+        if isinstance(node, ast.IfExp):
+            test = compile_node(node.test, names)
+            body = compile_node(node.body, names)
+            orelse = compile_node(node.orelse, names)
+            return lambda ctx: body(ctx) if test(ctx) else orelse(ctx)
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in functions:
+                raise RuleCompileError("Only max, min, abs, float, int and round can be called")
+            if node.keywords:
+                raise RuleCompileError("Keyword arguments are not allowed")
+            func = functions[node.func.id]
+            args = [compile_node(a, names) for a in node.args]
+            return lambda ctx: func(*(arg(ctx) for arg in args))
+
+        if isinstance(node, (ast.Tuple, ast.List)):
+            items = [compile_node(e, names) for e in node.elts]
+            return lambda ctx: tuple(item(ctx) for item in items)
+
+        raise RuleCompileError(f"{type(node).__name__} is not allowed in rule expressions")
@@ -1,9 +1,114 @@
-from app.db.models import RuleMaster
-from app.db.database import db
+import fnmatch
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from app.services.memo_cache import MemoCache
+from app.services.rule_set_cache import rule_set_cache
+
+_NUMBER_TYPES = (int, float, Decimal, np.number)
+_MISSING = object()
+
+# Numeric RuleMaster operators as element-wise comparisons
+_VECTOR_OPERATORS = {
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    ">": np.greater,
+    "<": np.less,
+}
+
+
+class ViolationMatrix:
+    """
+    Result of validating many candidate contexts against the same rules.
+
+    `violated[i, j]` is True when candidate i fails rule j; `evaluated[i, j]`
+    is False where the rule did not apply (parameter missing) or could not
+    be evaluated.
+    """
+
+    def __init__(self, rules, violated, evaluated):
+        self.rules = rules
+        self.violated = violated
+        self.evaluated = evaluated
+
+    @property
+    def rule_ids(self):
+        return [rule.rule_id for rule in self.rules]
+
+    @property
+    def critical(self):
+        """
+        Boolean mask of the HARD rules (columns).
+        """
+        return np.array([rule.severity == "CRITICAL" for rule in self.rules], dtype=bool)
+
+    def passes(self, hard_only=True):
+        """
+        Per candidate: True when it has no (CRITICAL) violations.
+        """
+        violated = self.violated[:, self.critical] if hard_only else self.violated
+        return ~violated.any(axis=1)
+
+    def violations(self, index):
+        """
+        Violations of one candidate, in the same shape `RuleEngine.validate` returns.
+        """
+        return [
+            RuleEngine._violation(rule)
+            for rule, failed in zip(self.rules, self.violated[index])
+            if failed
+        ]
+
+    def to_dict(self):
+        return {
+            "rule_ids": self.rule_ids,
+            "violated": self.violated.tolist(),
+            "evaluated": self.evaluated.tolist(),
+        }
+
+
+class RuleCostStats:
+    """
+    Exponentially weighted mean evaluation time per rule.
+
+    Updates are unlocked: a lost sample under contention only nudges an
+    ordering heuristic.
+    """
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self._costs = {}
+
+    def record(self, rule_id, seconds):
+        previous = self._costs.get(rule_id)
+        self._costs[rule_id] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+
+    def cost(self, rule_id):
+        # Unmeasured rules run early so they get measured
+        return self._costs.get(rule_id, 0.0)
+
+    def snapshot(self):
+        return dict(self._costs)
 
 
 class RuleEngine:
 
+    costs = RuleCostStats()
+
+    # (rule_id, compartment, neighbour, constraint_type); names are fnmatch patterns
+    ADJACENCY_RULES = (
+        ("ADJ-1", "tanks", "accommodation", "HARD"),  # oil fuel tanks, SOLAS II-2/4.2.2.3
+        ("ADJ-2", "cargo_hold_*", "accommodation", "HARD"),
+        ("ADJ-3", "cargo_hold_*", "engine_room", "SOFT"),  # no tanks as a cofferdam
+    )
+    # Main vertical zone boundaries should not cut through a space
+    FIRE_ZONE_RULE = ("FZ-1", "SOFT")
+
+    # subject id -> (RuleSet, context, {rule_id: violation}) from its last validation
+    _subject_violations = MemoCache(max_entries=1024)
+
     def validate(self, layout: dict, input_data: dict = None):
 
         violations = []
@@ -14,58 +119,302 @@ class RuleEngine:
         if layout:
             context.update(layout)
 
-        # Fetch active rules (boolean column)
-        rules = RuleMaster.query.filter_by(status=True).all()
+        # Active rules, compiled and cached until rules_master changes
+        rules = rule_set_cache.get()
+
+        for rule in rules:
+            violation = RuleEngine._check(rule, context)
+            if violation is not None:
+                violations.append(violation)
+
+        return violations
+
+    def evaluate(self, layout: dict, input_data: dict = None, fail_fast=False, time_budget=None):
+        """
+        Validate with HARD rules first and the cheapest rules first within
+        each tier, using the measured per-rule cost.
+
+        With `fail_fast`, stops at the first CRITICAL violation. With a
+        `time_budget` (seconds), stops once it is spent. Returns
+        {"passed", "complete", "violations", "evaluated", "remaining"};
+        "passed" means no CRITICAL violation was found among the rules that
+        ran, so check "complete" before trusting a True.
+        """
+        context = {**(input_data or {}), **(layout or {})}
+        rules = rule_set_cache.get().rules
+
+        costs = RuleEngine.costs
+        ordered = sorted(rules, key=lambda r: (r.severity != "CRITICAL", costs.cost(r.rule_id)))
+
+        violations = []
+        passed = True
+        evaluated = 0
+        started = time.perf_counter()
+        deadline = started + time_budget if time_budget is not None else None
+
+        for rule in ordered:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            if context.get(rule.parameter_name) is None:
+                evaluated += 1
+                continue
+
+            rule_started = time.perf_counter()
+            violation = RuleEngine._check(rule, context)
+            costs.record(rule.rule_id, time.perf_counter() - rule_started)
+            evaluated += 1
+
+            if violation is None:
+                continue
+            violations.append(violation)
+            if violation["severity"] == "CRITICAL":
+                passed = False
+                if fail_fast:
+                    break
+
+        return {
+            "passed": passed,
+            "complete": evaluated == len(ordered),
+            "violations": violations,
+            "evaluated": evaluated,
+            "remaining": len(ordered) - evaluated,
+        }
+
+    def passes(self, layout: dict, input_data: dict = None, time_budget=None):
+        """
+        Quick yes/no: True unless a HARD rule fails. Rules left unchecked
+        when the time budget runs out count as passing.
+        """
+        return self.evaluate(layout, input_data, fail_fast=True, time_budget=time_budget)["passed"]
+
+    def revalidate(self, subject_id, context: dict, changed_fields=None):
+        """
+        Violations of `context` for a subject (e.g. a GA input), re-checking
+        only the rules affected since the subject was last validated.
+
+        The context and results of the last call for `subject_id` are kept;
+        the rules re-checked are those reading a key whose value differs
+        from that context, plus any in `changed_fields`. Diffing the values
+        rather than trusting the caller keeps results correct when another
+        process edited the subject in between. Everything is re-checked when
+        the subject has no cached results or the rule set changed.
+        """
+        rule_set = rule_set_cache.get()
+        cached = RuleEngine._subject_violations.get(subject_id)
+
+        if cached is None or cached[0] is not rule_set:
+            rules = rule_set.rules
+            results = {}
+        else:
+            _, previous, cached_results = cached
+            changed = {
+                key for key in previous.keys() | context.keys()
+                if previous.get(key, _MISSING) != context.get(key, _MISSING)
+            }
+            changed.update(changed_fields or ())
+            rules = rule_set.rules_for(changed)
+            results = dict(cached_results)
 
         for rule in rules:
+            violation = RuleEngine._check(rule, context)
+            if violation is None:
+                results.pop(rule.rule_id, None)
+            else:
+                results[rule.rule_id] = violation
+
+        RuleEngine._subject_violations.put(subject_id, (rule_set, dict(context), results))
+        return [results[rule.rule_id] for rule in rule_set.rules if rule.rule_id in results]
 
-            param = rule.parameter_name
-            operator = rule.operator
-            expression = rule.expression_value
-            constraint_type = rule.constraint_type
+    def forget(self, subject_id):
+        RuleEngine._subject_violations.invalidate(subject_id)
 
-            actual_value = context.get(param)
+    def validate_batch(self, layouts, input_data: dict = None, rule_set=None):
+        """
+        Validate many candidate layouts at once; returns a ViolationMatrix.
 
-            if actual_value is None:
+        Each candidate context is `input_data` updated with one layout, as in
+        `validate`. Rules with a numeric operator and a purely arithmetic
+        expression are checked for all candidates in one NumPy comparison;
+        the rest fall back to per-candidate evaluation. `rule_set` defaults
+        to the cached active rules.
+        """
+        contexts = [{**(input_data or {}), **(layout or {})} for layout in layouts]
+        rules = (rule_set if rule_set is not None else rule_set_cache.get()).rules
+
+        violated = np.zeros((len(contexts), len(rules)), dtype=bool)
+        evaluated = np.zeros_like(violated)
+        columns = {}
+
+        for j, rule in enumerate(rules):
+            if rule.expression is None or rule.check is None:
                 continue
 
+            result = None
+            if rule.operator in _VECTOR_OPERATORS and rule.expression.vectorized is not None:
+                result = RuleEngine._evaluate_vectorized(rule, contexts, columns)
+
+            if result is None:
+                result = RuleEngine._evaluate_each(rule, contexts)
+
+            violated[:, j], evaluated[:, j] = result
+
+        return ViolationMatrix(rules, violated, evaluated)
+
+    # -----------------------------
+    # Compartment rules, read from a CompartmentIndex
+    # -----------------------------
+
+    @staticmethod
+    def validate_adjacency(index, rules=None):
+        """
+        One violation per adjacency rule with at least one matching pair of
+        touching compartments in `index`. `rules` defaults to ADJACENCY_RULES.
+        """
+        violations = []
+        for rule_id, name, neighbour, constraint_type in rules or RuleEngine.ADJACENCY_RULES:
+            pairs = sorted(
+                (c.name, other.name)
+                for c in index if fnmatch.fnmatchcase(c.name, name)
+                for other in index.neighbours(c.name) if fnmatch.fnmatchcase(other.name, neighbour)
+            )
+            if pairs:
+                violations.append(RuleEngine._compartment_violation(
+                    rule_id, "Adjacency", "; ".join(f"{a} is adjacent to {b}" for a, b in pairs), constraint_type
+                ))
+        return violations
+
+    @staticmethod
+    def validate_fire_zones(index, boundaries):
+        """
+        A violation listing the compartments in `index` that the fire zone
+        `boundaries` (x from the FP) cut through, if any.
+        """
+        cut = [
+            f"{x} m cuts {', '.join(sorted(c.name for c in index.crossing(x)))}"
+            for x in boundaries if index.crossing(x)
+        ]
+        if not cut:
+            return []
+        rule_id, constraint_type = RuleEngine.FIRE_ZONE_RULE
+        return [RuleEngine._compartment_violation(rule_id, "Fire zones", "; ".join(cut), constraint_type)]
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+
+    @staticmethod
+    def _violation(rule):
+        return {
+            "rule_id": rule.rule_id,
+            "category": rule.category,
+            "message": f"{rule.parameter_name} violates rule {rule.rule_id}",
+            "severity": rule.severity
+        }
+
+    @staticmethod
+    def _compartment_violation(rule_id, category, message, constraint_type):
+        return {
+            "rule_id": rule_id,
+            "category": category,
+            "message": message,
+            "severity": "CRITICAL" if constraint_type == "HARD" else "WARNING"
+        }
+
+    @staticmethod
+    def _check(rule, context):
+        """
+        Violation dict if `context` fails `rule`, else None.
+        """
+        try:
+            if RuleEngine._evaluate(rule, context):
+                return RuleEngine._violation(rule)
+        except Exception as e:
+            print(f"Rule {rule.rule_id} failed to evaluate:", e)
+        return None
+
+    @staticmethod
+    def _evaluate(rule, context):
+        """
+        True if `context` violates `rule`, False if it passes or the rule's
+        parameter is missing. Raises if the rule cannot be evaluated.
+        """
+        actual_value = context.get(rule.parameter_name)
+        if actual_value is None:
+            return False
+
+        if rule.expression is None:
+            raise rule.compile_error
+
+        expected_value = rule.expression(context)
+        return rule.check is not None and not rule.check(actual_value, expected_value)
+
+    @staticmethod
+    def _evaluate_each(rule, contexts):
+        violated = np.zeros(len(contexts), dtype=bool)
+        evaluated = np.zeros(len(contexts), dtype=bool)
+
+        for i, context in enumerate(contexts):
+            if context.get(rule.parameter_name) is None:
+                continue
             try:
-                # Safe eval functions
-                safe_functions = {
-                    "max": max,
-                    "min": min,
-                    "abs": abs,
-                    "float": float,
-                    "int": int
-                }
-
-                expected_value = eval(expression, safe_functions, context)
-
-                condition_failed = False
-
-                if operator == ">=":
-                    condition_failed = not (float(actual_value) >= float(expected_value))
-                elif operator == "<=":
-                    condition_failed = not (float(actual_value) <= float(expected_value))
-                elif operator == "==":
-                    condition_failed = not (str(actual_value) == str(expected_value))
-                elif operator == "!=":
-                    condition_failed = not (str(actual_value) != str(expected_value))
-                elif operator == ">":
-                    condition_failed = not (float(actual_value) > float(expected_value))
-                elif operator == "<":
-                    condition_failed = not (float(actual_value) < float(expected_value))
-
-                if condition_failed:
-                    violations.append({
-                        "rule_id": rule.rule_id,
-                        "category": rule.category,
-                        "message": f"{param} violates rule {rule.rule_id}",
-                        "severity": "CRITICAL" if constraint_type == "HARD" else "WARNING"
-                    })
-
-            except Exception as e:
-                print(f"Rule {rule.rule_id} failed to evaluate:", e)
+                violated[i] = RuleEngine._evaluate(rule, context)
+                evaluated[i] = True
+            except Exception:
                 continue
 
-        return violations
\ No newline at end of file
+        return violated, evaluated
+
+    @staticmethod
+    def _evaluate_vectorized(rule, contexts, columns):
+        """
+        (violated, evaluated) for all contexts at once, or None when some
+        input is not plain numeric and the rule must run per candidate.
+        """
+        actual = RuleEngine._column(rule.parameter_name, contexts, columns, strict=False)
+
+        arrays = {}
+        for name in rule.expression.names:
+            column = RuleEngine._column(name, contexts, columns, strict=True)
+            if column is None:
+                return None
+            arrays[name] = column
+
+        try:
+            with np.errstate(all="ignore"):
+                expected = np.broadcast_to(
+                    np.asarray(rule.expression.vectorized(arrays), dtype=np.float64), actual.shape
+                )
+        except Exception:
+            return None
+
+        evaluated = ~np.isnan(actual) & np.isfinite(expected)
+        with np.errstate(invalid="ignore"):
+            passed = _VECTOR_OPERATORS[rule.operator](actual, expected)
+        return evaluated & ~passed, evaluated
+
+    @staticmethod
+    def _column(name, contexts, columns, strict):
+        """
+        Values of one context key across candidates as a float array (NaN
+        where missing), shared between rules through `columns`.
+
+        With `strict`, returns None unless every present value is a number;
+        otherwise values that do not convert with float() become NaN.
+        """
+        key = (name, strict)
+        if key not in columns:
+            values = np.full(len(contexts), np.nan)
+            for i, context in enumerate(contexts):
+                value = context.get(name)
+                if value is None:
+                    continue
+                if strict and (isinstance(value, bool) or not isinstance(value, _NUMBER_TYPES)):
+                    values = None
+                    break
+                try:
+                    values[i] = float(value)
+                except (TypeError, ValueError):
+                    continue
+            columns[key] = values
+        return columns[key]
@@ -0,0 +1,201 @@
+# app/services/rule_set_cache.py
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import event, text
+
+from app.core.config import Config
+from app.db.database import db
+from app.db.models import RuleMaster
+from app.services.rule_compiler import RULE_OPERATORS, RuleCompiler, RuleCompileError
+
+
+class CompiledRule:
+    """
+    Detached snapshot of an active RuleMaster row with its compiled expression.
+
+    `expression` is None when the expression failed to compile; the error
+    is kept in `compile_error`.
+    """
+
+    __slots__ = (
+        "rule_id", "category", "parameter_name", "operator", "expression_value",
+        "unit", "constraint_type", "severity", "check", "expression", "compile_error",
+    )
+
+    # RuleMaster columns a rule is rebuilt from (see RuleSet.rows)
+    FIELDS = ("rule_id", "category", "parameter_name", "operator",
+              "expression_value", "unit", "constraint_type")
+
+    def __init__(self, rule):
+        self.rule_id = rule.rule_id
+        self.category = rule.category
+        self.parameter_name = rule.parameter_name
+        self.operator = rule.operator
+        self.expression_value = rule.expression_value
+        self.unit = rule.unit
+        self.constraint_type = rule.constraint_type
+        self.severity = "CRITICAL" if rule.constraint_type == "HARD" else "WARNING"
+        self.check = RULE_OPERATORS.get(rule.operator)
+
+        try:
+            self.expression = RuleCompiler.for_rule(rule.rule_id, rule.expression_value)
+            self.compile_error = None
+        except RuleCompileError as e:
+            self.expression = None
+            self.compile_error = e
+
+
+class RuleSet:
+    """
+    An immutable snapshot of the active rules plus a dependency index:
+    context key -> positions of the rules whose parameter or expression
+    reads that key.
+    """
+
+    __slots__ = ("version", "signature", "rules", "dependents")
+
+    def __init__(self, version, signature, rules):
+        self.version = version
+        self.signature = signature
+        self.rules = rules
+
+        dependents = {}
+        for position, rule in enumerate(rules):
+            keys = {rule.parameter_name}
+            if rule.expression is not None:
+                keys |= rule.expression.names
+            for key in keys:
+                dependents.setdefault(key, []).append(position)
+        self.dependents = {key: tuple(positions) for key, positions in dependents.items()}
+
+    def rows(self):
+        """
+        Plain tuples of the rules' columns. Compiled rules hold closures and
+        cannot be pickled; worker processes rebuild them with `from_rows`.
+        """
+        return [tuple(getattr(rule, f) for f in CompiledRule.FIELDS) for rule in self.rules]
+
+    @staticmethod
+    def from_rows(rows, version=None, signature=None):
+        rules = tuple(
+            CompiledRule(SimpleNamespace(**dict(zip(CompiledRule.FIELDS, row))))
+            for row in rows
+        )
+        return RuleSet(version, signature, rules)
+
+    def rules_for(self, fields):
+        """
+        Rules affected by a change to any of `fields`, in rule set order.
+        """
+        positions = set()
+        for field in fields:
+            positions.update(self.dependents.get(field, ()))
+        return [self.rules[p] for p in sorted(positions)]
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+
+class RuleSetCache:
+    """
+    Active rules and their compiled expressions, kept in memory.
+
+    The cached set is tagged with a version stamp that ORM events on
+    RuleMaster bump on every insert, update or delete in this process.
+    Changes made elsewhere (other workers, SQL consoles, bulk updates) are
+    caught by a cheap aggregate signature of rules_master, checked at most
+    every `check_interval` seconds.
+    """
+
+    # count plus an md5 over every row, computed by the database
+    SIGNATURE_SQL = text(
+        "SELECT count(*) || ':' || coalesce(md5(string_agg("
+        "concat_ws('|', rule_id, category, parameter_name, operator, expression_value, "
+        "unit, constraint_type, status::text), ',' ORDER BY rule_id)), '') "
+        "FROM rules_master"
+    )
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+        self._lock = threading.Lock()
+        self._version = 0
+        self._rule_set = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self):
+        return self._version
+
+    def bump(self):
+        """
+        Mark the cached rule set stale; the next `get` reloads it.
+        """
+        with self._lock:
+            self._version += 1
+
+    def get(self):
+        """
+        Current RuleSet, reloaded from the database only when it changed.
+        """
+        with self._lock:
+            rule_set = self._rule_set
+            now = time.monotonic()
+
+            if rule_set is not None and rule_set.version == self._version:
+                if now - self._checked_at < self.check_interval:
+                    self.hits += 1
+                    return rule_set
+
+                self._checked_at = now
+                if self._signature() == rule_set.signature:
+                    self.hits += 1
+                    return rule_set
+
+            self.misses += 1
+            self.reloads += 1
+            self._rule_set = self._load()
+            self._checked_at = now
+            return self._rule_set
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "reloads": self.reloads,
+                "version": self._version,
+                "rules": len(self._rule_set) if self._rule_set is not None else 0,
+            }
+
+    # -----------------------------
+    # Internals (call with lock held)
+    # -----------------------------
+
+    def _signature(self):
+        return db.session.execute(self.SIGNATURE_SQL).scalar()
+
+    def _load(self):
+        signature = self._signature()
+        rules = RuleMaster.query.filter_by(status=True).order_by(RuleMaster.rule_id).all()
+        return RuleSet(self._version, signature, tuple(CompiledRule(rule) for rule in rules))
+
+
+rule_set_cache = RuleSetCache(Config.RULE_CACHE_CHECK_INTERVAL)
+
+
+@event.listens_for(RuleMaster, "after_insert")
+@event.listens_for(RuleMaster, "after_update")
+@event.listens_for(RuleMaster, "after_delete")
+def _rules_changed(mapper, connection, target):
+    rule_set_cache.bump()
@@ -0,0 +1,73 @@
+"""
+Compare RuleEngine.validate in a loop with RuleEngine.validate_batch.
+
+    python benchmarks/validate_batch.py [--contexts 2000] [--rules 270]
+
+Runs without a database: the rule set is synthetic and passed in directly.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import rule_engine as rule_engine_module  # noqa: E402
+from app.services.rule_engine import RuleEngine  # noqa: E402
+from app.services.rule_set_cache import RuleSet  # noqa: E402
+
+PARAMETERS = ["loa", "lbp", "beam", "depth", "draft", "crew_count", "engine_room_ratio"]
+EXPRESSIONS = ["0.8 * loa", "beam / 2", "max(depth, draft) * 1.1", "lbp - 10", "12", "draft + 1"]
+OPERATORS = [">=", "<=", ">", "<"]
+
+
+def synthetic_rules(count, rng):
+    return [
+        (f"R{i:04d}", "bench", rng.choice(PARAMETERS), rng.choice(OPERATORS),
+         rng.choice(EXPRESSIONS), None, rng.choice(["HARD", "SOFT"]))
+        for i in range(count)
+    ]
+
+
+def synthetic_contexts(count, rng):
+    contexts = []
+    for _ in range(count):
+        loa = rng.uniform(60, 250)
+        contexts.append({
+            "loa": loa, "lbp": loa * 0.95, "beam": loa / rng.uniform(5, 8),
+            "depth": loa / rng.uniform(10, 14), "draft": loa / rng.uniform(15, 20),
+            "crew_count": rng.randint(8, 40), "engine_room_ratio": rng.uniform(0.08, 0.2),
+        })
+    return contexts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contexts", type=int, default=2000)
+    parser.add_argument("--rules", type=int, default=270)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rule_set = RuleSet.from_rows(synthetic_rules(args.rules, rng), version=0, signature="bench")
+    contexts = synthetic_contexts(args.contexts, rng)
+    rule_engine_module.rule_set_cache.get = lambda: rule_set
+
+    engine = RuleEngine()
+    started = time.perf_counter()
+    looped = [engine.validate(context) for context in contexts]
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix = engine.validate_batch(contexts, rule_set=rule_set)
+    batch_seconds = time.perf_counter() - started
+
+    assert all(matrix.violations(i) == looped[i] for i in range(len(contexts)))
+    print(f"{args.contexts} contexts x {args.rules} rules")
+    print(f"validate loop   {loop_seconds:8.3f} s")
+    print(f"validate_batch  {batch_seconds:8.3f} s  ({loop_seconds / batch_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+
+import pytest
+from flask import Flask
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Generated files go to a scratch directory, never the repo's outputs/
+os.environ["OUTPUT_STORAGE_DIR"] = tempfile.mkdtemp(prefix="nirmon-tests-")
+
+from app.db.database import db  # noqa: E402
+from app.db import models  # noqa: E402,F401
+
+
+# The tests run on SQLite; store JSONB columns as plain JSON there
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def hull_model():
+    from app.services.hull_geometry_builder import HullGeometryModel
+    return HullGeometryModel(
+        loa=120.0, lbp=115.0, breadth=20.0, depth=10.0, draft=7.0,
+        bilge_radius=1.5, bulbous_bow=True, bulb_length=4.0, bulb_height=3.0,
+        frame_spacing=0.7,
+    )
@@ -0,0 +1,56 @@
+import pytest
+
+from app.services import generation_jobs as jobs_module
+from app.services.batch_generation import ParametricSweep, SweepError
+from app.services.generation_jobs import GenerationJobManager
+
+
+@pytest.mark.parametrize("spec", [
+    ["a", 1.0],
+    [None],
+    {"start": 1, "stop": 2, "steps": -3},
+    {"start": 1, "stop": 2, "steps": 0},
+    {"start": "x", "stop": 2},
+    {"stop": 2},
+    "1..2",
+])
+def test_malformed_ranges_raise_sweep_error(spec):
+    with pytest.raises(SweepError):
+        ParametricSweep.values(spec)
+
+
+def test_steps_over_limit_rejected_before_allocation():
+    with pytest.raises(SweepError):
+        ParametricSweep.values({"start": 0, "stop": 1, "steps": 10 ** 9}, max_values=100)
+
+
+def test_expand_counts_and_limits(hull_model):
+    variants = ParametricSweep.expand(hull_model, {
+        "bilge_radius": [1.0, 2.0],
+        "bulb_length": {"start": 3, "stop": 5, "steps": 3},
+    })
+    assert len(variants) == 6
+    assert variants[0][1].bilge_radius == 1.0
+
+    with pytest.raises(SweepError):
+        ParametricSweep.expand(hull_model, {"bilge_radius": [1.0, 2.0, 3.0]}, max_variants=2)
+    with pytest.raises(SweepError):
+        ParametricSweep.expand(hull_model, {"keel_z": [1.0]})
+
+
+def test_run_many_reports_publish_errors_per_variant(hull_model, monkeypatch):
+    manager = GenerationJobManager(max_workers=1, max_pending=1)
+    models = [hull_model.replace(bilge_radius=r) for r in (1.1, 1.2)]
+
+    def publish(key, tmp_dir):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(jobs_module.generation_cache, "publish", publish)
+    try:
+        results = sorted(manager.run_many(models, num_stations=10))
+    finally:
+        manager._executor.shutdown()
+
+    assert [index for index, _, _ in results] == [0, 1]
+    assert all(isinstance(error, OSError) for _, _, error in results)
+    assert manager._pending == 0
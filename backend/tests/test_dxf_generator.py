@@ -0,0 +1,42 @@
+import ezdxf
+
+from app.services.dxf_generator import DXFGenerator
+from app.services.hull_sampler import HullCurveSampler
+
+
+def _spline_points(path):
+    doc = ezdxf.readfile(path)
+    return {
+        e.dxf.layer: len(e.fit_points) or len(e.control_points)
+        for e in doc.modelspace().query("SPLINE")
+    }
+
+
+def test_curve_layers_follow_supplied_curves(tmp_path, hull_model):
+    DXFGenerator._layer_cache.invalidate()
+    fixed = HullCurveSampler.sample(hull_model, 50)
+    adaptive = HullCurveSampler.sample(hull_model, 50, 0.05)
+
+    DXFGenerator.generate(hull_model, str(tmp_path / "fixed.dxf"), num_stations=50, curves=fixed)
+    DXFGenerator.generate(hull_model, str(tmp_path / "adaptive.dxf"), num_stations=50, curves=adaptive)
+
+    drawn = _spline_points(tmp_path / "adaptive.dxf")
+    for layer, name in DXFGenerator.CURVE_LAYERS.items():
+        points = getattr(adaptive, name)
+        if len(points):
+            assert drawn[layer] == len(points)
+
+
+def test_build_layers_reuses_cache_for_same_curves(hull_model):
+    DXFGenerator._layer_cache.invalidate()
+    curves = HullCurveSampler.sample(hull_model, 40)
+
+    first = DXFGenerator.build_layers(hull_model, 40, curves=curves)
+    second = DXFGenerator.build_layers(hull_model, 40, curves=curves)
+
+    assert first["SIDE_PROFILE"] is second["SIDE_PROFILE"]
+
+
+def test_affected_layers_maps_derived_fields():
+    assert "REFERENCE" in DXFGenerator.affected_layers(["lbp"])
+    assert DXFGenerator.affected_layers(["bulb_height"]) == ["BULB", "LABELS"]
@@ -0,0 +1,35 @@
+import os
+
+from app.services import generation_cache as generation_cache_module
+from app.services.generation_cache import GenerationCache
+from app.services.output_storage import OutputStorage
+
+KEY = "a" * 64
+
+
+def _build(tmp_dir):
+    with open(os.path.join(tmp_dir, "hull.dxf"), "w") as f:
+        f.write("0\nEOF\n")
+
+
+def test_hit_touches_the_entry(tmp_path):
+    cache = GenerationCache(OutputStorage(str(tmp_path)), max_bytes=1 << 20)
+    path = cache.put(KEY, _build)
+    os.utime(path, (0, 0))
+
+    assert cache.get(KEY) == path
+    assert os.stat(path).st_mtime > 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_entry_removed_while_touching_is_a_miss(tmp_path, monkeypatch):
+    cache = GenerationCache(OutputStorage(str(tmp_path)), max_bytes=1 << 20)
+    cache.put(KEY, _build)
+
+    def removed(path, *args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(generation_cache_module.os, "utime", removed)
+    assert cache.get(KEY) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["size_bytes"]) == (0, 1, 0, 0)
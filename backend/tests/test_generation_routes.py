@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.config import Config
+from app.routes.generation_routes import _sampling_options
+
+
+def test_sampling_defaults():
+    assert _sampling_options({}) == (50, None)
+    assert _sampling_options({"num_stations": "80", "tolerance": 0.01}) == (80, 0.01)
+
+
+@pytest.mark.parametrize("data", [
+    {"num_stations": None},
+    {"num_stations": [1, 2]},
+    {"num_stations": "many"},
+    {"num_stations": 0},
+    {"num_stations": Config.MAX_NUM_STATIONS + 1},
+    {"tolerance": [0.1]},
+    {"tolerance": 1e-6},
+    {"tolerance": "nan"},
+    {"tolerance": float("nan")},
+    {"tolerance": "inf"},
+    {"tolerance": "-inf"},
+])
+def test_bad_sampling_options_raise_value_error(data):
+    with pytest.raises(ValueError):
+        _sampling_options(data)
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.core.config import Config
+from app.services.compartment_index import CompartmentIndex
+from app.services.layout_engine import LayoutEngine, LayoutSpec
+from app.services.rule_engine import RuleEngine
+from app.services.rule_set_cache import RuleSet
+
+RULES = [
+    # rule_id, category, parameter_name, operator, expression_value, unit, constraint_type
+    ("L1", "layout", "engine_room_ratio", "<=", "0.18", None, "SOFT"),
+]
+
+
+@pytest.fixture
+def rule_set():
+    return RuleSet.from_rows(RULES, version=1, signature="layout-test")
+
+
+def _data(**overrides):
+    data = {"loa": 120, "lbp": 115, "beam": 20, "depth": 10, "draft": 7,
+            "frame_spacing": 0.7, "crew_count": 20}
+    data.update(overrides)
+    return data
+
+
+def test_feasible_accommodation_stays_over_the_machinery():
+    # Enough passengers that MAX_TIERS clips the deckhouse on some candidates, not others
+    spec = LayoutSpec(_data(lbp=80, loa=84, beam=12, passenger_count=120))
+    arrays = LayoutEngine._sample(spec, np.random.default_rng(1), 5000)
+    feasible = arrays["feasible"]
+
+    assert feasible.any() and not feasible.all()
+    assert (arrays["accommodation_start"][feasible] >= arrays["engine_fwd"][feasible]).all()
+    assert (arrays["accommodation_start"][feasible] >= 0).all()
+
+
+def test_oversized_complement_has_no_feasible_layout(rule_set):
+    with pytest.raises(ValueError):
+        LayoutEngine().search(_data(lbp=40, loa=42, beam=8, passenger_count=2000),
+                              candidates=500, seed=1, rule_set=rule_set, use_cache=False)
+
+
+@pytest.mark.parametrize("data", [_data(loa=0, lbp=0), _data(beam=0)])
+def test_non_positive_dimensions_raise(data):
+    with pytest.raises(ValueError):
+        LayoutEngine().generate_layout(data)
+
+
+@pytest.mark.parametrize("lbp", [45, 90, 115, 180, 300])
+def test_fire_zones_stay_within_length_limits(rule_set, lbp):
+    result = LayoutEngine().search(_data(lbp=lbp, loa=lbp + 5, fire_zones_required=True),
+                                   candidates=500, seed=2, rule_set=rule_set, use_cache=False)
+
+    ends = [0.0] + result["fire_zones"]["boundaries"] + [float(lbp)]
+    lengths = [b - a for a, b in zip(ends, ends[1:])]
+    assert all(LayoutEngine.MIN_FIRE_ZONE_LENGTH - 1e-6 <= length <= LayoutEngine.MAX_FIRE_ZONE_LENGTH + 1e-6
+               for length in lengths)
+
+
+def test_fire_zones_snap_to_bulkheads(rule_set):
+    # Holds under 40 m here, so every boundary can sit on a bulkhead
+    result = LayoutEngine().search(_data(lbp=115, fire_zones_required=True, tank_module_enabled=True),
+                                   candidates=500, seed=2, rule_set=rule_set, use_cache=False)
+    hull = [z for name, z in result["zones"].items() if name not in ("cargo_zone", "accommodation")]
+    bulkheads = {z["start"] for z in hull} | {z["end"] for z in hull}
+
+    fire_zones = result["fire_zones"]
+    assert fire_zones["boundaries"] and set(fire_zones["boundaries"]) <= bulkheads
+    assert all(crossed == [] for crossed in fire_zones["crossing"].values())
+
+
+def test_short_ship_has_one_fire_zone(rule_set):
+    result = LayoutEngine().search(_data(lbp=38, loa=40, fire_zones_required=True),
+                                   candidates=200, seed=2, rule_set=rule_set, use_cache=False)
+    assert result["fire_zones"] == {"boundaries": [], "crossing": {}}
+
+
+def test_adjacency_rules_read_the_index():
+    spec = LayoutSpec(_data())
+    candidate = {
+        "bulkheads": {"collision": 6.0, "holds": [40.0, 70.0], "tanks": 95.0, "engine_room": 95.0, "aft_peak": 110.0},
+        "accommodation": {"start": 100.0, "tiers": 2},
+    }
+    index = CompartmentIndex()
+    LayoutEngine._sync_index(index, LayoutEngine._boxes(spec, candidate), spec.beam)
+    assert [v["rule_id"] for v in RuleEngine.validate_adjacency(index)] == ["ADJ-3"]
+
+    # Fewer holds: the stale hold is dropped from the index
+    candidate["bulkheads"]["holds"] = [50.0]
+    LayoutEngine._sync_index(index, LayoutEngine._boxes(spec, candidate), spec.beam)
+    assert "cargo_hold_3" not in index
+    assert index.get("cargo_hold_2").x1 == 95.0
+
+
+def test_adjacency_violations_are_reported(rule_set):
+    result = LayoutEngine().search(_data(), candidates=500, seed=4, rule_set=rule_set, use_cache=False)
+    assert "ADJ-3" in [v["rule_id"] for v in result["violations"]]
+
+    with_tanks = LayoutEngine().search(_data(tank_module_enabled=True), candidates=500, seed=4,
+                                       rule_set=rule_set, use_cache=False)
+    assert not [v for v in with_tanks["violations"] if v["category"] == "Adjacency"]
+
+
+def test_search_is_deterministic_for_a_seed(rule_set):
+    first = LayoutEngine().search(_data(), candidates=3000, seed=9, rule_set=rule_set, use_cache=False)
+    second = LayoutEngine().search(_data(), candidates=3000, seed=9, rule_set=rule_set, use_cache=False)
+    assert first["zones"] == second["zones"] and first["score"] == second["score"]
+
+
+def test_concurrent_pool_searches_match_serial(rule_set, monkeypatch):
+    monkeypatch.setattr(Config, "LAYOUT_PARALLEL_MIN_CANDIDATES", 1)
+    inputs = [_data(), _data(lbp=90, loa=95, tank_module_enabled=True)]
+    serial = [LayoutEngine().search(data, candidates=6000, seed=3, rule_set=rule_set, use_cache=False)
+              for data in inputs]
+
+    # Both searches share the pool, each with its own published payload
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        parallel = list(threads.map(
+            lambda data: LayoutEngine().search(data, candidates=6000, seed=3, rule_set=rule_set,
+                                               workers=2, use_cache=False),
+            inputs
+        ))
+
+    for one, other in zip(serial, parallel):
+        assert one["zones"] == other["zones"] and one["score"] == other["score"]
+        assert other["complete"]
@@ -0,0 +1,26 @@
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+from app.db.database import db
+from app.db.migrations import MIGRATIONS, migrate
+from app.db.query_plans import _hot_queries
+
+
+def test_migrate_applies_each_version_once(app):
+    assert migrate() == [version for version, _, _ in MIGRATIONS]
+    assert migrate() == []
+
+    indexes = {ix["name"] for ix in inspect(db.engine).get_indexes("ship_projects")}
+    assert "ix_ship_projects_live_created" in indexes
+
+
+def test_index_migration_builds_outside_the_transaction():
+    _, _, apply = MIGRATIONS[1]
+    assert apply.outside_transaction
+
+
+def test_hot_queries_render_for_postgresql(app):
+    # check-query-plans inlines the parameters; every builder must support that
+    for name, statement in _hot_queries():
+        sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        assert sql.startswith("SELECT"), name
@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+from flask_jwt_extended import JWTManager, create_access_token
+
+from app.db.database import db
+from app.db.models import Module, RoleAccess
+from app.routes.module_routes import module_bp
+from app.services import memo_cache as memo_cache_module
+from app.services.memo_cache import MemoCache
+from app.services.permission_cache import PermissionCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(memo_cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_memo_cache_entries_expire_after_ttl(clock):
+    cache = MemoCache(ttl=10)
+    cache.put("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_memo_cache_invalidate(clock):
+    cache = MemoCache()
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None and cache.get("b") == 2
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.fixture
+def role(app):
+    PermissionCache.invalidate()
+    role_id = uuid.uuid4()
+    module = Module(module_name="Projects", module_type="page", module_order=1, status=True)
+    db.session.add(module)
+    db.session.flush()
+    db.session.add(RoleAccess(module_id=module.module_id, role_id=role_id, view_flag=True, status=True))
+    db.session.commit()
+    return role_id, module
+
+
+def _names(role_id):
+    return [m["module_name"] for m in PermissionCache.for_role(role_id).tree]
+
+
+def test_permissions_are_invalidated_on_commit_not_flush(role):
+    role_id, module = role
+    assert _names(role_id) == ["Projects"]
+
+    module.module_name = "All projects"
+    db.session.flush()
+    # Flushed but uncommitted: other requests still see the committed rows
+    assert _names(role_id) == ["Projects"]
+
+    db.session.commit()
+    assert _names(role_id) == ["All projects"]
+
+
+def test_rolled_back_change_leaves_the_cache_valid(role):
+    role_id, module = role
+    assert _names(role_id) == ["Projects"]
+
+    module.module_name = "Discarded"
+    db.session.flush()
+    db.session.rollback()
+    assert _names(role_id) == ["Projects"]
+
+
+@pytest.mark.parametrize("role_name, status", [("Admin", 200), ("User", 403), (None, 403)])
+def test_cache_stats_are_admin_only(app, role_name, status):
+    app.config["JWT_SECRET_KEY"] = "test-secret-" + "x" * 32
+    JWTManager(app)
+    app.register_blueprint(module_bp, url_prefix="/api/modules")
+
+    claims = {"role_id": str(uuid.uuid4())}
+    if role_name is not None:
+        claims["role_name"] = role_name
+    token = create_access_token(identity=str(uuid.uuid4()), additional_claims=claims)
+
+    response = app.test_client().get("/api/modules/cache/stats", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status
@@ -0,0 +1,88 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.db.database import db
+from app.db.models import ShipProject
+from app.services.project_queries import InvalidCursor, ProjectQueries
+
+STATUSES = ["Active", "Active", "Under Review", "Completed", "Active", "Completed", "Active"]
+
+
+@pytest.fixture
+def projects(app):
+    created = datetime(2026, 1, 1)
+    rows = []
+    for number, status in enumerate(STATUSES):
+        rows.append(ShipProject(
+            vessel_id=uuid.uuid4(), created_by=uuid.uuid4(),
+            project_code=f"P-{number}", project_name=f"Project {number}", project_type="New Build",
+            project_status=status, start_date=date(2026, 1, 1),
+            # P-0 and P-1 share a timestamp, so the project_id tie-break is exercised
+            created_at=created + timedelta(hours=max(number, 1)),
+        ))
+    rows.append(ShipProject(
+        vessel_id=uuid.uuid4(), created_by=uuid.uuid4(),
+        project_code="P-deleted", project_name="Deleted", project_type="New Build",
+        project_status="Active", start_date=date(2026, 1, 1), created_at=created, is_deleted=True,
+    ))
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def _all_pages(limit, **kwargs):
+    seen, cursor = [], None
+    while True:
+        page, cursor = ProjectQueries.page(limit, cursor=cursor, **kwargs)
+        assert len(page) <= limit
+        seen += page
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_cursor_pages_cover_every_project_once(projects, limit):
+    seen = _all_pages(limit, fields=["project_code", "created_at"])
+    codes = [p["project_code"] for p in seen]
+
+    assert sorted(codes) == sorted(f"P-{n}" for n in range(len(STATUSES)))
+    # Newest first, ties broken on project_id
+    keys = [(p["created_at"], p["project_id"]) for p in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_filters_apply_across_pages(projects):
+    seen = _all_pages(2, filters={"project_status": ["Active", "Completed"]}, fields=["project_status"])
+    assert sorted(p["project_status"] for p in seen) == sorted(s for s in STATUSES if s != "Under Review")
+    assert set(seen[0]) == {"project_id", "project_status"}
+
+
+def test_cursor_round_trip():
+    created_at, project_id = datetime(2026, 3, 4, 5, 6, 7, 890), uuid.uuid4()
+    cursor = ProjectQueries.encode_cursor(created_at, project_id)
+    assert ProjectQueries.decode_cursor(cursor) == (created_at, project_id)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "Zm9v", ProjectQueries.encode_cursor(datetime(2026, 1, 1), "x")])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        ProjectQueries.decode_cursor(cursor)
+
+
+def test_unknown_filter_and_field_are_rejected(projects):
+    with pytest.raises(ValueError):
+        ProjectQueries.page(10, filters={"vessel_id": ["x"]})
+    with pytest.raises(ValueError):
+        ProjectQueries.page(10, fields=["password"])
+
+
+def test_status_counts(projects):
+    assert ProjectQueries.status_counts() == {
+        "total": len(STATUSES),
+        "by_status": {"Active": 4, "Under Review": 1, "Completed": 2},
+    }
+    assert ProjectQueries.status_counts({"project_status": ["Completed"]}) == {
+        "total": 2, "by_status": {"Completed": 2},
+    }
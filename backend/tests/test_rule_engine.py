@@ -0,0 +1,94 @@
+import pytest
+
+from app.services import rule_engine as rule_engine_module
+from app.services.compartment_index import Compartment, CompartmentIndex
+from app.services.rule_engine import RuleEngine
+from app.services.rule_set_cache import RuleSet
+
+RULES = [
+    # rule_id, category, parameter_name, operator, expression_value, unit, constraint_type
+    ("R1", "crew", "crew_count", "<=", "40", None, "HARD"),
+    ("R2", "hull", "depth_moulded", ">=", "design_draft * 1.2", None, "HARD"),
+]
+
+
+@pytest.fixture
+def rule_set(monkeypatch):
+    rules = RuleSet.from_rows(RULES, version=1, signature="test")
+    monkeypatch.setattr(rule_engine_module.rule_set_cache, "get", lambda: rules)
+    RuleEngine._subject_violations.invalidate()
+    return rules
+
+
+def _ids(violations):
+    return [v["rule_id"] for v in violations]
+
+
+def test_revalidate_catches_changes_made_elsewhere(rule_set):
+    engine = RuleEngine()
+    context = {"crew_count": 20, "depth_moulded": 10.0, "design_draft": 7.0}
+    assert engine.revalidate("ga-1", context) == []
+
+    # Another process raised the draft; this caller only reports crew_count
+    edited = {**context, "design_draft": 9.0, "crew_count": 21}
+    assert _ids(engine.revalidate("ga-1", edited, ["crew_count"])) == ["R2"]
+
+
+def test_revalidate_clears_fixed_violations(rule_set):
+    engine = RuleEngine()
+    assert _ids(engine.revalidate("ga-2", {"crew_count": 50})) == ["R1"]
+    assert engine.revalidate("ga-2", {"crew_count": 30}, []) == []
+
+
+def test_validate_batch_matches_validate(rule_set):
+    engine = RuleEngine()
+    layouts = [{"crew_count": c, "depth_moulded": d, "design_draft": 7.0}
+               for c in (10, 45) for d in (8.0, 9.0)]
+
+    matrix = engine.validate_batch(layouts)
+    for i, layout in enumerate(layouts):
+        assert matrix.violations(i) == engine.validate(layout)
+
+
+def test_validate_batch_does_not_reduce_across_candidates(monkeypatch):
+    rules = RuleSet.from_rows([
+        ("M1", "misc", "a", ">=", "max(b)", None, "HARD"),
+        ("M2", "misc", "a", ">=", "max((b, 0))", None, "HARD"),
+        ("M3", "misc", "a", ">=", "min([b, 3])", None, "HARD"),
+    ], version=1, signature="max-min")
+    monkeypatch.setattr(rule_engine_module.rule_set_cache, "get", lambda: rules)
+
+    engine = RuleEngine()
+    layouts = [{"a": 1, "b": 1}, {"a": 2, "b": 5}]
+    matrix = engine.validate_batch(layouts)
+    for i, layout in enumerate(layouts):
+        assert matrix.violations(i) == engine.validate(layout)
+    assert not matrix.violated[0].any()
+
+
+@pytest.fixture
+def index():
+    return CompartmentIndex([
+        Compartment("cargo_hold_1", 10, 40, z1=10),
+        Compartment("cargo_hold_2", 40, 70, z1=10),
+        Compartment("engine_room", 70, 90, z1=10),
+        Compartment("accommodation", 75, 90, z0=10, z1=16),
+    ])
+
+
+def test_adjacency_rules_read_the_index(index):
+    violations = RuleEngine.validate_adjacency(index)
+    assert _ids(violations) == ["ADJ-3"]
+    assert violations[0]["message"] == "cargo_hold_2 is adjacent to engine_room"
+    assert violations[0]["severity"] == "WARNING"
+
+    rules = [("X-1", "engine_room", "accommodation", "HARD")]
+    assert [v["severity"] for v in RuleEngine.validate_adjacency(index, rules)] == ["CRITICAL"]
+
+
+def test_fire_zone_boundaries_off_bulkheads_are_reported(index):
+    assert RuleEngine.validate_fire_zones(index, [40.0, 70.0]) == []
+
+    violations = RuleEngine.validate_fire_zones(index, [40.0, 80.0])
+    assert _ids(violations) == ["FZ-1"]
+    assert violations[0]["message"] == "80.0 m cuts accommodation, engine_room"
@@ -3,9 +3,9 @@ import { useNavigate } from "react-router-dom";
 import { Ship, Activity, FileText, CheckCircle, Clock } from "lucide-react";
 import { fetchWithAuth } from "../utils/api"; // Import utility
 
-interface Project {
-  project_id: string;
-  project_status: string;
+interface ProjectStats {
+  total: number;
+  by_status: Record<string, number>;
 }
 
 const Dashboard: React.FC = () => {
@@ -23,20 +23,21 @@ const Dashboard: React.FC = () => {
     const fetchDashboardData = async () => {
       try {
         // 👇 Uses utility. Handles auto-logout on 401.
-        const response = await fetchWithAuth("http://127.0.0.1:5000/api/projects/");
+        // Counted on the server: /api/projects/ only returns one page
+        const response = await fetchWithAuth("http://127.0.0.1:5000/api/projects/stats");
 
         // If session expired, response is null -> Stop execution
         if (!response) return; 
 
         if (response.ok) {
-          const data = await response.json();
-          const projects: Project[] = data.projects || [];
+          const data: ProjectStats = await response.json();
+          const byStatus = data.by_status || {};
 
           setStats({
-            active: projects.filter(p => p.project_status === "Active").length,
-            pending: projects.filter(p => p.project_status === "Under Review").length,
-            completed: projects.filter(p => p.project_status === "Completed").length,
-            total: projects.length
+            active: byStatus["Active"] || 0,
+            pending: byStatus["Under Review"] || 0,
+            completed: byStatus["Completed"] || 0,
+            total: data.total || 0
           });
         }
       } catch (error) {
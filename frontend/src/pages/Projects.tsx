@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useCallback, useEffect, useRef, useState } from "react";
 import { useNavigate, useSearchParams } from "react-router-dom";
 import { Plus, Search, Filter } from "lucide-react";
 import ProjectCard from "../components/project/ProjectCard";
@@ -12,16 +12,23 @@ interface Project {
   created_at: string;
 }
 
+const PAGE_SIZE = 50;
+
 const Projects: React.FC = () => {
   const navigate = useNavigate();
   const [searchParams] = useSearchParams();
 
   const [projects, setProjects] = useState<Project[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState("");
   const [statusFilter, setStatusFilter] = useState("All");
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
 
+  // Ignores responses for a filter the user has already changed
+  const requestId = useRef(0);
+
   // Load Filter from URL
   useEffect(() => {
     const statusParam = searchParams.get("status");
@@ -30,50 +37,68 @@ const Projects: React.FC = () => {
     }
   }, [searchParams]);
 
-  // Fetch Projects using fetchWithAuth
-  useEffect(() => {
-    const fetchProjects = async () => {
+  // One page of projects (newest first, filtered by status on the server)
+  const fetchPage = useCallback(
+    async (cursor: string | null) => {
+      const id = ++requestId.current;
+      const params = new URLSearchParams({
+        limit: String(PAGE_SIZE),
+        fields: "project_name,project_code,project_status,created_at",
+      });
+      if (statusFilter !== "All") params.set("project_status", statusFilter);
+      if (cursor) params.set("cursor", cursor);
+
       try {
         // 👇 Uses the utility. No need to manually add headers.
-        const response = await fetchWithAuth("http://127.0.0.1:5000/api/projects/");
+        const response = await fetchWithAuth(`http://127.0.0.1:5000/api/projects/?${params}`);
 
         // If response is null, it means 401 occurred and user was redirected. Stop here.
-        if (!response) return; 
+        if (!response) return;
 
         if (!response.ok) {
           throw new Error("Failed to fetch projects");
         }
 
         const data = await response.json();
+        if (id !== requestId.current) return;
 
-        const sortedProjects = (data.projects || []).sort(
-          (a: Project, b: Project) =>
-            new Date(b.created_at).getTime() - new Date(a.created_at).getTime(),
-        );
-
-        setProjects(sortedProjects);
+        const page: Project[] = data.projects || [];
+        setProjects((previous) => (cursor ? [...previous, ...page] : page));
+        setNextCursor(data.next_cursor || null);
       } catch (err: any) {
         console.error("Project Fetch Error:", err);
-        setError("Unable to load projects.");
+        if (id === requestId.current) setError("Unable to load projects.");
       } finally {
-        setLoading(false);
+        if (id === requestId.current) {
+          setLoading(false);
+          setLoadingMore(false);
+        }
       }
-    };
-
-    fetchProjects();
-  }, [navigate]);
+    },
+    [statusFilter],
+  );
 
-  // 🔎 Filter Logic
-  const filteredProjects = projects.filter((project) => {
-    const matchesSearch =
+  // First page, again whenever the status filter changes
+  useEffect(() => {
+    setLoading(true);
+    setError("");
+    setProjects([]);
+    setNextCursor(null);
+    fetchPage(null);
+  }, [fetchPage]);
+
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    fetchPage(nextCursor);
+  };
+
+  // 🔎 Search within the loaded pages (status is filtered by the server)
+  const filteredProjects = projects.filter(
+    (project) =>
       project.project_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      project.project_code.toLowerCase().includes(searchTerm.toLowerCase());
-
-    const matchesStatus =
-      statusFilter === "All" || project.project_status === statusFilter;
-
-    return matchesSearch && matchesStatus;
-  });
+      project.project_code.toLowerCase().includes(searchTerm.toLowerCase()),
+  );
 
   return (
     <div className="w-full min-h-screen flex flex-col px-8 py-8 bg-gray-50">
@@ -169,6 +194,19 @@ const Projects: React.FC = () => {
             ))}
           </div>
         )}
+
+        {/* Next page, via the cursor of the last one */}
+        {!loading && !error && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-5 py-2.5 rounded-lg border border-gray-300 bg-white text-gray-700 text-sm font-semibold hover:bg-gray-50 disabled:opacity-50 transition-all"
+            >
+              {loadingMore ? "Loading..." : "Load More"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );